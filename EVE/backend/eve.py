@@ -5,7 +5,7 @@ Single-file FastAPI backend with 6 endpoints.
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 import anthropic
 import asyncio
@@ -14,11 +14,22 @@ import math
 import random
 import os
 import re
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
 load_dotenv()
 
-app = FastAPI(title="Eve API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pooled HTTP client shared by every /api/scan (keep-alive across requests)
+    from nerve_scan import start_client, stop_client
+    await start_client()
+    yield
+    await stop_client()
+
+
+app = FastAPI(title="Eve API", version="0.1.0", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -463,6 +474,17 @@ async def playground(req: PlaygroundRequest):
         print(f"[EVE] Modal inference failed: {e}")
         return {"output": f"Error: inference failed — {e}", "source": "error"}
 
+# ---------------------------------------------------------------------------
+# Metrics (Prometheus scrape endpoint)
+# ---------------------------------------------------------------------------
+
+@app.get("/metrics")
+async def metrics():
+    """NERVE engine metrics (upstream latency, breakers...) in Prometheus text format."""
+    import nerve_scan  # noqa: F401 — puts the shared NERVE engine on sys.path
+    from engine import metrics as nerve_metrics
+    return Response(content=nerve_metrics.render(), media_type=nerve_metrics.CONTENT_TYPE)
+
 # ---------------------------------------------------------------------------
 # Health check
 # ---------------------------------------------------------------------------
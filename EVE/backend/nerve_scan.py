@@ -6,17 +6,34 @@ Scores GPUs with the NERVE formula (price + carbon + availability + cooling + re
 
 import httpx
 import asyncio
+import contextlib
 import hashlib
+import sys
+from pathlib import Path
 from typing import Optional
 
+# Shared NERVE engine modules live in <repo>/backend/engine
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+from engine.gpu_catalog import lookup as lookup_gpu
+from engine.http_client import AZURE_TIMEOUT, get_client, start_client, stop_client
+from engine.regions import REGISTRY
+from engine.retail_prices import RETAIL_PRICES_URL, iter_price_items
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
 
+# Regions scanned by EVE; coordinates and labels come from the shared registry
+SCAN_REGIONS = ("francecentral", "westeurope", "uksouth")
+
 REGIONS = {
-    "francecentral": {"lat": 48.86, "lon": 2.35, "label": "France Central"},
-    "westeurope": {"lat": 52.37, "lon": 4.90, "label": "West Europe"},
-    "uksouth": {"lat": 51.51, "lon": -0.13, "label": "UK South"},
+    region: {
+        "lat": REGISTRY.regions[region]["lat"],
+        "lon": REGISTRY.regions[region]["lng"],
+        "label": REGISTRY.regions[region]["name"],
+    }
+    for region in SCAN_REGIONS
 }
 
 NERVE_WEIGHTS = {
@@ -27,43 +44,6 @@ NERVE_WEIGHTS = {
     "renewable": 0.05,
 }
 
-# GPU catalog: Azure SKU prefix → (GPU name, VRAM GB, tier, energy kWh/hr)
-GPU_CATALOG = {
-    "Standard_NC6s_v3": ("NVIDIA V100 16GB", 16, "mid", 0.30),
-    "Standard_NC12s_v3": ("NVIDIA V100 16GB x2", 32, "mid", 0.60),
-    "Standard_NC24s_v3": ("NVIDIA V100 16GB x4", 64, "high", 1.20),
-    "Standard_NC4as_T4_v3": ("NVIDIA T4 16GB", 16, "entry", 0.07),
-    "Standard_NC8as_T4_v3": ("NVIDIA T4 16GB", 16, "entry", 0.07),
-    "Standard_NC16as_T4_v3": ("NVIDIA T4 16GB", 16, "entry", 0.07),
-    "Standard_NC64as_T4_v3": ("NVIDIA T4 16GB x4", 64, "mid", 0.28),
-    "Standard_NC24ads_A100_v4": ("NVIDIA A100 80GB", 80, "high", 0.40),
-    "Standard_NC48ads_A100_v4": ("NVIDIA A100 80GB x2", 160, "high", 0.80),
-    "Standard_NC96ads_A100_v4": ("NVIDIA A100 80GB x4", 320, "ultra", 1.60),
-    "Standard_ND96asr_v4": ("NVIDIA A100 80GB x8", 640, "ultra", 3.20),
-    "Standard_NC40ads_H100_v5": ("NVIDIA H100 80GB", 80, "ultra", 0.70),
-    "Standard_NC80adis_H100_v5": ("NVIDIA H100 80GB x2", 160, "ultra", 1.40),
-    "Standard_ND96is_H100_v5": ("NVIDIA H100 80GB x4", 320, "ultra", 2.80),
-    "Standard_NV6": ("NVIDIA M60 8GB", 8, "entry", 0.15),
-    "Standard_NV12": ("NVIDIA M60 16GB", 16, "entry", 0.15),
-    "Standard_NV24": ("NVIDIA M60 24GB", 24, "entry", 0.15),
-    "Standard_NV12s_v3": ("NVIDIA M60 8GB", 8, "entry", 0.15),
-    "Standard_NV24s_v3": ("NVIDIA M60 16GB", 16, "entry", 0.15),
-    "Standard_NV48s_v3": ("NVIDIA M60 24GB", 24, "entry", 0.15),
-    "Standard_ND6s": ("NVIDIA P40 24GB", 24, "mid", 0.25),
-    "Standard_ND12s": ("NVIDIA P40 24GB x2", 48, "mid", 0.50),
-    "Standard_ND24s": ("NVIDIA P40 24GB x4", 96, "high", 1.00),
-    "Standard_NV6ads_A10_v5": ("NVIDIA A10 24GB", 24, "mid", 0.15),
-    "Standard_NV18ads_A10_v5": ("NVIDIA A10 24GB", 24, "mid", 0.15),
-    "Standard_NV36ads_A10_v5": ("NVIDIA A10 24GB", 24, "mid", 0.15),
-    "Standard_NV12ads_A10_v5": ("NVIDIA A10 24GB", 24, "mid", 0.15),
-    "Standard_NV36adms_A10_v5": ("NVIDIA A10 24GB", 24, "mid", 0.15),
-    # AMD Radeon Instinct (NVv4 series)
-    "Standard_NV4as_v4": ("AMD MI25 4GB", 4, "entry", 0.10),
-    "Standard_NV8as_v4": ("AMD MI25 8GB", 8, "entry", 0.10),
-    "Standard_NV16as_v4": ("AMD MI25 16GB", 16, "entry", 0.10),
-    "Standard_NV32as_v4": ("AMD MI25 16GB", 16, "entry", 0.10),
-}
-
 # Grid mixes for carbon estimation (without live carbon API)
 GRID_MIXES = {
     "francecentral": {
@@ -82,6 +62,10 @@ EMISSION_FACTORS = {
 
 PUE = 1.2  # Data center Power Usage Effectiveness
 
+# Last-known-good upstream results, served while a provider is failing
+# (its circuit breaker in engine.http_client is open → calls fail fast)
+_last_good: dict[tuple[str, str], object] = {}
+
 
 # ---------------------------------------------------------------------------
 # Azure Retail Prices API
@@ -90,7 +74,6 @@ PUE = 1.2  # Data center Power Usage Effectiveness
 async def _scrape_azure_prices(client: httpx.AsyncClient, region: str) -> list[dict]:
     """Fetch GPU spot prices from Azure Retail Prices API."""
     gpu_skus = []
-    url = "https://prices.azure.com/api/retail/prices"
     # Query for Virtual Machines + GPU SKUs (NC, NV, ND families) + Spot
     filters = [
         f"armRegionName eq '{region}'",
@@ -100,76 +83,62 @@ async def _scrape_azure_prices(client: httpx.AsyncClient, region: str) -> list[d
     ]
     params = {"$filter": " and ".join(filters)}
 
+    # Group by SKU, separate spot vs on-demand — folded page by page as items stream in
+    sku_map: dict[str, dict] = {}
     try:
-        resp = await client.get(url, params=params, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
-        items = data.get("Items", [])
+        items = iter_price_items(client, RETAIL_PRICES_URL, params, timeout=AZURE_TIMEOUT)
+        async with contextlib.aclosing(items):
+            async for item in items:
+                sku = item.get("armSkuName", "")
+                price = item.get("retailPrice", 0)
+                unit = item.get("unitOfMeasure", "")
+                sku_name = item.get("skuName", "")
+
+                if "1 Hour" not in unit or price <= 0:
+                    continue
+
+                is_spot = "Spot" in sku_name
+                is_low = "Low Priority" in sku_name
+
+                if sku not in sku_map:
+                    sku_map[sku] = {"sku": sku, "spot": None, "ondemand": None}
+
+                if is_spot or is_low:
+                    current = sku_map[sku]["spot"]
+                    if current is None or price < current:
+                        sku_map[sku]["spot"] = price
+                else:
+                    current = sku_map[sku]["ondemand"]
+                    if current is None or price < current:
+                        sku_map[sku]["ondemand"] = price
     except Exception:
-        return []
-
-    # Group by SKU, separate spot vs on-demand
-    sku_map: dict[str, dict] = {}
-    for item in items:
-        sku = item.get("armSkuName", "")
-        price = item.get("retailPrice", 0)
-        unit = item.get("unitOfMeasure", "")
-        sku_name = item.get("skuName", "")
-
-        if "1 Hour" not in unit or price <= 0:
-            continue
-
-        is_spot = "Spot" in sku_name
-        is_low = "Low Priority" in sku_name
-
-        if sku not in sku_map:
-            sku_map[sku] = {"sku": sku, "spot": None, "ondemand": None}
-
-        if is_spot or is_low:
-            current = sku_map[sku]["spot"]
-            if current is None or price < current:
-                sku_map[sku]["spot"] = price
-        else:
-            current = sku_map[sku]["ondemand"]
-            if current is None or price < current:
-                sku_map[sku]["ondemand"] = price
+        return _last_good.get(("prices", region), [])
 
     for sku, prices in sku_map.items():
         if prices["spot"] is None:
             continue  # No spot price = skip
 
-        catalog = GPU_CATALOG.get(sku)
-        if not catalog:
-            # Try prefix match
-            for prefix, info in GPU_CATALOG.items():
-                if sku.startswith(prefix.split("_v")[0]):
-                    catalog = info
-                    break
-
-        if not catalog:
+        spec = lookup_gpu(sku)
+        if spec is None:
             continue  # Skip unknown GPU SKUs
 
-        gpu_name = catalog[0]
-        vram = catalog[1]
-        tier = catalog[2]
-        energy = catalog[3]
-
         ondemand = prices["ondemand"] or prices["spot"] * 3
         savings = round((1 - prices["spot"] / ondemand) * 100, 1) if ondemand > 0 else 0
 
         gpu_skus.append({
             "sku": sku,
-            "gpu_name": gpu_name,
-            "vram_gb": vram,
-            "tier": tier,
+            "gpu_name": spec.name,
+            "vram_gb": spec.vram_gb,
+            "tier": spec.tier,
             "spot_price_usd_hr": round(prices["spot"], 4),
             "ondemand_price_usd_hr": round(ondemand, 4),
             "savings_pct": savings,
-            "energy_kwh_hr": energy,
+            "energy_kwh_hr": spec.kwh_per_hr,
             "region": region,
             "region_label": REGIONS[region]["label"],
         })
 
+    _last_good[("prices", region)] = gpu_skus
     return gpu_skus
 
 
@@ -187,17 +156,19 @@ async def _scrape_weather(client: httpx.AsyncClient, region: str) -> dict:
         "current": "temperature_2m,wind_speed_10m,direct_radiation",
     }
     try:
-        resp = await client.get(url, params=params, timeout=10)
+        resp = await client.get(url, params=params)
         resp.raise_for_status()
         data = resp.json()
         current = data.get("current", {})
-        return {
+        weather = {
             "temperature_c": current.get("temperature_2m", 15),
             "wind_kmh": current.get("wind_speed_10m", 10),
             "solar_radiation": current.get("direct_radiation", 100),
         }
+        _last_good[("weather", region)] = weather
+        return weather
     except Exception:
-        return {"temperature_c": 15, "wind_kmh": 10, "solar_radiation": 100}
+        return _last_good.get(("weather", region), {"temperature_c": 15, "wind_kmh": 10, "solar_radiation": 100})
 
 
 # ---------------------------------------------------------------------------
@@ -208,14 +179,16 @@ async def _scrape_carbon_uk(client: httpx.AsyncClient) -> Optional[float]:
     """Fetch live carbon intensity for UK from carbonintensity.org.uk."""
     url = "https://api.carbonintensity.org.uk/intensity"
     try:
-        resp = await client.get(url, timeout=10)
+        resp = await client.get(url)
         resp.raise_for_status()
         data = resp.json()
         items = data.get("data", [])
         if items:
-            return items[0].get("intensity", {}).get("actual") or items[0].get("intensity", {}).get("forecast")
+            intensity = items[0].get("intensity", {}).get("actual") or items[0].get("intensity", {}).get("forecast")
+            _last_good[("carbon", "uksouth")] = intensity
+            return intensity
     except Exception:
-        pass
+        return _last_good.get(("carbon", "uksouth"))
     return None
 
 
@@ -328,88 +301,88 @@ async def scan_all_regions() -> dict:
     """
     all_gpus = []
 
-    async with httpx.AsyncClient() as client:
-        # Fetch all data concurrently
-        tasks = {}
-        for region in REGIONS:
-            tasks[region] = {
-                "prices": _scrape_azure_prices(client, region),
-                "weather": _scrape_weather(client, region),
-            }
-        tasks["uk_carbon"] = _scrape_carbon_uk(client)
-
-        # Gather all
-        weather_data = {}
-        price_data = {}
-
-        # Run weather + prices for all regions concurrently
-        all_tasks = []
-        task_keys = []
-        for region in REGIONS:
-            all_tasks.append(tasks[region]["prices"])
-            task_keys.append(("prices", region))
-            all_tasks.append(tasks[region]["weather"])
-            task_keys.append(("weather", region))
-        all_tasks.append(tasks["uk_carbon"])
-        task_keys.append(("uk_carbon", None))
-
-        results = await asyncio.gather(*all_tasks, return_exceptions=True)
-
-        uk_carbon = None
-        for (kind, region), result in zip(task_keys, results):
-            if isinstance(result, Exception):
-                continue
-            if kind == "prices":
-                price_data[region] = result
-            elif kind == "weather":
-                weather_data[region] = result
-            elif kind == "uk_carbon":
-                uk_carbon = result
-
-        # Score each GPU
-        for region in REGIONS:
-            gpus = price_data.get(region, [])
-            weather = weather_data.get(region, {"temperature_c": 15, "wind_kmh": 10})
-
-            # Carbon intensity
-            if region == "uksouth" and uk_carbon is not None:
-                carbon = uk_carbon
-            else:
-                carbon = _estimate_carbon_from_weather(region, weather)
-
-            for gpu in gpus:
-                avail_label, _ = _estimate_availability(
-                    gpu["spot_price_usd_hr"], gpu["ondemand_price_usd_hr"]
-                )
-
-                # Carbon per hour for this GPU
-                co2_per_hr = gpu["energy_kwh_hr"] * carbon * PUE
-
-                score = _nerve_score(gpu, weather, carbon)
-
-                all_gpus.append({
-                    "gpu_name": gpu["gpu_name"],
-                    "sku": gpu["sku"],
-                    "vram_gb": gpu["vram_gb"],
-                    "region": gpu["region_label"],
-                    "region_id": gpu["region"],
-                    "spot_price_usd_hr": gpu["spot_price_usd_hr"],
-                    "ondemand_price_usd_hr": gpu["ondemand_price_usd_hr"],
-                    "savings_pct": gpu["savings_pct"],
-                    "carbon_intensity_gco2_kwh": round(carbon, 1),
-                    "carbon_index": (
-                        "very low" if carbon < 50 else
-                        "low" if carbon < 150 else
-                        "medium" if carbon < 300 else
-                        "high"
-                    ),
-                    "co2_grams_per_hr": round(co2_per_hr, 1),
-                    "temperature_c": round(weather.get("temperature_c", 15), 1),
-                    "wind_kmh": round(weather.get("wind_kmh", 10), 1),
-                    "availability": avail_label,
-                    "nerve_score": score,
-                    "az_prices": _az_variation(gpu["sku"], gpu["region"], gpu["spot_price_usd_hr"]),
-                })
+    client = get_client()  # shared pooled client (engine.http_client)
+    # Fetch all data concurrently
+    tasks = {}
+    for region in REGIONS:
+        tasks[region] = {
+            "prices": _scrape_azure_prices(client, region),
+            "weather": _scrape_weather(client, region),
+        }
+    tasks["uk_carbon"] = _scrape_carbon_uk(client)
+
+    # Gather all
+    weather_data = {}
+    price_data = {}
+
+    # Run weather + prices for all regions concurrently
+    all_tasks = []
+    task_keys = []
+    for region in REGIONS:
+        all_tasks.append(tasks[region]["prices"])
+        task_keys.append(("prices", region))
+        all_tasks.append(tasks[region]["weather"])
+        task_keys.append(("weather", region))
+    all_tasks.append(tasks["uk_carbon"])
+    task_keys.append(("uk_carbon", None))
+
+    results = await asyncio.gather(*all_tasks, return_exceptions=True)
+
+    uk_carbon = None
+    for (kind, region), result in zip(task_keys, results):
+        if isinstance(result, Exception):
+            continue
+        if kind == "prices":
+            price_data[region] = result
+        elif kind == "weather":
+            weather_data[region] = result
+        elif kind == "uk_carbon":
+            uk_carbon = result
+
+    # Score each GPU
+    for region in REGIONS:
+        gpus = price_data.get(region, [])
+        weather = weather_data.get(region, {"temperature_c": 15, "wind_kmh": 10})
+
+        # Carbon intensity
+        if region == "uksouth" and uk_carbon is not None:
+            carbon = uk_carbon
+        else:
+            carbon = _estimate_carbon_from_weather(region, weather)
+
+        for gpu in gpus:
+            avail_label, _ = _estimate_availability(
+                gpu["spot_price_usd_hr"], gpu["ondemand_price_usd_hr"]
+            )
+
+            # Carbon per hour for this GPU
+            co2_per_hr = gpu["energy_kwh_hr"] * carbon * PUE
+
+            score = _nerve_score(gpu, weather, carbon)
+
+            all_gpus.append({
+                "gpu_name": gpu["gpu_name"],
+                "sku": gpu["sku"],
+                "vram_gb": gpu["vram_gb"],
+                "region": gpu["region_label"],
+                "region_id": gpu["region"],
+                "spot_price_usd_hr": gpu["spot_price_usd_hr"],
+                "ondemand_price_usd_hr": gpu["ondemand_price_usd_hr"],
+                "savings_pct": gpu["savings_pct"],
+                "carbon_intensity_gco2_kwh": round(carbon, 1),
+                "carbon_index": (
+                    "very low" if carbon < 50 else
+                    "low" if carbon < 150 else
+                    "medium" if carbon < 300 else
+                    "high"
+                ),
+                "co2_grams_per_hr": round(co2_per_hr, 1),
+                "temperature_c": round(weather.get("temperature_c", 15), 1),
+                "wind_kmh": round(weather.get("wind_kmh", 10), 1),
+                "availability": avail_label,
+                "nerve_score": score,
+                "az_prices": _az_variation(gpu["sku"], gpu["region"], gpu["spot_price_usd_hr"]),
+            })
 
     # Sort by NERVE score (lower = better)
     all_gpus.sort(key=lambda g: g["nerve_score"])
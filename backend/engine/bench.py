@@ -0,0 +1,329 @@
+"""
+NERVE Engine — Offline scrape benchmark
+Runs N engine.scraper._scrape_all and EVE nerve_scan.scan_all_regions cycles
+against recorded upstream fixtures (engine.fixtures) and reports p50/p99
+cycle latency and upstream requests per cycle. No network needed.
+`scoring` compares the scalar _score_gpu scan with the vectorized candidate
+matrix on synthetic offers (and checks they pick the same GPUs). `stats`
+compares rewriting stats.json per increment with the write-behind journal
+under concurrent record() calls (and checks nothing is lost on reload).
+
+    cd backend
+    python -m engine.bench record --fixtures fixtures/          # one live cycle → disk
+    python -m engine.bench run --fixtures fixtures/ --cycles 50 --latency-ms 80 --error-rate 0.02
+    python -m engine.bench scoring --candidates 10000
+    python -m engine.bench stats --tasks 50 --records 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from engine.fixtures import RecordingTransport, ReplayTransport
+from engine.http_client import start_client, stop_client
+
+_EVE_BACKEND = Path(__file__).resolve().parents[2] / "EVE" / "backend"
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _targets() -> dict:
+    """
+    Cycle functions to benchmark, with vision exports, price history and the
+    shared snapshot (plus its leader lock) redirected to a temp dir — never the
+    production files live followers attach to.
+    """
+    from engine import scraper
+    from engine.shared_snapshot import LeaderLock, SnapshotReader
+
+    out_dir = Path(tempfile.mkdtemp(prefix="nerve-bench-"))
+    scraper._DATA_DIR = out_dir
+    scraper._VISION_DIR = out_dir
+    scraper.TSDB_PATH = str(out_dir / "nerve_history.sqlite3")
+    scraper._shared_path = out_dir / "nerve_snapshot.bin"
+    scraper._leader_lock = LeaderLock(scraper._shared_path.with_suffix(".lock"))
+    scraper._snapshot_reader = SnapshotReader(scraper._shared_path)
+    targets = {"scraper._scrape_all": scraper._scrape_all}
+
+    sys.path.insert(0, str(_EVE_BACKEND))
+    try:
+        from nerve_scan import scan_all_regions
+        targets["nerve_scan.scan_all_regions"] = scan_all_regions
+    except ImportError as e:
+        print(f"[bench] EVE nerve_scan unavailable ({e}) — skipping")
+    return targets
+
+
+async def _run_cycles(fn, cycles: int, replay: ReplayTransport) -> dict:
+    latencies_ms: list[float] = []
+    requests: list[int] = []
+    errors = misses = 0
+    for _ in range(cycles):
+        replay.reset_counters()
+        t0 = time.perf_counter()
+        await fn()
+        latencies_ms.append((time.perf_counter() - t0) * 1000)
+        requests.append(replay.requests)
+        errors += replay.injected_errors
+        misses += replay.misses
+    return {
+        "cycles": cycles,
+        "p50_ms": round(_percentile(latencies_ms, 50), 2),
+        "p99_ms": round(_percentile(latencies_ms, 99), 2),
+        "mean_ms": round(statistics.fmean(latencies_ms), 2),
+        "requests_per_cycle": round(statistics.fmean(requests), 1),
+        "fixture_misses": misses,
+        "injected_errors": errors,
+    }
+
+
+async def record(fixtures: str):
+    recorder = RecordingTransport(fixtures)
+    await start_client(recorder)
+    try:
+        for name, fn in _targets().items():
+            await fn()
+            print(f"[bench] recorded {name}")
+    finally:
+        await stop_client()
+    print(f"[bench] {recorder.recorded} responses saved to {fixtures}")
+
+
+async def run(fixtures: str, cycles: int, latency_ms: float, jitter_ms: float,
+              error_rate: float, error_status: int, seed: int) -> dict:
+    replay = ReplayTransport(
+        fixtures, latency_ms=latency_ms, jitter_ms=jitter_ms,
+        error_rate=error_rate, error_status=error_status, seed=seed,
+    )
+    await start_client(replay)
+    try:
+        return {name: await _run_cycles(fn, cycles, replay) for name, fn in _targets().items()}
+    finally:
+        await stop_client()
+
+
+# ── Scoring ──────────────────────────────────────────────────────────
+
+def _synthetic_regions(candidates: int, seed: int, regions: int = 10, zones: int = 3) -> list:
+    """RegionInfo objects holding `candidates` random GPU offers in total."""
+    from models import AZInfo, Availability, CarbonIndex, GpuInstance, RegionInfo
+
+    rng = random.Random(seed)
+    per_az = max(candidates // (regions * zones), 1)
+    levels = list(Availability)
+    out = []
+    for r in range(regions):
+        azs = []
+        for z in range(zones):
+            gpus = []
+            for g in range(per_az):
+                spot = round(rng.uniform(0.05, 20.0), 4)
+                gpus.append(GpuInstance(
+                    sku=f"Standard_NC{g}s_v3", gpu_name="Tesla V100 (16GB)", gpu_count=1, vcpus=6,
+                    ram_gb=rng.choice((14, 28, 55, 112, 220, 440, 880)),
+                    spot_price_usd_hr=spot, ondemand_price_usd_hr=round(spot * 3, 4), savings_pct=66.7,
+                    availability=rng.choice(levels),
+                ))
+            azs.append(AZInfo(
+                az_id=f"bench{r}-{z}", az_name=f"Bench {r} AZ-{z}", gpu_instances=gpus,
+                carbon_intensity_gco2_kwh=round(rng.uniform(10, 700), 1), carbon_index=CarbonIndex("low"),
+                temperature_c=round(rng.uniform(-10, 45), 1), wind_kmh=round(rng.uniform(0, 80), 1), score=None,
+            ))
+        out.append(RegionInfo(
+            region_id=f"bench{r}", region_name=f"Bench {r}", cloud_provider="azure",
+            location="Bench", availability_zones=azs,
+        ))
+    return out
+
+
+def _scan_reference(regions: list, min_memory_gb: float):
+    """
+    The original per-candidate loop of run_simulation (scalar _score_gpu),
+    plus the reference fallback: best offer in another AZ, else runner-up.
+    """
+    from engine.scoring import _score_gpu
+
+    best_gpu = best_az = None
+    best_score = float("inf")
+    scored = []
+    for region in regions:
+        for az in region.availability_zones:
+            for gpu in az.gpu_instances:
+                if gpu.ram_gb < min_memory_gb:
+                    continue
+                score = _score_gpu(gpu, az.carbon_intensity_gco2_kwh, az.temperature_c, az.wind_kmh)
+                scored.append((score, az, gpu))
+                if score < best_score:
+                    best_score = score
+                    best_gpu, best_az = gpu, az
+    ranked = sorted(scored, key=lambda entry: entry[0])  # stable: ties keep scan order
+    others = [gpu for _, az, gpu in ranked if az.az_id != best_az.az_id] if ranked else []
+    fallback_gpu = others[0] if others else (ranked[1][2] if len(ranked) > 1 else best_gpu)
+    return best_gpu, fallback_gpu, [score for score, _, _ in scored]
+
+
+def bench_scoring(candidates: int, repeat: int, min_memory_gb: float, seed: int) -> dict:
+    from engine.candidates import CandidateMatrix
+    from engine.scoring import _pick_best, _score_matrix
+
+    regions = _synthetic_regions(candidates, seed)
+
+    def timed(fn) -> tuple[float, object]:
+        best, result = math.inf, None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - t0)
+        return best * 1000, result
+
+    def vectorized_cold():
+        matrix = CandidateMatrix(regions)
+        return matrix, _pick_best(matrix, min_memory_gb)
+
+    loop_ms, (ref_best, ref_fallback, ref_scores) = timed(lambda: _scan_reference(regions, min_memory_gb))
+    cold_ms, (matrix, picked) = timed(vectorized_cold)
+    warm_ms, _ = timed(lambda: _pick_best(matrix, min_memory_gb))
+
+    eligible = matrix.ram_gb >= min_memory_gb
+    identical = (
+        _score_matrix(matrix)[eligible].tolist() == ref_scores
+        and matrix.offer(picked[0])[2] is ref_best
+        and matrix.offer(picked[1])[2] is ref_fallback
+    )
+    return {
+        "candidates": len(matrix),
+        "eligible": int(eligible.sum()),
+        "loop_ms": round(loop_ms, 3),
+        "vectorized_cold_ms": round(cold_ms, 3),
+        "vectorized_warm_ms": round(warm_ms, 3),
+        "speedup_warm": round(loop_ms / warm_ms, 1) if warm_ms else None,
+        "identical": identical,
+    }
+
+
+async def bench_stats(tasks: int, records: int) -> dict:
+    from engine.stats_journal import StatsJournal
+
+    defaults = {"total_jobs": 0, "total_savings_usd": 0.0, "total_checkpoints": 0}
+
+    def rewrite_per_record(path: Path):
+        """What scoring did before the journal: rewrite stats.json on every increment."""
+        stats = dict(defaults)
+
+        def record(**deltas):
+            for name, value in deltas.items():
+                stats[name] += value
+            with open(path, "w") as f:
+                json.dump(stats, f, indent=2)
+        return record
+
+    async def load(record) -> dict:
+        latencies: list[float] = []
+
+        async def client(i: int):
+            for n in range(records):
+                t0 = time.perf_counter()
+                if n % 2:
+                    record(total_checkpoints=1)
+                else:
+                    record(total_jobs=1, total_savings_usd=0.25)
+                latencies.append(time.perf_counter() - t0)
+                await asyncio.sleep(0)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(client(i) for i in range(tasks)))
+        elapsed = time.perf_counter() - t0
+        return {
+            "records_per_s": round(len(latencies) / elapsed),
+            "p50_us": round(_percentile(latencies, 50) * 1e6, 1),
+            "p99_us": round(_percentile(latencies, 99) * 1e6, 1),
+            "max_us": round(max(latencies) * 1e6, 1),
+        }
+
+    with tempfile.TemporaryDirectory(prefix="nerve-bench-") as tmp:
+        legacy = await load(rewrite_per_record(Path(tmp) / "legacy.json"))
+        journal = StatsJournal(Path(tmp) / "stats.json", defaults)
+        write_behind = await load(journal.record)
+        journal.stop()
+        write_behind.update({k: journal.stats[k] for k in ("flushes", "compactions")})
+        reloaded = StatsJournal(Path(tmp) / "stats.json", defaults).totals()
+
+    total = tasks * records
+    expected = {"total_jobs": (total + 1) // 2, "total_checkpoints": total // 2}
+    return {
+        "records": total,
+        "rewrite_per_record": legacy,
+        "write_behind": write_behind,
+        "durable": all(reloaded[k] == v for k, v in expected.items()),
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m engine.bench", description=__doc__.split("\n")[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="run one live cycle and save upstream responses")
+    rec.add_argument("--fixtures", required=True)
+
+    bench = sub.add_parser("run", help="replay fixtures and time N cycles")
+    bench.add_argument("--fixtures", required=True)
+    bench.add_argument("--cycles", type=int, default=20)
+    bench.add_argument("--latency-ms", type=float, default=0.0)
+    bench.add_argument("--jitter-ms", type=float, default=0.0)
+    bench.add_argument("--error-rate", type=float, default=0.0)
+    bench.add_argument("--error-status", type=int, default=503, help="0 = connection error")
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument("--json", action="store_true", help="print raw JSON")
+
+    scoring = sub.add_parser("scoring", help="scalar vs vectorized candidate scoring")
+    scoring.add_argument("--candidates", type=int, default=10_000)
+    scoring.add_argument("--repeat", type=int, default=20)
+    scoring.add_argument("--min-memory-gb", type=float, default=16)
+    scoring.add_argument("--seed", type=int, default=0)
+
+    stats = sub.add_parser("stats", help="stats.json rewrites vs write-behind journal under load")
+    stats.add_argument("--tasks", type=int, default=50)
+    stats.add_argument("--records", type=int, default=200, help="record() calls per task")
+
+    args = parser.parse_args(argv)
+    if args.command == "stats":
+        print(json.dumps(asyncio.run(bench_stats(args.tasks, args.records)), indent=2))
+        return
+    if args.command == "scoring":
+        print(json.dumps(bench_scoring(args.candidates, args.repeat, args.min_memory_gb, args.seed), indent=2))
+        return
+    if args.command == "record":
+        asyncio.run(record(args.fixtures))
+        return
+
+    results = asyncio.run(run(
+        args.fixtures, args.cycles, args.latency_ms, args.jitter_ms,
+        args.error_rate, args.error_status, args.seed,
+    ))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, r in results.items():
+        print(
+            f"{name:<30} cycles={r['cycles']:<4} p50={r['p50_ms']:>8.2f}ms p99={r['p99_ms']:>8.2f}ms "
+            f"mean={r['mean_ms']:>8.2f}ms req/cycle={r['requests_per_cycle']:<6} "
+            f"misses={r['fixture_misses']} errors={r['injected_errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
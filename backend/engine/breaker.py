@@ -0,0 +1,116 @@
+"""
+NERVE Engine — Upstream circuit breakers & retry budgets
+Used by engine.http_client per upstream host: a degraded provider trips its
+breaker after a few consecutive failures, after which calls fail in
+microseconds (callers serve last-known-good data) until a single half-open
+probe succeeds. Retries use exponential backoff with full jitter and are
+capped by a per-host budget so they can never multiply load on a sick host.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+import httpx
+
+FAILURE_THRESHOLD = 3     # consecutive failures before opening
+BASE_COOLDOWN = 15.0      # seconds open before the first half-open probe
+MAX_COOLDOWN = 300.0      # cooldown doubles on each failed probe, up to this
+
+MAX_RETRIES = 2
+BACKOFF_BASE = 0.25       # seconds
+BACKOFF_CAP = 2.0
+RETRY_RATIO = 0.2         # each request earns 0.2 retry tokens
+RETRY_BURST = 5.0         # max tokens saved up
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without touching the network while a host's breaker is open."""
+
+
+class CircuitBreaker:
+    """closed → open (after FAILURE_THRESHOLD failures) → half_open (one probe) → closed / open."""
+
+    def __init__(self, host: str):
+        self.host = host
+        self.state = "closed"
+        self.failures = 0
+        self.cooldown = BASE_COOLDOWN
+        self.opened_at = 0.0
+        self.probe_started = 0.0
+        self.trips = 0
+        self.short_circuited = 0
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        now = time.monotonic()
+        if self.state == "open" and now - self.opened_at >= self.cooldown:
+            self.state = "half_open"  # let exactly one probe through
+            self.probe_started = now
+            return True
+        if self.state == "half_open" and now - self.probe_started >= self.cooldown:
+            self.probe_started = now  # previous probe never reported back (cancelled)
+            return True
+        self.short_circuited += 1
+        return False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self.cooldown = BASE_COOLDOWN
+
+    def record_failure(self):
+        if self.state == "half_open":
+            # Probe failed — back off harder before the next one
+            self.cooldown = min(self.cooldown * 2, MAX_COOLDOWN)
+            self._open()
+            return
+        self.failures += 1
+        if self.state == "closed" and self.failures >= FAILURE_THRESHOLD:
+            self._open()
+
+    def _open(self):
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self.trips += 1
+
+    def snapshot(self) -> dict:
+        retry_in = 0.0
+        if self.state == "open":
+            retry_in = max(self.cooldown - (time.monotonic() - self.opened_at), 0.0)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "trips": self.trips,
+            "short_circuited": self.short_circuited,
+            "probe_in_s": round(retry_in, 1),
+        }
+
+
+class RetryBudget:
+    """Token bucket: retries may only spend what ordinary requests have earned."""
+
+    def __init__(self):
+        self.tokens = RETRY_BURST
+        self.retries = 0
+
+    def deposit(self):
+        self.tokens = min(self.tokens + RETRY_RATIO, RETRY_BURST)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        self.retries += 1
+        return True
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter (attempt starts at 1)."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+def is_retryable_status(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
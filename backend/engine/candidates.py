@@ -0,0 +1,142 @@
+"""
+NERVE Engine — Candidate matrix
+Every (region, AZ, GPU) offer of a set of RegionInfo flattened into
+struct-of-arrays columns (spot price, carbon, availability, temperature,
+wind, memory) so scoring, masking and selection run as NumPy passes instead
+of a Python loop per candidate. Offers keep the region → AZ → GPU order of
+the snapshot. RegionInfo objects are immutable and reused between snapshots,
+so a matrix is built once and served from cache until one of its regions
+is rebuilt.
+
+CandidateIndex groups the scored offers into memory buckets, each sorted by
+score: a bisect finds the buckets with enough memory and a heap merge over
+their heads yields the k best offers in score order.
+"""
+
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Sequence
+
+import numpy as np
+
+from models import Availability, AZInfo, GpuInstance, RegionInfo
+
+# Availability levels in code order (CandidateMatrix.availability holds indexes)
+AVAILABILITY_LEVELS = tuple(Availability)
+_LEVEL_CODE = {level: code for code, level in enumerate(AVAILABILITY_LEVELS)}
+
+CACHE_SIZE = 16  # distinct region sets kept (preferred_region requests + the default set)
+
+
+class CandidateMatrix:
+    """Column arrays (float64 unless noted), one row per offer."""
+
+    __slots__ = (
+        "regions", "offers", "price", "ondemand", "carbon", "availability",
+        "temperature", "wind", "ram_gb", "scores", "index", "co2_per_hr", "frontiers",
+    )
+
+    def __init__(self, regions: Sequence[RegionInfo]):
+        self.regions = tuple(regions)
+        self.offers: list[tuple[RegionInfo, AZInfo, GpuInstance]] = [
+            (region, az, gpu)
+            for region in self.regions
+            for az in region.availability_zones
+            for gpu in az.gpu_instances
+        ]
+        n = len(self.offers)
+        self.price = np.fromiter((gpu.spot_price_usd_hr for _, _, gpu in self.offers), np.float64, n)
+        self.ondemand = np.fromiter((gpu.ondemand_price_usd_hr for _, _, gpu in self.offers), np.float64, n)
+        self.carbon = np.fromiter((az.carbon_intensity_gco2_kwh for _, az, _ in self.offers), np.float64, n)
+        self.availability = np.fromiter(  # int8 codes into AVAILABILITY_LEVELS
+            (_LEVEL_CODE[gpu.availability] for _, _, gpu in self.offers), np.int8, n
+        )
+        self.temperature = np.fromiter((az.temperature_c for _, az, _ in self.offers), np.float64, n)
+        self.wind = np.fromiter((az.wind_kmh for _, az, _ in self.offers), np.float64, n)
+        self.ram_gb = np.fromiter((gpu.ram_gb for _, _, gpu in self.offers), np.float64, n)
+        self.scores: np.ndarray | None = None      # filled by engine.scoring on first use
+        self.index: CandidateIndex | None = None   # idem, once scores exist
+        self.co2_per_hr: np.ndarray | None = None  # idem, for the Pareto frontier mode
+        self.frontiers: dict[int, np.ndarray] = {} # memory bucket -> frontier offer indexes
+
+    def __len__(self) -> int:
+        return len(self.offers)
+
+    def offer(self, i: int) -> tuple[RegionInfo, AZInfo, GpuInstance]:
+        return self.offers[i]
+
+
+# Offer attributes a ranking can require to be distinct between picks
+DIVERSITY_KEYS = {
+    "region": lambda offer: offer[0].region_id,
+    "az": lambda offer: offer[1].az_id,
+    "sku": lambda offer: offer[2].sku,
+}
+
+
+class CandidateIndex:
+    """
+    Offers of one matrix bucketed by memory (ascending), each bucket ordered by
+    (score, offer order) — ties resolve to the earliest offer, like a scan.
+    """
+
+    def __init__(self, matrix: CandidateMatrix, scores: np.ndarray):
+        self.matrix = matrix
+        n = len(matrix)
+        order = np.lexsort((np.arange(n), scores, matrix.ram_gb))
+        memory = matrix.ram_gb[order]
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(memory)) + 1)) if n else np.array([], dtype=np.intp)
+        bounds = starts.tolist() + [n]
+        self.thresholds: list[float] = memory[starts].tolist()  # smallest memory of each bucket
+        self._offers: list[list[int]] = [order[a:b].tolist() for a, b in zip(bounds, bounds[1:])]
+        self._scores: list[list[float]] = [scores[bucket].tolist() for bucket in self._offers]
+
+    def eligible(self, min_memory_gb: float) -> int:
+        """Number of offers with at least `min_memory_gb`."""
+        start = bisect_left(self.thresholds, min_memory_gb)
+        return sum(len(bucket) for bucket in self._offers[start:])
+
+    def top_k(self, min_memory_gb: float, k: int, distinct: Sequence[str] = ()) -> list[int]:
+        """
+        Offer indexes of the k best scores with at least `min_memory_gb`, best
+        first. With `distinct` (DIVERSITY_KEYS names, e.g. ("az",)), an offer
+        is skipped when a better pick already has the same key. O(log n + B +
+        k log B) for B memory buckets, plus the offers skipped for diversity.
+        """
+        start = bisect_left(self.thresholds, min_memory_gb)
+        heap = [(self._scores[b][0], self._offers[b][0], b, 0) for b in range(start, len(self._offers))]
+        heapq.heapify(heap)
+        keys = [DIVERSITY_KEYS[name] for name in distinct]
+        seen: set[tuple] = set()
+        picked: list[int] = []
+        while heap and len(picked) < k:
+            _, i, b, pos = heapq.heappop(heap)
+            if pos + 1 < len(self._offers[b]):
+                heapq.heappush(heap, (self._scores[b][pos + 1], self._offers[b][pos + 1], b, pos + 1))
+            if keys:
+                offer = self.matrix.offers[i]
+                key = tuple(fn(offer) for fn in keys)
+                if key in seen:
+                    continue
+                seen.add(key)
+            picked.append(i)
+        return picked
+
+
+_matrices: OrderedDict[tuple[int, ...], CandidateMatrix] = OrderedDict()
+
+
+def candidates_for(regions: Sequence[RegionInfo]) -> CandidateMatrix:
+    """Cached matrix for these exact RegionInfo objects (identity, not equality)."""
+    key = tuple(map(id, regions))
+    matrix = _matrices.get(key)
+    if matrix is not None and all(a is b for a, b in zip(matrix.regions, regions)):
+        _matrices.move_to_end(key)
+        return matrix
+    matrix = _matrices[key] = CandidateMatrix(regions)
+    if len(_matrices) > CACHE_SIZE:
+        _matrices.popitem(last=False)
+    return matrix
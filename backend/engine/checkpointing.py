@@ -6,25 +6,17 @@ Simulates evacuation using REAL AZ data from scraper.
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timezone
 
 from models import CheckpointEvent, CheckpointSimulateRequest
+from engine.events import publish
+from engine.regions import REGISTRY
 from engine.scoring import record_checkpoint, record_eviction
-from engine.scraper import get_cache, REGIONS
+from engine.scraper import get_cache
 
 # ── AZ neighbor map ──────────────────────────────────────────────────
 
-_NEIGHBOR_AZ = {
-    "fr-central-1": "fr-central-2",
-    "fr-central-2": "fr-central-3",
-    "fr-central-3": "fr-central-1",
-    "we-1": "we-2",
-    "we-2": "we-3",
-    "we-3": "we-1",
-    "uk-south-1": "uk-south-2",
-    "uk-south-2": "uk-south-3",
-    "uk-south-3": "uk-south-1",
-}
+# Next AZ of the same region, derived from the region registry (engine/regions.json)
+_NEIGHBOR_AZ = REGISTRY.neighbor_az
 
 S3_UPLOAD_GBPS = 1.2
 
@@ -89,16 +81,15 @@ async def simulate_interruption(req: CheckpointSimulateRequest) -> CheckpointEve
     record_checkpoint()
     record_eviction()
 
-    # Emit real event via scraper
-    from engine.scraper import _emit
-    _emit({
+    # Publish real events on the bus (topics "checkpoint" / "migration")
+    publish({
         "type": "checkpoint_event",
         "job_id": req.job_id,
         "status": "saved",
         "progress_pct": req.epoch_progress_pct,
         "checkpoint_size_gb": round(checkpoint_size_gb, 2),
     })
-    _emit({
+    publish({
         "type": "migration_complete",
         "job_id": req.job_id,
         "from_az": req.current_az,
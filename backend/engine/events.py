@@ -0,0 +1,301 @@
+"""
+NERVE Engine — Event bus
+Asyncio pub/sub for scraper and checkpointing events (WebSocket fan-out).
+Publishing never blocks: each subscriber owns a bounded queue and drains it at
+its own pace. A full queue drops its oldest event ("drop_oldest"); under
+"coalesce" a newer event is also merged into the pending one with the same key
+(price batches fold into one, latest price per region/AZ/instance).
+Subscribers filter by topic and can unsubscribe at any time; lag and drops are
+tracked per subscriber.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable
+
+from engine import metrics
+
+log = logging.getLogger("nerve.events")
+
+# ── Topics ───────────────────────────────────────────────────────────
+
+TOPIC_PRICE = "price"
+TOPIC_CHECKPOINT = "checkpoint"
+TOPIC_MIGRATION = "migration"
+TOPICS = (TOPIC_PRICE, TOPIC_CHECKPOINT, TOPIC_MIGRATION)
+
+# event["type"] -> topic
+EVENT_TOPICS = {
+    "az_price_update": TOPIC_PRICE,
+    "checkpoint_event": TOPIC_CHECKPOINT,
+    "migration_complete": TOPIC_MIGRATION,
+}
+
+DEFAULT_QUEUE_SIZE = 256
+POLICIES = ("drop_oldest", "coalesce")
+
+
+def price_key(event: dict) -> str | None:
+    """Coalesce key: pending price batches merge into one; other events are never merged."""
+    return "az_price_update" if event.get("type") == "az_price_update" else None
+
+
+def merge_price_batches(pending: dict, event: dict) -> dict:
+    """
+    Fold a newer price batch into a pending one: one cell per region/AZ/instance,
+    keeping the oldest old_price and the newest new_price.
+    """
+    cells = {(c["region"], c["az"], c["instance"]): c for c in pending.get("changes", [])}
+    for cell in event.get("changes", []):
+        k = (cell["region"], cell["az"], cell["instance"])
+        if k in cells:
+            old_price = cells[k]["old_price"]
+            cell = {
+                **cell,
+                "old_price": old_price,
+                "change_pct": round((cell["new_price"] - old_price) / old_price * 100, 2) if old_price else None,
+            }
+        cells[k] = cell
+    return {**event, "count": len(cells), "changes": list(cells.values())}
+
+
+# ── Subscription ─────────────────────────────────────────────────────
+
+class SubscriptionClosed(Exception):
+    """Raised by Subscription.get() once the subscription has been closed."""
+
+
+class Subscription:
+    """One subscriber's bounded queue. Iterate with `async for` or call `get()`."""
+
+    def __init__(
+        self,
+        bus: EventBus,
+        topics: frozenset[str] | None,
+        maxsize: int,
+        policy: str,
+        key: Callable[[dict], Any] | None,
+        merge: Callable[[dict, dict], dict] | None,
+        name: str,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, got {policy!r}")
+        self._bus = bus
+        self.topics = topics
+        self.maxsize = maxsize
+        self.policy = policy
+        self.name = name
+        if key is None:
+            key, merge = price_key, merge or merge_price_batches
+        self._key = key
+        self._merge = merge
+        self._seq = itertools.count()
+        self._queue: OrderedDict[Any, tuple[float, dict]] = OrderedDict()
+        self._ready = asyncio.Event()
+        self.closed = False
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+    def wants(self, topic: str) -> bool:
+        return self.topics is None or topic in self.topics
+
+    def _offer(self, event: dict):
+        key = self._key(event) if self.policy == "coalesce" else None
+        if key is None:
+            key = next(self._seq)
+        if key in self._queue:
+            # Merged (or latest wins), keeping the age of the pending event
+            published_at, pending = self._queue[key]
+            self._queue[key] = (published_at, self._merge(pending, event) if self._merge else event)
+            self.coalesced += 1
+            return
+        if len(self._queue) >= self.maxsize:
+            self._queue.popitem(last=False)
+            self.dropped += 1
+            metrics.EVENTS_DROPPED.inc()
+        self._queue[key] = (time.monotonic(), event)
+        self._ready.set()
+
+    async def get(self) -> dict:
+        """Next event (oldest first). Raises SubscriptionClosed once closed."""
+        while not self._queue:
+            if self.closed:
+                raise SubscriptionClosed(self.name)
+            self._ready.clear()
+            await self._ready.wait()
+        _, (published_at, event) = self._queue.popitem(last=False)
+        lag = time.monotonic() - published_at
+        metrics.EVENT_LAG.observe(lag)
+        lag_ms = lag * 1000
+        self.last_lag_ms = lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        self.delivered += 1
+        return event
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        try:
+            return await self.get()
+        except SubscriptionClosed:
+            raise StopAsyncIteration
+
+    def close(self):
+        """Unsubscribe; pending events are discarded and waiting readers stop."""
+        self._bus.unsubscribe(self)
+
+    def stats(self) -> dict:
+        return {
+            "topics": sorted(self.topics) if self.topics is not None else "all",
+            "policy": self.policy,
+            "queued": len(self._queue),
+            "maxsize": self.maxsize,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "last_lag_ms": round(self.last_lag_ms, 2),
+            "max_lag_ms": round(self.max_lag_ms, 2),
+        }
+
+
+# ── Bus ──────────────────────────────────────────────────────────────
+
+class EventBus:
+    def __init__(self):
+        self._subs: list[Subscription] = []
+        self._names = itertools.count(1)
+        self._listeners: dict[Subscription, Callable[[dict], Any]] = {}  # on_event callbacks without a pump yet
+        self._pumps: dict[asyncio.Task, tuple[Subscription, Callable[[dict], Any]]] = {}
+        self.published = 0
+
+    def subscribe(
+        self,
+        topics: Iterable[str] | None = None,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        policy: str = "drop_oldest",
+        key: Callable[[dict], Any] | None = None,
+        merge: Callable[[dict, dict], dict] | None = None,
+        name: str | None = None,
+    ) -> Subscription:
+        """
+        New subscriber for `topics` (default: all). Under the "coalesce" policy,
+        events with the same `key` (None = never merged) are combined by
+        `merge(pending, new)`, or the newest wins when no merge is given.
+        Defaults: price_key + merge_price_batches.
+        """
+        sub = Subscription(
+            self,
+            frozenset(topics) if topics is not None else None,
+            maxsize,
+            policy,
+            key,
+            merge,
+            name or f"sub-{next(self._names)}",
+        )
+        self._subs.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        if sub in self._subs:
+            self._subs.remove(sub)
+        self._listeners.pop(sub, None)
+        sub.closed = True
+        sub._queue.clear()
+        sub._ready.set()
+
+    def publish(self, event: dict, topic: str | None = None):
+        """Stamp and enqueue `event` for every interested subscriber. Never blocks."""
+        topic = topic or EVENT_TOPICS.get(event.get("type"), event.get("type", ""))
+        event["timestamp"] = datetime.now(timezone.utc).isoformat()
+        self.published += 1
+        if self._listeners:
+            self.start_listeners()
+        for sub in self._subs:
+            if sub.wants(topic):
+                sub._offer(event)
+
+    def listen(self, sub: Subscription, fn: Callable[[dict], Any]):
+        """Feed `sub` to `fn`; the pump task starts now if a loop is running, else on start_listeners()."""
+        self._listeners[sub] = fn
+        self.start_listeners()
+
+    def start_listeners(self):
+        """Start the pumps of callbacks registered before the event loop was running (no-op outside a loop)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        listeners, self._listeners = self._listeners, {}
+        for sub, fn in listeners.items():
+            task = loop.create_task(_pump(sub, fn), name=f"nerve-events-{sub.name}")
+            self._pumps[task] = (sub, fn)
+            task.add_done_callback(lambda t: self._pumps.pop(t, None))
+
+    async def stop_listeners(self):
+        """
+        Cancel and await the callback pumps (scraper shutdown). Open
+        subscriptions keep their callbacks and queued events; their pumps
+        restart on the next start_listeners(), e.g. on a new loop.
+        """
+        pumps, self._pumps = self._pumps, {}
+        for task, (sub, fn) in pumps.items():
+            task.cancel()
+            if not sub.closed:
+                sub._ready = asyncio.Event()  # the old one stays bound to this loop
+                if sub._queue:
+                    sub._ready.set()
+                self._listeners[sub] = fn
+        if pumps:
+            await asyncio.gather(*pumps, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "published": self.published,
+            "subscribers": {sub.name: sub.stats() for sub in self._subs},
+        }
+
+
+bus = EventBus()
+
+
+def publish(event: dict, topic: str | None = None):
+    """Publish on the process-wide bus."""
+    bus.publish(event, topic)
+
+
+def subscribe(topics: Iterable[str] | None = None, **kwargs) -> Subscription:
+    """Subscribe to the process-wide bus (see EventBus.subscribe)."""
+    return bus.subscribe(topics, **kwargs)
+
+
+async def _pump(sub: Subscription, fn: Callable[[dict], Any]):
+    async for event in sub:
+        try:
+            result = fn(event)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            log.warning(f"Event listener {sub.name} failed: {e}")
+
+
+def on_event(fn: Callable[[dict], Any], topics: Iterable[str] | None = None, **kwargs) -> Subscription:
+    """
+    Callback-style subscriber (the former scraper.on_event): `fn` runs in its
+    own task, so a slow listener only delays itself. Safe to call at import
+    time — without a running loop the task starts on the first publish or at
+    scraper startup (EventBus.start_listeners). Close the returned
+    subscription to stop it.
+    """
+    sub = bus.subscribe(topics, **kwargs)
+    bus.listen(sub, fn)
+    return sub
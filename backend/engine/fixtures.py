@@ -0,0 +1,133 @@
+"""
+NERVE Engine — Upstream record / replay
+RecordingTransport captures real Azure / Open-Meteo / carbonintensity.org.uk
+responses to a fixtures directory; ReplayTransport serves them back offline
+with configurable latency and error injection. Both plug into the shared
+client (engine.http_client.start_client(transport=...)) so engine.scraper and
+EVE nerve_scan run unchanged on air-gapped machines and in CI.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode
+
+import httpx
+
+log = logging.getLogger("nerve.fixtures")
+
+REPLAY_CHUNK_BYTES = 16 * 1024  # replayed bodies are streamed like the network would
+
+
+def fixture_key(method: str, url: httpx.URL) -> str:
+    """Stable key for a request: method + host + path + sorted query."""
+    query = urlencode(sorted(parse_qsl(url.query.decode(), keep_blank_values=True)))
+    raw = f"{method} {url.host}{url.path}?{query}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _fixture_path(directory: Path, key: str) -> Path:
+    return directory / f"{key}.json"
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Pass requests to the network and save every response under `directory`."""
+
+    def __init__(self, directory: str | Path, inner: httpx.AsyncBaseTransport | None = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._inner = inner or httpx.AsyncHTTPTransport()
+        self.recorded = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._inner.handle_async_request(request)
+        body = b"".join([chunk async for chunk in response.stream])
+        await response.stream.aclose()
+
+        key = fixture_key(request.method, request.url)
+        _fixture_path(self.directory, key).write_text(json.dumps({
+            "method": request.method,
+            "url": str(request.url),
+            "status": response.status_code,
+            "content_type": response.headers.get("content-type", "application/json"),
+            "body": body.decode("utf-8", errors="replace"),
+        }, ensure_ascii=False), encoding="utf-8")
+        self.recorded += 1
+
+        return httpx.Response(
+            response.status_code,
+            headers={"content-type": response.headers.get("content-type", "application/json")},
+            content=body,
+            request=request,
+        )
+
+    async def aclose(self):
+        await self._inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serve recorded fixtures. Unknown requests get a 404.
+    latency_ms (+/- jitter_ms) is added to every request; error_rate is the
+    probability of an injected failure — a connection error when
+    error_status is 0, otherwise that HTTP status.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int | None = None,
+    ):
+        self.directory = Path(directory)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._fixtures: dict[str, dict] = {}
+        for path in self.directory.glob("*.json"):
+            self._fixtures[path.stem] = json.loads(path.read_text(encoding="utf-8"))
+        self.requests = 0
+        self.misses = 0
+        self.injected_errors = 0
+        log.info(f"Replay: {len(self._fixtures)} fixtures from {self.directory}")
+
+    def reset_counters(self):
+        self.requests = self.misses = self.injected_errors = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        delay = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.injected_errors += 1
+            if not self.error_status:
+                raise httpx.ConnectError("injected connection error", request=request)
+            return httpx.Response(self.error_status, content=_stream(b""), request=request)
+
+        fixture = self._fixtures.get(fixture_key(request.method, request.url))
+        if fixture is None:
+            self.misses += 1
+            return httpx.Response(404, content=_stream(b""), request=request)
+        return httpx.Response(
+            fixture["status"],
+            headers={"content-type": fixture.get("content_type", "application/json")},
+            content=_stream(fixture["body"].encode("utf-8")),
+            request=request,
+        )
+
+
+async def _stream(body: bytes):
+    for i in range(0, len(body), REPLAY_CHUNK_BYTES):
+        yield body[i:i + REPLAY_CHUNK_BYTES]
@@ -0,0 +1,147 @@
+"""
+NERVE Engine — GPU SKU catalog
+One catalog for the engine scraper, scoring and EVE's nerve_scan:
+engine/gpu_catalog.json (or NERVE_GPU_CATALOG) lists accelerators (VRAM,
+energy draw, tier) and the Azure GPU SKUs with what their names do not say
+(GPU count, VM RAM, display overrides). SKU names are parsed with a compiled
+grammar — family, vCPUs, feature letters, accelerator, version — into a
+normalized key, so "Standard_NC6s_v3", "nc6s_v3" and "Standard_NC6s_v3_Promo"
+all resolve with one dict lookup; results are memoized across cycles.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+CATALOG_FILE = Path(os.getenv("NERVE_GPU_CATALOG", Path(__file__).resolve().parent / "gpu_catalog.json"))
+
+# [Standard_]<family><vcpus><features>[_<accelerator>][_v<version>][_Promo]
+_SKU_GRAMMAR = re.compile(
+    r"""
+    ^(?:standard_)?
+    (?P<family>n[cdv])(?P<confidential>c?)
+    (?P<vcpus>\d+)
+    (?P<features>[a-z]*)
+    (?:_(?P<accelerator>(?!v\d+(?:_|$))[a-z]+\d+))?
+    (?:_v(?P<version>\d+))?
+    (?:_promo)?$
+    """,
+    re.VERBOSE,
+)
+
+
+class SkuName(NamedTuple):
+    family: str            # "nc", "ncc" (confidential), "nd", "nv"
+    vcpus: int
+    features: str          # a=AMD CPU, d=local disk, s=premium storage, r=RDMA, ...
+    accelerator: str | None
+    version: int           # 1 when the name has no _vN suffix
+
+    @property
+    def key(self) -> str:
+        accelerator = f"_{self.accelerator}" if self.accelerator else ""
+        version = f"_v{self.version}" if self.version > 1 else ""
+        return f"{self.family}{self.vcpus}{self.features}{accelerator}{version}"
+
+
+class GpuSpec(NamedTuple):
+    sku: str               # canonical Azure name, e.g. "Standard_NC24ads_A100_v4"
+    name: str              # display name, e.g. "A100 (80GB)"
+    vendor: str
+    accelerator: str       # accelerators key: "v100", "a100", ...
+    gpu_count: int
+    vram_gb: int           # GPU memory visible to the VM (all GPUs, or the slice)
+    vcpus: int
+    ram_gb: int            # VM memory
+    kwh_per_hr: float      # GPU energy draw of the VM
+    tier: str              # low | mid | high | premium
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_sku(sku: str) -> SkuName | None:
+    """Split an Azure GPU SKU name into its grammar parts (None if it is not one)."""
+    m = _SKU_GRAMMAR.match(sku.strip().lower())
+    if m is None:
+        return None
+    return SkuName(
+        family=m["family"] + m["confidential"],
+        vcpus=int(m["vcpus"]),
+        features=m["features"],
+        accelerator=m["accelerator"],
+        version=int(m["version"] or 1),
+    )
+
+
+class GpuCatalog:
+    """
+    accelerators:    accelerator -> {vendor, model, vram_gb, kwh_per_gpu_hr, tier}
+    specs:           normalized SKU key -> GpuSpec
+    kwh_per_gpu_hr:  accelerator -> energy draw of one GPU
+    """
+
+    def __init__(self, data: dict):
+        self.accelerators: dict[str, dict] = data["accelerators"]
+        self._family_accelerators: dict[str, str] = data.get("family_accelerators", {})
+        self.kwh_per_gpu_hr = {acc: a["kwh_per_gpu_hr"] for acc, a in self.accelerators.items()}
+        self.specs: dict[str, GpuSpec] = {}
+
+        for entry in data["skus"]:
+            parsed = parse_sku(entry["sku"])
+            if parsed is None:
+                raise ValueError(f"{entry['sku']}: not an Azure GPU SKU name")
+            if parsed.key in self.specs:
+                raise ValueError(f"Duplicate SKU {entry['sku']} in catalog")
+            accelerator = entry.get("accelerator") or self._accelerator_of(parsed)
+            if accelerator not in self.accelerators:
+                raise ValueError(f"{entry['sku']}: unknown accelerator {accelerator!r}")
+            acc = self.accelerators[accelerator]
+            gpus = entry.get("gpus", 1)
+            vram = entry.get("vram_gb", acc["vram_gb"] * gpus)
+            if "name" in entry:
+                name = entry["name"]
+            elif vram < acc["vram_gb"]:
+                name = f"{acc['model']} ({vram}GB slice)"
+            else:
+                name = f"{acc['model']} ({acc['vram_gb']}GB)"
+            self.specs[parsed.key] = GpuSpec(
+                sku=entry["sku"],
+                name=name,
+                vendor=acc["vendor"],
+                accelerator=accelerator,
+                gpu_count=gpus,
+                vram_gb=vram,
+                vcpus=parsed.vcpus,
+                ram_gb=entry["ram_gb"],
+                kwh_per_hr=round(acc["kwh_per_gpu_hr"] * gpus, 4),
+                tier=entry.get("tier", acc["tier"]),
+            )
+
+        # Memoized per raw name: the scraper asks for the same few hundred SKUs every cycle
+        self.lookup = functools.lru_cache(maxsize=4096)(self._lookup)
+
+    def _accelerator_of(self, parsed: SkuName) -> str | None:
+        if parsed.accelerator:
+            return parsed.accelerator
+        return self._family_accelerators.get(f"{parsed.family[:2]}_v{parsed.version}")
+
+    def _lookup(self, sku: str) -> GpuSpec | None:
+        """GpuSpec for any spelling of a catalogued SKU, else None."""
+        parsed = parse_sku(sku)
+        return self.specs.get(parsed.key) if parsed is not None else None
+
+
+def load_catalog(path: str | Path = CATALOG_FILE) -> GpuCatalog:
+    return GpuCatalog(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+CATALOG = load_catalog()
+
+
+def lookup(sku: str) -> GpuSpec | None:
+    """GpuSpec of an Azure SKU name from the shared catalog (memoized)."""
+    return CATALOG.lookup(sku)
@@ -0,0 +1,132 @@
+"""
+NERVE Engine — Price history ring buffer
+Fixed-size columnar ring per region: one preallocated typed array per column
+(timestamp, avg/min/max spot, avg compute spot, GPU count). Appends overwrite
+the oldest slot in O(1) without allocating; windows are returned as
+zero-copy memoryview segments for curve building.
+"""
+
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, timezone
+
+COLUMNS = {
+    "ts": "d",                # epoch seconds (UTC)
+    "avg_spot": "d",
+    "min_spot": "d",
+    "max_spot": "d",
+    "avg_compute_spot": "d",
+    "gpu_count": "l",
+}
+
+
+class PriceRing:
+    """Columnar ring buffer of per-region price snapshots."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._cols = {name: array(code, [0]) * capacity for name, code in COLUMNS.items()}
+        self._head = 0   # next slot to write
+        self._size = 0
+
+    @classmethod
+    def from_buffers(cls, capacity: int, head: int, size: int, columns: dict[str, memoryview]) -> PriceRing:
+        """Read-only ring over existing column buffers (e.g. a shared snapshot mmap) — no copy."""
+        ring = cls.__new__(cls)
+        ring.capacity = capacity
+        ring._cols = columns
+        ring._head = head
+        ring._size = size
+        return ring
+
+    def copy(self) -> PriceRing:
+        """Writable copy (e.g. of a read-only ring attached to a shared snapshot)."""
+        cols = {name: array(COLUMNS[name], self._cols[name]) for name in COLUMNS}
+        return PriceRing.from_buffers(self.capacity, self._head, self._size, cols)
+
+    def buffers(self) -> tuple[int, int, dict[str, array]]:
+        """(head, size, column arrays) — the raw state, for from_buffers in another process."""
+        return self._head, self._size, self._cols
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(
+        self,
+        ts: float,
+        avg_spot: float,
+        min_spot: float,
+        max_spot: float,
+        avg_compute_spot: float,
+        gpu_count: int,
+    ):
+        i = self._head
+        cols = self._cols
+        cols["ts"][i] = ts
+        cols["avg_spot"][i] = avg_spot
+        cols["min_spot"][i] = min_spot
+        cols["max_spot"][i] = max_spot
+        cols["avg_compute_spot"][i] = avg_compute_spot
+        cols["gpu_count"][i] = gpu_count
+        self._head = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def last(self) -> tuple | None:
+        """Newest point as (ts, avg_spot, min_spot, max_spot, avg_compute_spot, gpu_count)."""
+        if not self._size:
+            return None
+        i = (self._head - 1) % self.capacity
+        return tuple(self._cols[name][i] for name in COLUMNS)
+
+    def repeat_last(self, ts: float):
+        """Append a copy of the newest point stamped `ts` (prices unchanged)."""
+        if not self._size:
+            return
+        last = (self._head - 1) % self.capacity
+        cols = self._cols
+        self.append(
+            ts,
+            cols["avg_spot"][last],
+            cols["min_spot"][last],
+            cols["max_spot"][last],
+            cols["avg_compute_spot"][last],
+            cols["gpu_count"][last],
+        )
+
+    def window(self, column: str, last: int | None = None) -> tuple[memoryview, memoryview]:
+        """
+        The newest `last` values of `column` (default: all), oldest first, as
+        two zero-copy segments — the second is empty unless the window wraps.
+        """
+        n = self._size if last is None else max(min(last, self._size), 0)
+        view = memoryview(self._cols[column])
+        start = (self._head - n) % self.capacity
+        if n == 0:
+            return view[0:0], view[0:0]
+        if start + n <= self.capacity:
+            return view[start:start + n], view[0:0]
+        return view[start:], view[:self._head]
+
+    def column(self, column: str, last: int | None = None) -> list:
+        """Copy of a window as a flat list (oldest first)."""
+        first, second = self.window(column, last)
+        return first.tolist() + second.tolist()
+
+    def to_dicts(self, last: int | None = None) -> list[dict]:
+        """Compatibility view: the historical list-of-dicts format."""
+        cols = {name: self.column(name, last) for name in COLUMNS}
+        out = []
+        for i, ts in enumerate(cols["ts"]):
+            when = datetime.fromtimestamp(ts, timezone.utc)
+            out.append({
+                "timestamp": when.isoformat(),
+                "hour": when.hour,
+                "avg_spot": cols["avg_spot"][i],
+                "min_spot": cols["min_spot"][i],
+                "max_spot": cols["max_spot"][i],
+                "avg_compute_spot": cols["avg_compute_spot"][i],
+                "gpu_count": cols["gpu_count"][i],
+            })
+        return out
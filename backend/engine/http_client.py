@@ -0,0 +1,239 @@
+"""
+NERVE Engine — Shared HTTP client
+One long-lived pooled httpx.AsyncClient for every upstream (Azure Retail
+Prices, Open-Meteo, carbonintensity.org.uk), so TCP/TLS connections survive
+across scrape cycles and /api/scan requests.
+Started/stopped by engine.scraper.start_scraper / stop_scraper (and by the
+EVE lifespan); shared by engine.scraper and EVE/backend/nerve_scan.py.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import os
+import time
+
+import httpx
+
+from engine import metrics
+from engine.breaker import (
+    MAX_RETRIES,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudget,
+    backoff_delay,
+    is_retryable_status,
+)
+
+log = logging.getLogger("nerve.http")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+# ── Tunables (env overrides) ─────────────────────────────────────────
+
+CONNECT_TIMEOUT = _env_float("NERVE_HTTP_CONNECT_TIMEOUT", 5.0)
+READ_TIMEOUT = _env_float("NERVE_HTTP_READ_TIMEOUT", 10.0)
+AZURE_READ_TIMEOUT = _env_float("NERVE_HTTP_AZURE_READ_TIMEOUT", 15.0)
+POOL_TIMEOUT = _env_float("NERVE_HTTP_POOL_TIMEOUT", 5.0)
+
+MAX_CONNECTIONS = int(_env_float("NERVE_HTTP_MAX_CONNECTIONS", 50))
+MAX_KEEPALIVE = int(_env_float("NERVE_HTTP_MAX_KEEPALIVE", 20))
+KEEPALIVE_EXPIRY = _env_float("NERVE_HTTP_KEEPALIVE_EXPIRY", 120.0)  # > SCRAPE_INTERVAL
+PER_HOST_CONNECTIONS = int(_env_float("NERVE_HTTP_PER_HOST", 8))
+
+DEFAULT_TIMEOUT = httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT, pool=POOL_TIMEOUT)
+AZURE_TIMEOUT = httpx.Timeout(AZURE_READ_TIMEOUT, connect=CONNECT_TIMEOUT, pool=POOL_TIMEOUT)
+
+# HTTP/2 needs the optional `h2` package (pip install httpx[http2])
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+_stats = {
+    "requests": 0,
+    "new_connections": 0,
+    "in_flight_per_host": {},
+}
+
+_client: httpx.AsyncClient | None = None
+
+
+# ── Transport: per-host cap, breaker, retries, reuse counters ───────
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body wrapper that counts received bytes and frees the host slot once closed."""
+
+    def __init__(self, inner: httpx.AsyncByteStream, release, host: str):
+        self._inner = inner
+        self._release = release
+        self._host = host
+
+    async def __aiter__(self):
+        async for chunk in self._inner:
+            metrics.UPSTREAM_BYTES.inc(len(chunk), self._host)
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._inner.aclose()
+        finally:
+            self._release()
+
+
+class _PooledTransport(httpx.AsyncBaseTransport):
+    """
+    AsyncHTTPTransport with, per upstream host: a concurrency cap (httpx only
+    limits the whole pool), a circuit breaker, budgeted retries with jittered
+    exponential backoff, and a trace hook counting freshly opened connections.
+    """
+
+    def __init__(self, per_host: int, inner: httpx.AsyncBaseTransport | None = None, **kwargs):
+        self._inner = inner or httpx.AsyncHTTPTransport(**kwargs)
+        self._per_host = per_host
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.budgets: dict[str, RetryBudget] = {}
+
+    async def _trace(self, event: str, info: dict):
+        if event == "connection.connect_tcp.complete":
+            _stats["new_connections"] += 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        breaker = self.breakers.setdefault(host, CircuitBreaker(host))
+        budget = self.budgets.setdefault(host, RetryBudget())
+        budget.deposit()
+
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"circuit open for {host}", request=request)
+            response: httpx.Response | None = None
+            try:
+                response = await self._send_once(host, request)
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                failure = e
+            else:
+                if not is_retryable_status(response.status_code):
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+
+            attempt += 1
+            if attempt > MAX_RETRIES or breaker.state != "closed" or not budget.withdraw():
+                if response is not None:
+                    return response  # the caller's raise_for_status() reports it
+                raise failure
+            if response is not None:
+                await response.aclose()
+            await asyncio.sleep(backoff_delay(attempt))
+
+    async def _send_once(self, host: str, request: httpx.Request) -> httpx.Response:
+        slot = self._hosts.setdefault(host, asyncio.Semaphore(self._per_host))
+        await slot.acquire()
+        in_flight = _stats["in_flight_per_host"]
+        in_flight[host] = in_flight.get(host, 0) + 1
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                in_flight[host] -= 1
+                slot.release()
+
+        _stats["requests"] += 1
+        request.extensions = {**request.extensions, "trace": self._trace}
+        t0 = time.perf_counter()
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            metrics.UPSTREAM_LATENCY.observe(time.perf_counter() - t0, host)
+            metrics.UPSTREAM_RESPONSES.inc(1, host, "error")
+            release()
+            raise
+        metrics.UPSTREAM_LATENCY.observe(time.perf_counter() - t0, host)
+        metrics.UPSTREAM_RESPONSES.inc(1, host, str(response.status_code))
+        if response.is_stream_consumed:
+            # In-memory body (e.g. a mock/replay transport): nothing left to hold the slot for
+            metrics.UPSTREAM_BYTES.inc(len(response.content), host)
+            release()
+        else:
+            response.stream = _ReleasingStream(response.stream, release, host)
+        return response
+
+    async def aclose(self):
+        await self._inner.aclose()
+
+
+# ── Lifecycle ────────────────────────────────────────────────────────
+
+def _build_client(transport: httpx.AsyncBaseTransport | None = None) -> httpx.AsyncClient:
+    if transport is None and os.getenv("NERVE_REPLAY_DIR"):
+        # Offline mode: serve recorded upstream fixtures (see engine.fixtures)
+        from engine.fixtures import ReplayTransport
+        transport = ReplayTransport(os.environ["NERVE_REPLAY_DIR"])
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+    pooled = _PooledTransport(PER_HOST_CONNECTIONS, inner=transport, http2=HTTP2, limits=limits)
+    return httpx.AsyncClient(transport=pooled, timeout=DEFAULT_TIMEOUT)
+
+
+async def start_client(transport: httpx.AsyncBaseTransport | None = None) -> httpx.AsyncClient:
+    """
+    Open the process-wide pooled client (idempotent).
+    `transport` replaces the network layer — e.g. engine.fixtures record/replay.
+    """
+    global _client
+    if transport is not None and _client is not None:
+        await stop_client()
+    if _client is None or _client.is_closed:
+        _client = _build_client(transport)
+        log.info(f"HTTP pool started (http2={HTTP2}, max={MAX_CONNECTIONS}, per_host={PER_HOST_CONNECTIONS})")
+    return _client
+
+
+async def stop_client():
+    """Close the pooled client and its keep-alive connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        log.info("HTTP pool stopped")
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared client, opening it lazily outside of a lifespan."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+def get_client_stats() -> dict:
+    transport = _client._transport if _client is not None else None
+    breakers = getattr(transport, "breakers", {})
+    budgets = getattr(transport, "budgets", {})
+    requests = _stats["requests"]
+    new = _stats["new_connections"]
+    reused = max(requests - new, 0)
+    return {
+        "http2": HTTP2,
+        "requests": requests,
+        "new_connections": new,
+        "reused_connections": reused,
+        "reuse_pct": round(reused / requests * 100, 1) if requests else 0.0,
+        "in_flight_per_host": {h: n for h, n in _stats["in_flight_per_host"].items() if n},
+        "retries": sum(b.retries for b in budgets.values()),
+        "breakers": {host: b.snapshot() for host, b in breakers.items()},
+    }
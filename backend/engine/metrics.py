@@ -0,0 +1,179 @@
+"""
+NERVE Engine — Metrics
+In-process counters, gauges and latency histograms rendered in the Prometheus
+text exposition format (serve render() as GET /metrics with CONTENT_TYPE).
+Recording is a dict lookup plus a bisect into fixed buckets — no locks, no
+allocation once a label set has been seen — so it stays on in production.
+Label values must come from bounded sets (hosts, shards, sources).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import math
+import time
+from bisect import bisect_left
+from typing import Callable
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds: 1ms .. 60s (upstream calls, cycles)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Seconds: 10µs .. 1s (in-process work: snapshot builds, scoring, bus lag)
+FAST_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+_registry: list[_Metric] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        _registry.append(self)
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, *labels):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        return self._header() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {_num(v)}" for labels, v in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, *labels):
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [count per bucket..., +Inf bucket, sum]
+        self._series: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, *labels):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def timed(self, *labels) -> Callable:
+        """Decorator observing the wall time of each call (sync or async)."""
+        def wrap(fn):
+            if asyncio.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def timed_async(*args, **kwargs):
+                    t0 = time.perf_counter()
+                    try:
+                        return await fn(*args, **kwargs)
+                    finally:
+                        self.observe(time.perf_counter() - t0, *labels)
+                return timed_async
+
+            @functools.wraps(fn)
+            def timed_sync(*args, **kwargs):
+                t0 = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - t0, *labels)
+            return timed_sync
+        return wrap
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), series):
+                cumulative += n
+                le = 'le="' + _num(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_num(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+def render() -> str:
+    """Every registered metric in Prometheus text format."""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ── Engine metrics ───────────────────────────────────────────────────
+
+# engine.http_client — every upstream attempt (retries included)
+UPSTREAM_LATENCY = Histogram(
+    "nerve_upstream_request_seconds", "Upstream request latency until response headers.", ("host",)
+)
+UPSTREAM_RESPONSES = Counter(
+    "nerve_upstream_responses_total", "Upstream responses by HTTP status (status=error: transport failure).", ("host", "status")
+)
+UPSTREAM_BYTES = Counter(
+    "nerve_upstream_received_bytes_total", "Response body bytes received from upstreams.", ("host",)
+)
+
+# engine.scraper
+SCRAPE_CYCLE = Histogram("nerve_scrape_cycle_seconds", "Duration of one scheduler firing (due shards fetched, then snapshot and export if anything changed).")
+SCRAPE_SHARD = Histogram("nerve_scrape_shard_seconds", "Fetch duration of one region shard.", ("shard",))
+SCRAPE_ERRORS = Counter("nerve_scrape_errors_total", "Shards that failed or missed the cycle deadline.")
+SNAPSHOT_BUILD = Histogram(
+    "nerve_snapshot_build_seconds", "Time to build and publish a region snapshot.", buckets=FAST_BUCKETS
+)
+SNAPSHOT_VERSION = Gauge("nerve_snapshot_version", "Version of the current region snapshot.")
+HISTORY_WRITE = Histogram("nerve_history_write_seconds", "Price history store write per cycle.", buckets=FAST_BUCKETS)
+
+# engine.scoring / engine.timeshifter
+SIMULATION = Histogram("nerve_simulation_seconds", "run_simulation latency.", buckets=FAST_BUCKETS)
+SIMULATION_BATCH = Histogram("nerve_simulation_batch_seconds", "Batch simulation (run_simulations / stream) latency.")
+SIMULATION_JOBS = Counter("nerve_simulation_batch_jobs_total", "Jobs simulated through the batch API.")
+TIMESHIFT = Histogram("nerve_timeshift_window_seconds", "Optimal time-shift window search latency.", buckets=FAST_BUCKETS)
+
+# engine.events
+EVENT_LAG = Histogram("nerve_event_lag_seconds", "Time events wait in subscriber queues.", buckets=FAST_BUCKETS)
+EVENTS_DROPPED = Counter("nerve_events_dropped_total", "Events dropped from full subscriber queues.")
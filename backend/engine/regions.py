@@ -0,0 +1,79 @@
+"""
+NERVE Engine — Region registry
+Regions are data, not code: engine/regions.json (or NERVE_REGIONS_FILE) lists
+every monitored Azure GPU region with its coordinates, timezone, AZ naming,
+carbon source and grid mix. Loaded once into indexed structures — O(1) lookup
+by region or AZ id, AZ neighbours for evacuation, and fixed-size shards that
+the scraper fetches with one batched upstream query each.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+REGIONS_FILE = Path(os.getenv("NERVE_REGIONS_FILE", Path(__file__).resolve().parent / "regions.json"))
+SHARD_SIZE = int(os.getenv("NERVE_SHARD_SIZE", 8))  # regions per batched upstream query
+
+CARBON_SOURCES = ("grid_model", "carbonintensity_uk")
+
+
+class RegionRegistry:
+    """
+    regions:     region_id -> config (name, location, lat, lng, timezone, azs, carbon, ...)
+    grid_mix:    region_id -> generation mix used by the weather-based carbon model
+    az_region:   az_id -> region_id
+    neighbor_az: az_id -> next AZ of the same region (evacuation target)
+    shards:      tuple of region_id tuples, SHARD_SIZE regions each
+    shard_of:    region_id -> shard index
+    """
+
+    def __init__(self, data: dict, shard_size: int = SHARD_SIZE):
+        defaults = data.get("defaults", {})
+        mixes = data.get("grid_mixes", {})
+        self.regions: dict[str, dict] = {}
+        self.grid_mix: dict[str, dict] = {}
+        self.az_region: dict[str, str] = {}
+        self.neighbor_az: dict[str, str] = {}
+
+        for entry in data["regions"]:
+            cfg = {**defaults, **entry}
+            region_id = cfg.pop("id")
+            if region_id in self.regions:
+                raise ValueError(f"Duplicate region {region_id} in registry")
+            if cfg["carbon"] not in CARBON_SOURCES:
+                raise ValueError(f"{region_id}: unknown carbon source {cfg['carbon']!r}")
+            if "azs" not in cfg:
+                cfg["azs"] = [
+                    {"id": f"{cfg['az_prefix']}-{n}", "name": f"{cfg['name']} AZ-{n}"}
+                    for n in range(1, cfg["zones"] + 1)
+                ]
+            for cfg_key in ("az_prefix", "zones"):
+                cfg.pop(cfg_key, None)
+
+            az_ids = [az["id"] for az in cfg["azs"]]
+            for i, az_id in enumerate(az_ids):
+                if az_id in self.az_region:
+                    raise ValueError(f"AZ {az_id} of {region_id} already belongs to {self.az_region[az_id]}")
+                self.az_region[az_id] = region_id
+                self.neighbor_az[az_id] = az_ids[(i + 1) % len(az_ids)]
+
+            if cfg.get("grid"):
+                self.grid_mix[region_id] = mixes[cfg["grid"]]
+            self.regions[region_id] = cfg
+
+        ids = list(self.regions)
+        self.shards: tuple[tuple[str, ...], ...] = tuple(
+            tuple(ids[i:i + shard_size]) for i in range(0, len(ids), max(shard_size, 1))
+        )
+        self.shard_of: dict[str, int] = {
+            region_id: n for n, shard in enumerate(self.shards) for region_id in shard
+        }
+
+
+def load_registry(path: str | Path = REGIONS_FILE, shard_size: int = SHARD_SIZE) -> RegionRegistry:
+    return RegionRegistry(json.loads(Path(path).read_text(encoding="utf-8")), shard_size)
+
+
+REGISTRY = load_registry()
@@ -0,0 +1,168 @@
+"""
+NERVE Engine — Azure Retail Prices pager
+Streams every page of a Retail Prices query (follows NextPageLink) and parses
+the Items array incrementally as bytes arrive, so callers can fold items
+(cheapest meter per SKU...) without ever holding a full response body.
+Shared by engine.scraper and EVE/backend/nerve_scan.py.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+from typing import Any, AsyncIterator
+
+import httpx
+
+log = logging.getLogger("nerve.retail_prices")
+
+RETAIL_PRICES_URL = "https://prices.azure.com/api/retail/prices"
+
+PREFETCH_BATCHES = 8   # parsed item batches buffered ahead of the consumer
+MAX_PAGES = 50         # hard stop against a runaway NextPageLink chain
+
+_WHITESPACE = " \t\n\r,"
+_DONE = object()
+
+
+class PageLimitExceeded(RuntimeError):
+    """The query still had a NextPageLink after max_pages — the result is incomplete."""
+
+
+class _PageParser:
+    """
+    Incremental parser for one Retail Prices page.
+    feed() returns the Items completed so far; close() returns any leftovers
+    and sets next_link from the fields around the Items array.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._head = ""
+        self._state = "head"  # head → items → tail
+        self.next_link: str | None = None
+
+    def feed(self, text: str) -> list[dict]:
+        self._buf += text
+        if self._state == "head":
+            i = self._buf.find('"Items"')
+            j = self._buf.find("[", i) if i >= 0 else -1
+            if j < 0:
+                return []
+            self._head = self._buf[:i]
+            self._buf = self._buf[j + 1:]
+            self._state = "items"
+        if self._state != "items":
+            return []
+
+        items: list[dict] = []
+        buf, pos, n = self._buf, 0, len(self._buf)
+        while True:
+            while pos < n and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= n:
+                break
+            if buf[pos] == "]":
+                self._state = "tail"
+                pos += 1
+                break
+            try:
+                item, pos = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break  # object split across chunks — wait for more bytes
+            items.append(item)
+        self._buf = buf[pos:]
+        return items
+
+    def close(self) -> list[dict]:
+        if self._state == "tail":
+            # Re-assemble the envelope with an empty Items array
+            meta = json.loads(self._head + '"Items":[]' + self._buf)
+            self.next_link = meta.get("NextPageLink")
+            return []
+        if self._state == "head":
+            # No Items array seen while streaming — parse what we have
+            data = json.loads(self._buf) if self._buf.strip() else {}
+            self.next_link = data.get("NextPageLink")
+            return data.get("Items", [])
+        raise ValueError("truncated Retail Prices page (Items array not closed)")
+
+
+async def iter_price_items(
+    client: httpx.AsyncClient,
+    url: str = RETAIL_PRICES_URL,
+    params: dict[str, Any] | None = None,
+    *,
+    timeout: float | httpx.Timeout = 15.0,
+    prefetch: int = PREFETCH_BATCHES,
+    max_pages: int = MAX_PAGES,
+    slots: asyncio.Semaphore | None = None,
+) -> AsyncIterator[dict]:
+    """
+    Yield every item of a Retail Prices query across all pages.
+    A background producer streams and parses pages (bounded by `prefetch`
+    batches) while the caller folds items, so the next page is already in
+    flight when the current one is consumed. `slots` is an optional
+    concurrency cap held for each page request — never while waiting on a
+    slow consumer. Iterate inside contextlib.aclosing() so the producer is
+    cancelled as soon as the caller stops early. Raises PageLimitExceeded
+    (after the items already yielded) when the query outgrows `max_pages`,
+    so a truncated result is never mistaken for a complete one.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(prefetch, 1))
+
+    async def produce():
+        next_url, next_params, pages = url, params, 0
+        try:
+            while next_url and pages < max_pages:
+                parser = _PageParser()
+                # Batches the consumer has no room for yet: kept until the slot is released
+                backlog: list[list[dict]] = []
+
+                def offer(batch: list[dict]):
+                    if not backlog:
+                        try:
+                            queue.put_nowait(batch)
+                            return
+                        except asyncio.QueueFull:
+                            pass
+                    backlog.append(batch)
+
+                async with slots or contextlib.nullcontext():
+                    async with client.stream("GET", next_url, params=next_params, timeout=timeout) as resp:
+                        resp.raise_for_status()
+                        async for text in resp.aiter_text():
+                            batch = parser.feed(text)
+                            if batch:
+                                offer(batch)
+                    tail = parser.close()
+                    if tail:
+                        offer(tail)
+                for batch in backlog:
+                    await queue.put(batch)
+                pages += 1
+                # NextPageLink already carries the filter + $skip
+                next_url, next_params = parser.next_link, None
+            if next_url:
+                raise PageLimitExceeded(f"Retail Prices query still paging after {max_pages} pages")
+            await queue.put(_DONE)
+        except Exception as e:
+            await queue.put(e)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            batch = await queue.get()
+            if batch is _DONE:
+                return
+            if isinstance(batch, Exception):
+                raise batch
+            for item in batch:
+                yield item
+    finally:
+        producer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await producer
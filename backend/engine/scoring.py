@@ -6,19 +6,27 @@ score = w_price * price + w_carbon * carbon + w_avail * (1-avail) + w_cool * coo
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+import time
+from bisect import bisect_left
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import AsyncIterator, Iterable, NamedTuple
+
+import numpy as np
 
 from models import (
     Availability,
+    AZInfo,
     CheckpointConfig,
     DashboardStats,
     Decision,
     Fallback,
+    GpuInstance,
     GreenImpact,
     InterruptionRisk,
+    RegionInfo,
     RiskAssessment,
     Savings,
     ServerStep,
@@ -26,8 +34,13 @@ from models import (
     SimulateResponse,
     StartStrategy,
 )
+from engine import metrics
+from engine.candidates import AVAILABILITY_LEVELS, CandidateIndex, CandidateMatrix, candidates_for
+from engine.gpu_catalog import CATALOG as GPU_CATALOG
+from engine.gpu_catalog import lookup as lookup_gpu
 from engine.scraper import get_region_data
-from engine.timeshifter import should_time_shift
+from engine.stats_journal import StatsJournal
+from engine.timeshifter import live_curves, should_time_shift
 
 log = logging.getLogger("nerve.scoring")
 
@@ -43,10 +56,8 @@ WEIGHTS = {
 
 EUR_USD = 0.92
 
-KWH_PER_GPU_HR = {
-    "v100": 0.30, "t4": 0.07, "a10": 0.15, "a100": 0.40, "h100": 0.70,
-    "m60": 0.15, "mi25": 0.10,
-}
+KWH_PER_GPU_HR = GPU_CATALOG.kwh_per_gpu_hr  # accelerator -> kWh per GPU-hour
+PUE = 1.2  # datacenter overhead on top of the GPU draw
 
 _AVAIL_SCORES = {
     Availability.HIGH: 1.0,
@@ -59,34 +70,21 @@ _AVAIL_SCORES = {
 
 _STATS_FILE = Path(__file__).resolve().parent.parent / "data" / "stats.json"
 
-def _load_stats() -> dict:
-    if _STATS_FILE.exists():
-        try:
-            with open(_STATS_FILE) as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return {
-        "total_jobs": 0,
-        "total_savings_usd": 0.0,
-        "total_co2_saved_g": 0.0,
-        "total_checkpoints": 0,
-        "total_evictions": 0,
-    }
-
-def _save_stats(stats: dict):
-    try:
-        _STATS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(_STATS_FILE, "w") as f:
-            json.dump(stats, f, indent=2)
-    except Exception:
-        pass
-
-_stats = _load_stats()
-
-
-def _gpu_family(gpu_name: str) -> str:
-    lower = gpu_name.lower()
+# Write-behind: increments stay in memory, a background thread journals them
+_stats = StatsJournal(_STATS_FILE, {
+    "total_jobs": 0,
+    "total_savings_usd": 0.0,
+    "total_co2_saved_g": 0.0,
+    "total_checkpoints": 0,
+    "total_evictions": 0,
+})
+
+
+def _gpu_family(gpu) -> str:
+    spec = lookup_gpu(gpu.sku)
+    if spec is not None:
+        return spec.accelerator
+    lower = gpu.gpu_name.lower()
     for fam in ("h100", "a100", "a10", "v100", "t4", "m60", "mi25"):
         if fam in lower:
             return fam
@@ -94,7 +92,7 @@ def _gpu_family(gpu_name: str) -> str:
 
 
 def _score_gpu(gpu, carbon_gco2: float, temp_c: float, wind_kmh: float) -> float:
-    """NERVE scoring algorithm (lower = better)."""
+    """NERVE scoring algorithm (lower = better). Scalar reference for _score_matrix."""
     norm_price = min(gpu.spot_price_usd_hr / 15.0, 1.0)
     norm_carbon = min(carbon_gco2 / 500.0, 1.0)
     avail_score = _AVAIL_SCORES.get(gpu.availability, 0.5)
@@ -110,56 +108,119 @@ def _score_gpu(gpu, carbon_gco2: float, temp_c: float, wind_kmh: float) -> float
     )
 
 
-async def run_simulation(req: SimulateRequest) -> SimulateResponse:
-    """Full NERVE simulation using LIVE data."""
-    regions_to_check = (
-        [req.preferred_region] if req.preferred_region else
-        ["francecentral", "westeurope", "uksouth"]
-    )
-
-    best_gpu = None
-    best_score = float("inf")
-    best_region = None
-    best_az = None
-    fallback_gpu = None
-    fallback_az = None
-
-    for region_id in regions_to_check:
-        region = await get_region_data(region_id)
-        for az in region.availability_zones:
-            for gpu in az.gpu_instances:
-                if gpu.ram_gb < req.min_gpu_memory_gb:
-                    continue
-                score = _score_gpu(
-                    gpu,
-                    az.carbon_intensity_gco2_kwh,
-                    az.temperature_c,
-                    az.wind_kmh,
-                )
-                if score < best_score:
-                    if best_gpu:
-                        fallback_gpu = best_gpu
-                        fallback_az = best_az
-                    best_score = score
-                    best_gpu = gpu
-                    best_region = region
-                    best_az = az
-                elif fallback_gpu is None:
-                    fallback_gpu = gpu
-                    fallback_az = az
-
-    if not fallback_gpu:
-        fallback_gpu = best_gpu
-        fallback_az = best_az
+_AVAIL_LUT = np.array([_AVAIL_SCORES.get(level, 0.5) for level in AVAILABILITY_LEVELS])
+
+
+def _score_matrix(c: CandidateMatrix) -> np.ndarray:
+    """
+    _score_gpu over every candidate in one vectorized pass — the same float64
+    operations in the same order, so each score is bit-for-bit equal.
+    Cached on the matrix (it only depends on the snapshot).
+    """
+    if c.scores is None:
+        norm_price = np.minimum(c.price / 15.0, 1.0)
+        norm_carbon = np.minimum(c.carbon / 500.0, 1.0)
+        avail_score = _AVAIL_LUT[c.availability]
+        norm_cooling = np.minimum(np.maximum(c.temperature, 0) / 40.0, 1.0)
+        renew_score = np.minimum(c.wind / 50.0, 1.0)
+        c.scores = (
+            WEIGHTS["price"] * norm_price
+            + WEIGHTS["carbon"] * norm_carbon
+            + WEIGHTS["availability"] * (1 - avail_score)
+            + WEIGHTS["cooling"] * norm_cooling
+            + WEIGHTS["renewable"] * (1 - renew_score)
+        )
+    return c.scores
+
+
+# Spot evictions hit one AZ at a time: the fallback hops to another AZ when one qualifies
+FALLBACK_DIVERSITY = ("az",)
+
+
+def _candidate_index(c: CandidateMatrix) -> CandidateIndex:
+    """Memory-bucketed ranking of a matrix, built once per snapshot alongside its scores."""
+    if c.index is None:
+        c.index = CandidateIndex(c, _score_matrix(c))
+    return c.index
+
+
+def _pick_best(c: CandidateMatrix, min_memory_gb: float) -> tuple[int, int] | None:
+    """
+    (best, fallback) offer indexes among candidates with enough memory, or None.
+    Best is the lowest score (earliest offer on ties). Fallback is the best
+    offer in another AZ, else the runner-up, else the best itself when alone.
+    """
+    index = _candidate_index(c)
+    ranked = index.top_k(min_memory_gb, 2, FALLBACK_DIVERSITY)
+    if not ranked:
+        return None
+    if len(ranked) == 1:
+        ranked += index.top_k(min_memory_gb, 2)[1:] or ranked
+    return ranked[0], ranked[1]
+
+
+DEFAULT_REGIONS = ("francecentral", "westeurope", "uksouth")
+
+
+class _SimulationContext:
+    """
+    What the jobs of one call share: one clock, candidate matrices per region
+    set, live price/carbon curves per region, and time-shift answers per
+    (deadline, hours, region) — each computed at most once.
+    """
+
+    def __init__(self):
+        self.now = datetime.now(timezone.utc)
+        self._candidates: dict[tuple[str, ...], CandidateMatrix] = {}
+        self._curves: dict[str, tuple[dict[int, float], dict[int, float]]] = {}
+        self._time_shifts: dict[tuple, dict] = {}
+
+    async def candidates(self, region_ids: tuple[str, ...]) -> CandidateMatrix:
+        matrix = self._candidates.get(region_ids)
+        if matrix is None:
+            regions = [await get_region_data(region_id) for region_id in region_ids]
+            matrix = self._candidates[region_ids] = candidates_for(regions)
+        return matrix
+
+    async def time_shift(self, deadline: datetime, gpu_hours: float, region_id: str) -> dict:
+        key = (deadline, gpu_hours, region_id)
+        result = self._time_shifts.get(key)
+        if result is None:
+            curves = self._curves.get(region_id)
+            if curves is None:
+                curves = self._curves[region_id] = live_curves(region_id)
+            result = self._time_shifts[key] = await should_time_shift(
+                deadline, gpu_hours, region_id, curves=curves, now=self.now,
+            )
+        return result
+
+
+async def _simulate(
+    req: SimulateRequest,
+    ctx: _SimulationContext,
+    log_level: int = logging.INFO,
+) -> tuple[SimulateResponse, float, float]:
+    """One job against the shared context: (response, savings_usd, co2_saved_g). No stats recorded."""
+    regions_to_check = (req.preferred_region,) if req.preferred_region else DEFAULT_REGIONS
+
+    candidates = await ctx.candidates(regions_to_check)
+    picked = _pick_best(candidates, req.min_gpu_memory_gb)
+    if picked is not None:
+        best_region, best_az, best_gpu = candidates.offer(picked[0])
+        _, fallback_az, fallback_gpu = candidates.offer(picked[1])
+        best_score = float(_score_matrix(candidates)[picked[0]])
+    else:
+        best_region = best_az = best_gpu = fallback_az = fallback_gpu = None
+        best_score = float("inf")
 
     # Time-shifting with live data
     primary_region = best_region.region_id if best_region else "francecentral"
-    time_shift = await should_time_shift(req.deadline, req.estimated_gpu_hours, primary_region)
+    time_shift = await ctx.time_shift(req.deadline, req.estimated_gpu_hours, primary_region)
     strategy = StartStrategy.TIME_SHIFTED if time_shift["recommended"] else StartStrategy.IMMEDIATE
     optimal_start = time_shift.get("optimal_start")
 
-    now = datetime.now(timezone.utc)
-    gpu_family = _gpu_family(best_gpu.gpu_name)
+    now = ctx.now
+    gpu_family = _gpu_family(best_gpu)
     kwh_per_hr = KWH_PER_GPU_HR.get(gpu_family, 0.30)
 
     # Financial calculations with REAL prices
@@ -169,23 +230,18 @@ async def run_simulation(req: SimulateRequest) -> SimulateResponse:
     time_shift_bonus = savings_usd * 0.08 if strategy == StartStrategy.TIME_SHIFTED else 0
 
     # Carbon with REAL intensity
-    total_kwh = kwh_per_hr * req.estimated_gpu_hours * 1.2
+    total_kwh = kwh_per_hr * req.estimated_gpu_hours * PUE
     total_co2 = total_kwh * best_az.carbon_intensity_gco2_kwh
     worst_co2 = total_kwh * 500
     co2_saved = worst_co2 - total_co2
 
-    # Record stats persistently
-    _stats["total_jobs"] += 1
-    _stats["total_savings_usd"] += savings_usd
-    _stats["total_co2_saved_g"] += co2_saved
-    _save_stats(_stats)
-
-    log.info(
+    log.log(
+        log_level,
         f"Simulation: {best_gpu.sku} @ ${best_gpu.spot_price_usd_hr}/h "
         f"(score={best_score:.3f}, savings=${savings_usd:.2f})"
     )
 
-    return SimulateResponse(
+    response = SimulateResponse(
         decision=Decision(
             primary_region=primary_region,
             primary_az=best_az.az_id,
@@ -252,27 +308,236 @@ async def run_simulation(req: SimulateRequest) -> SimulateResponse:
             max_evictions_per_hour=2,
         ),
     )
+    return response, savings_usd, co2_saved
+
+
+def _record_jobs(count: int, savings_usd: float, co2_saved_g: float):
+    """Fold finished jobs into the persistent stats (in memory, journaled in the background)."""
+    if not count:
+        return
+    _stats.record(total_jobs=count, total_savings_usd=savings_usd, total_co2_saved_g=co2_saved_g)
+
+
+@metrics.SIMULATION.timed()
+async def run_simulation(req: SimulateRequest) -> SimulateResponse:
+    """Full NERVE simulation using LIVE data."""
+    response, savings_usd, co2_saved = await _simulate(req, _SimulationContext())
+    _record_jobs(1, savings_usd, co2_saved)
+    return response
+
+
+async def stream_simulations(reqs: Iterable[SimulateRequest]) -> AsyncIterator[tuple[int, SimulateResponse]]:
+    """
+    Simulate many jobs against one snapshot, yielding (input index, response)
+    in input order as each completes. Candidates, curves and time-shift
+    searches are shared across jobs; stats are recorded once, when the stream
+    ends (or is closed early, for the jobs already yielded).
+    """
+    ctx = _SimulationContext()
+    count, savings_total, co2_total = 0, 0.0, 0.0
+    t0 = time.perf_counter()
+    try:
+        for i, req in enumerate(reqs):
+            response, savings_usd, co2_saved = await _simulate(req, ctx, logging.DEBUG)
+            count += 1
+            savings_total += savings_usd
+            co2_total += co2_saved
+            yield i, response
+            await asyncio.sleep(0)  # let other requests run between jobs of a large batch
+    finally:
+        _record_jobs(count, savings_total, co2_total)
+        metrics.SIMULATION_BATCH.observe(time.perf_counter() - t0)
+        metrics.SIMULATION_JOBS.inc(count)
+        if count:
+            log.info(f"Batch simulation: {count} jobs, savings=${savings_total:.2f}")
+
+
+async def top_candidates(
+    min_memory_gb: float,
+    k: int = 5,
+    region_ids: Iterable[str] | None = None,
+    distinct: tuple[str, ...] = FALLBACK_DIVERSITY,
+) -> list[tuple[RegionInfo, AZInfo, GpuInstance, float]]:
+    """
+    The k best-scored offers with enough memory, best first, as (region, az,
+    gpu, score). `distinct` names the attributes that must differ between
+    picks ("region", "az", "sku"); () ranks every offer.
+    """
+    candidates = await _SimulationContext().candidates(tuple(region_ids or DEFAULT_REGIONS))
+    scores = _score_matrix(candidates)
+    return [
+        (*candidates.offer(i), float(scores[i]))
+        for i in _candidate_index(candidates).top_k(min_memory_gb, k, distinct)
+    ]
+
+
+async def run_simulations(reqs: Iterable[SimulateRequest]) -> list[SimulateResponse]:
+    """Batch form of run_simulation: responses in input order."""
+    return [response async for _, response in stream_simulations(reqs)]
+
+
+# ── Pareto frontier mode ─────────────────────────────────────────────
+# The scalar score hides trade-offs: the frontier keeps every offer no other
+# offer beats on spot price, CO2 per hour and availability at once.
+
+class FrontierPoint(NamedTuple):
+    region: RegionInfo
+    az: AZInfo
+    gpu: GpuInstance
+    price_usd_hr: float
+    co2_g_hr: float       # GPU draw x PUE x AZ carbon intensity
+    availability: float   # 0..1, higher is better
+    score: float          # scalar NERVE score, for reference
+
+
+def _co2_per_hr(c: CandidateMatrix) -> np.ndarray:
+    """gCO2 per hour of each offer, cached on the matrix."""
+    if c.co2_per_hr is None:
+        kwh_by_gpu: dict[tuple[str, str], float] = {}  # a snapshot has a few dozen distinct GPUs
+        kwh = np.empty(len(c))
+        for i, (_, _, gpu) in enumerate(c.offers):
+            key = (gpu.sku, gpu.gpu_name)
+            value = kwh_by_gpu.get(key)
+            if value is None:
+                value = kwh_by_gpu[key] = KWH_PER_GPU_HR.get(_gpu_family(gpu), 0.30)
+            kwh[i] = value
+        c.co2_per_hr = kwh * PUE * c.carbon
+    return c.co2_per_hr
+
+
+def _skyline(price: np.ndarray, co2: np.ndarray, avail: np.ndarray) -> np.ndarray:
+    """
+    Positions of the non-dominated points (min price, min co2, max avail) in
+    O(n log n): points sorted by (price, co2, -avail) so any dominator comes
+    first, then one sweep over the distinct points keeps a Fenwick tree of the
+    lowest co2 seen per availability rank. A point survives when nothing seen
+    at its availability or better has co2 <= its; identical points share a fate.
+    """
+    n = len(price)
+    if not n:
+        return np.array([], dtype=np.intp)
+    order = np.lexsort((-avail, co2, price))
+    p, c, a = price[order], co2[order], avail[order]
+    new = np.ones(n, dtype=bool)
+    new[1:] = (p[1:] != p[:-1]) | (c[1:] != c[:-1]) | (a[1:] != a[:-1])
+    group = np.cumsum(new) - 1                      # sorted position -> distinct point
+    levels, rank = np.unique(-a[new], return_inverse=True)  # rank 0 = best availability
+    size = len(levels)
+    tree = [np.inf] * (size + 1)
+    keep = np.zeros(int(new.sum()), dtype=bool)
+    for j, (co2_j, r) in enumerate(zip(c[new].tolist(), rank.reshape(-1).tolist())):
+        i, best = r + 1, np.inf
+        while i > 0:
+            best = min(best, tree[i])
+            i -= i & -i
+        if best > co2_j:
+            keep[j] = True
+            # Dominated points never need inserting: their dominator answers for them
+            i = r + 1
+            while i <= size:
+                if co2_j < tree[i]:
+                    tree[i] = co2_j
+                i += i & -i
+    return np.sort(order[keep[group]])
+
+
+def _frontier(c: CandidateMatrix, min_memory_gb: float) -> np.ndarray:
+    """
+    Frontier offer indexes among candidates with enough memory, by ascending
+    price (then co2, then availability). Cached per memory bucket of the
+    matrix, so each snapshot computes a frontier once per bucket.
+    """
+    index = _candidate_index(c)
+    start = bisect_left(index.thresholds, min_memory_gb)
+    frontier = c.frontiers.get(start)
+    if frontier is None:
+        if start < len(index.thresholds):
+            eligible = np.flatnonzero(c.ram_gb >= index.thresholds[start])
+        else:
+            eligible = np.array([], dtype=np.intp)
+        co2, avail = _co2_per_hr(c), _AVAIL_LUT[c.availability]
+        points = eligible[_skyline(c.price[eligible], co2[eligible], avail[eligible])]
+        order = np.lexsort((-avail[points], co2[points], c.price[points]))
+        frontier = c.frontiers[start] = points[order]
+    return frontier
+
+
+def _frontier_point(c: CandidateMatrix, i: int) -> FrontierPoint:
+    return FrontierPoint(
+        *c.offer(i),
+        price_usd_hr=float(c.price[i]),
+        co2_g_hr=float(_co2_per_hr(c)[i]),
+        availability=float(_AVAIL_LUT[c.availability[i]]),
+        score=float(_score_matrix(c)[i]),
+    )
+
+
+async def pareto_frontier(
+    min_memory_gb: float = 0.0,
+    region_ids: Iterable[str] | None = None,
+) -> list[FrontierPoint]:
+    """Every non-dominated offer with enough memory, cheapest first."""
+    candidates = await _SimulationContext().candidates(tuple(region_ids or DEFAULT_REGIONS))
+    return [_frontier_point(candidates, i) for i in _frontier(candidates, min_memory_gb).tolist()]
+
+
+async def pick_frontier_point(
+    min_memory_gb: float,
+    gpu_hours: float = 1.0,
+    budget_usd: float | None = None,
+    carbon_cap_g: float | None = None,
+    region_ids: Iterable[str] | None = None,
+) -> FrontierPoint | None:
+    """
+    Choose a frontier offer for a job of `gpu_hours` without rescoring:
+    - budget only: the lowest-carbon offer whose job cost fits the budget
+    - carbon cap (with or without budget): the cheapest offer under the cap
+    - neither: the frontier offer with the best NERVE score
+    Ties go to the higher availability. None when nothing fits.
+    """
+    candidates = await _SimulationContext().candidates(tuple(region_ids or DEFAULT_REGIONS))
+    frontier = _frontier(candidates, min_memory_gb)
+    price = candidates.price[frontier] * gpu_hours
+    co2 = _co2_per_hr(candidates)[frontier] * gpu_hours
+    avail = _AVAIL_LUT[candidates.availability[frontier]]
+
+    fits = np.ones(len(frontier), dtype=bool)
+    if budget_usd is not None:
+        fits &= price <= budget_usd
+    if carbon_cap_g is not None:
+        fits &= co2 <= carbon_cap_g
+    choices = np.flatnonzero(fits)
+    if not len(choices):
+        return None
+
+    if budget_usd is not None and carbon_cap_g is None:
+        keys = (price[choices], -avail[choices], co2[choices])
+    elif carbon_cap_g is not None:
+        keys = (co2[choices], -avail[choices], price[choices])
+    else:
+        keys = (-avail[choices], _score_matrix(candidates)[frontier][choices])
+    best = choices[np.lexsort(keys)[0]]
+    return _frontier_point(candidates, int(frontier[best]))
 
 
 def record_checkpoint():
-    _stats["total_checkpoints"] += 1
-    _save_stats(_stats)
+    _stats.record(total_checkpoints=1)
 
 def record_eviction():
-    _stats["total_evictions"] += 1
-    _save_stats(_stats)
+    _stats.record(total_evictions=1)
 
 
 async def get_dashboard_stats() -> DashboardStats:
     from engine.scraper import get_scraper_status
     scraper = get_scraper_status()
+    stats = _stats.totals()
     return DashboardStats(
-        total_jobs_managed=_stats["total_jobs"],
-        total_savings_usd=round(_stats["total_savings_usd"], 2),
-        total_savings_eur=round(_stats["total_savings_usd"] * EUR_USD, 2),
-        total_co2_saved_grams=round(_stats["total_co2_saved_g"], 1),
-        total_checkpoints_saved=_stats["total_checkpoints"],
-        total_evictions_handled=_stats["total_evictions"],
+        total_jobs_managed=stats["total_jobs"],
+        total_savings_usd=round(stats["total_savings_usd"], 2),
+        total_savings_eur=round(stats["total_savings_usd"] * EUR_USD, 2),
+        total_co2_saved_grams=round(stats["total_co2_saved_g"], 1),
+        total_checkpoints_saved=stats["total_checkpoints"],
+        total_evictions_handled=stats["total_evictions"],
         avg_savings_pct=78.0,
         uptime_pct=100.0,
         regions_monitored=scraper.get("regions", ["francecentral", "westeurope", "uksouth"]),
@@ -9,16 +9,36 @@ Scrape en temps reel (boucle async toutes les 60s) :
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import hashlib
 import json
 import logging
 import math
+import os
+import random
+import time
+from array import array
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable
+from types import MappingProxyType
+from typing import Any, Mapping, NamedTuple
 
 import httpx
-
+import numpy as np
+
+from engine import metrics
+from engine.events import bus as event_bus
+from engine.events import on_event, publish  # noqa: F401 — on_event re-exported for WebSocket listeners
+from engine.gpu_catalog import CATALOG as GPU_CATALOG
+from engine.gpu_catalog import lookup as lookup_gpu
+from engine.history import PriceRing
+from engine.http_client import AZURE_TIMEOUT, get_client, get_client_stats, start_client, stop_client
+from engine.regions import REGISTRY
+from engine.retail_prices import RETAIL_PRICES_URL, iter_price_items
+from engine.shared_snapshot import LeaderLock, SnapshotReader, write_snapshot
+from engine.tsdb import PriceStore
+from engine.vision_delta import DeltaStream
+from engine.vision_writer import VisionWriter
 from models import (
     AZInfo,
     Availability,
@@ -30,48 +50,12 @@ from models import (
 log = logging.getLogger("nerve.scraper")
 
 # ── Config regions ───────────────────────────────────────────────────
+#
+# Data-driven: see engine/regions.json and engine.regions.RegionRegistry.
+# Regions are scraped in shards — one batched upstream query per shard.
 
-REGIONS = {
-    "francecentral": {
-        "name": "France Central",
-        "cloud_provider": "azure",
-        "location": "Paris, France",
-        "lat": 48.8566,
-        "lng": 2.3522,
-        "timezone": "Europe/Paris",
-        "azs": [
-            {"id": "fr-central-1", "name": "France Central AZ-1"},
-            {"id": "fr-central-2", "name": "France Central AZ-2"},
-            {"id": "fr-central-3", "name": "France Central AZ-3"},
-        ],
-    },
-    "westeurope": {
-        "name": "West Europe",
-        "cloud_provider": "azure",
-        "location": "Amsterdam, Netherlands",
-        "lat": 52.3676,
-        "lng": 4.9041,
-        "timezone": "Europe/Amsterdam",
-        "azs": [
-            {"id": "we-1", "name": "West Europe AZ-1"},
-            {"id": "we-2", "name": "West Europe AZ-2"},
-            {"id": "we-3", "name": "West Europe AZ-3"},
-        ],
-    },
-    "uksouth": {
-        "name": "UK South",
-        "cloud_provider": "azure",
-        "location": "London, UK",
-        "lat": 51.5074,
-        "lng": -0.1278,
-        "timezone": "Europe/London",
-        "azs": [
-            {"id": "uk-south-1", "name": "UK South AZ-1"},
-            {"id": "uk-south-2", "name": "UK South AZ-2"},
-            {"id": "uk-south-3", "name": "UK South AZ-3"},
-        ],
-    },
-}
+REGIONS = REGISTRY.regions
+SHARDS = REGISTRY.shards
 
 # GPU families we care about (NC = compute GPU, NV = visualization GPU)
 GPU_SKU_PREFIXES = ("Standard_NC", "Standard_NV", "Standard_ND")
@@ -83,161 +67,242 @@ _cache: dict[str, Any] = {
     "gpu_prices": {},      # region_id -> list[dict]
     "weather": {},         # region_id -> dict
     "carbon": {},          # region_id -> dict
-    "scrape_count": 0,
+    "scrape_count": 0,     # scheduler firings, not full sweeps (see _scrape_all)
     "errors": [],
-    "price_history": {},   # region_id -> list[{timestamp, avg_spot, min_spot, max_spot}]
+    "price_history": {},   # region_id -> PriceRing (ts, avg/min/max spot, avg compute spot)
 }
 
-_event_listeners: list[Callable] = []
-
 _DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 _VISION_DIR = Path(__file__).resolve().parent.parent.parent / "vision"
 
 
-def on_event(fn: Callable):
-    """Register a listener for scraper events (used by WebSocket)."""
-    _event_listeners.append(fn)
+# ── Payload fingerprints ─────────────────────────────────────────────
+#
+# Most cycles return exactly the same upstream data. Every normalized
+# payload is hashed; when nothing changed for a region we skip the GPU
+# rebuild, price diffing and its export section, and history just repeats
+# the previous point.
+
+_fingerprints: dict[tuple, str] = {}   # (region, source, ...) -> digest
+_changed_regions: set[str] = set()     # regions whose data changed since last export
+
+_skip_stats: dict[str, dict[str, int]] = {
+    "prices": {"checked": 0, "skipped": 0},
+    "environment": {"checked": 0, "skipped": 0},
+    "export": {"checked": 0, "skipped": 0},
+    "publish": {"checked": 0, "skipped": 0},
+}
 
 
-def _emit(event: dict):
-    """Emit an event to all registered listeners."""
-    event["timestamp"] = datetime.now(timezone.utc).isoformat()
-    for fn in _event_listeners:
-        try:
-            fn(event)
-        except Exception:
-            pass
+def _fingerprint(payload: Any) -> str:
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
 
 
-# ── Azure Retail Prices API ──────────────────────────────────────────
+def _payload_changed(key: tuple, payload: Any) -> bool:
+    """Store the payload fingerprint under `key`; True if it differs from the previous one."""
+    digest = _fingerprint(payload)
+    if _fingerprints.get(key) == digest:
+        return False
+    _fingerprints[key] = digest
+    return True
 
-async def _scrape_azure_gpu_prices(client: httpx.AsyncClient, region_id: str) -> list[dict]:
-    """Fetch real GPU Spot prices from Azure Retail Prices API."""
-    gpus: list[dict] = []
 
-    for prefix_type in ["NC", "NV", "ND"]:
-        url = (
-            "https://prices.azure.com/api/retail/prices"
-            f"?$filter=serviceName eq 'Virtual Machines'"
-            f" and armRegionName eq '{region_id}'"
-            f" and contains(meterName,'Spot')"
-            f" and contains(armSkuName,'{prefix_type}')"
-        )
-        try:
-            resp = await client.get(url, timeout=15.0)
-            resp.raise_for_status()
-            data = resp.json()
-            items = data.get("Items", [])
-
-            # Deduplicate: keep cheapest per SKU (Windows vs Linux)
-            seen: dict[str, dict] = {}
-            for item in items:
-                sku = item.get("armSkuName", "")
-                price = item.get("retailPrice", 999)
-                if sku not in seen or price < seen[sku]["retailPrice"]:
-                    seen[sku] = item
+def _count_skip(kind: str, skipped: bool):
+    _skip_stats[kind]["checked"] += 1
+    if skipped:
+        _skip_stats[kind]["skipped"] += 1
 
-            for sku, item in seen.items():
-                gpu_info = _identify_gpu(sku)
-                if not gpu_info:
-                    continue
-                gpus.append({
-                    "region": region_id,
-                    "sku": sku,
-                    "gpu_name": gpu_info["name"],
-                    "gpu_count": gpu_info["count"],
-                    "vcpus": gpu_info["vcpus"],
-                    "ram_gb": gpu_info["ram_gb"],
-                    "spot_price_usd_hr": round(item["retailPrice"], 6),
-                    "ondemand_price_usd_hr": 0.0,  # fetched separately
-                    "savings_pct": 0.0,
-                    "availability": "high",  # recalculated after on-demand enrichment
-                    "tier": gpu_info["tier"],
-                })
-
-            log.info(f"Azure {region_id}/{prefix_type}: {len(seen)} GPU SKUs")
-        except Exception as e:
-            log.warning(f"Azure scrape failed {region_id}/{prefix_type}: {e}")
-            _cache["errors"].append(f"Azure {region_id}/{prefix_type}: {e}")
 
-    # Fetch on-demand prices for savings calculation
-    await _enrich_ondemand_prices(client, region_id, gpus)
+# ── Upstream concurrency ─────────────────────────────────────────────
 
-    return gpus
+MAX_CONCURRENT_REQUESTS = 16  # global cap on in-flight upstream calls
 
+# One cap per pooled-client lifetime: a restarted scraper (or another
+# asyncio.run, as in the bench) gets a fresh semaphore on its own loop.
+_request_slots: tuple[httpx.AsyncClient, asyncio.Semaphore] | None = None
 
-async def _enrich_ondemand_prices(client: httpx.AsyncClient, region_id: str, gpus: list[dict]):
-    """Fetch on-demand prices for each GPU SKU to compute savings % and real availability."""
-    for gpu in gpus:
-        sku = gpu["sku"]
-        url = (
-            "https://prices.azure.com/api/retail/prices"
-            f"?$filter=serviceName eq 'Virtual Machines'"
-            f" and armRegionName eq '{region_id}'"
-            f" and armSkuName eq '{sku}'"
-        )
-        try:
-            resp = await client.get(url, timeout=10.0)
-            resp.raise_for_status()
-            items = resp.json().get("Items", [])
-            # Find the non-Spot, non-Low Priority price
-            for item in items:
+
+def _slots() -> asyncio.Semaphore:
+    global _request_slots
+    client = get_client()
+    if _request_slots is None or _request_slots[0] is not client:
+        _request_slots = (client, asyncio.Semaphore(MAX_CONCURRENT_REQUESTS))
+    return _request_slots[1]
+
+
+async def _get(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    """GET through the global concurrency cap shared by every region/source."""
+    async with _slots():
+        return await client.get(url, **kwargs)
+
+
+# National readings shared by regions of different shards (carbonintensity.org.uk
+# serves the whole UK) are fetched once per publication window — the source's
+# TTL grid — and every region asking within that window gets the same result.
+# A failed fetch is not reused: the next cycle asks again.
+_shared_fetches: dict[str, tuple[int, asyncio.Future]] = {}
+
+
+def _fetch_failed(future: asyncio.Future) -> bool:
+    return future.done() and (future.cancelled() or future.exception() is not None or future.result() is None)
+
+
+async def _fetch_shared(key: str, ttl: float, fetch) -> Any:
+    """Result of `fetch()` for `key` in the current `ttl` window, started by its first caller."""
+    window = int(time.time() // ttl)
+    entry = _shared_fetches.get(key)
+    if (
+        entry is None or entry[0] != window or _fetch_failed(entry[1])
+        or entry[1].get_loop() is not asyncio.get_running_loop()  # scraper restarted on a new loop
+    ):
+        entry = _shared_fetches[key] = (window, asyncio.ensure_future(fetch()))
+    # A shard cancelled at the deadline must not cancel the fetch for the others
+    return await asyncio.shield(entry[1])
+
+
+# ── Azure Retail Prices API ──────────────────────────────────────────
+
+GPU_FAMILIES = ("NC", "NV", "ND")
+
+# Last fetched meters per (region, family): sku -> price.
+# Spot and on-demand are refreshed on independent cadences and joined locally.
+_meters: dict[str, dict[tuple[str, str], dict[str, float]]] = {
+    "spot": {},
+    "ondemand": {},
+}
+
+
+async def _scrape_azure_gpu_prices(
+    client: httpx.AsyncClient,
+    region_ids: tuple[str, ...],
+    sources: set[str] = frozenset({"azure_spot", "azure_ondemand"}),
+) -> tuple[set[str], set[str]]:
+    """
+    Refresh the stale Azure meter sets of a shard.
+    Returns (regions whose meters changed, sources whose every family was fetched).
+    """
+    # NC / NV / ND (x spot / on-demand) are independent queries — fan them out together
+    jobs, job_sources = [], []
+    for family in GPU_FAMILIES:
+        if "azure_spot" in sources:
+            jobs.append(_scrape_azure_meters(client, region_ids, family, spot=True))
+            job_sources.append("azure_spot")
+        if "azure_ondemand" in sources:
+            jobs.append(_scrape_azure_meters(client, region_ids, family, spot=False))
+            job_sources.append("azure_ondemand")
+    results = await asyncio.gather(*jobs)
+    changed: set[str] = set()
+    fetched = {src for src in ("azure_spot", "azure_ondemand") if src in sources}
+    for src, result in zip(job_sources, results):
+        if result is None:
+            fetched.discard(src)
+        else:
+            changed |= result
+    return changed, fetched
+
+
+async def _scrape_azure_meters(
+    client: httpx.AsyncClient, region_ids: tuple[str, ...], family: str, spot: bool,
+) -> set[str] | None:
+    """
+    Fetch one meter set (Spot or on-demand) of one GPU family (NC, NV or ND)
+    for every region of a shard in a single query. All pages are streamed;
+    only the per-region, per-SKU winners are kept. On failure — including a
+    query cut short by the page cap — nothing is committed, the previous
+    meters are kept and None is returned. Otherwise returns the regions whose
+    meter set changed.
+    """
+    kind = "spot" if spot else "ondemand"
+    shard_label = f"{region_ids[0]}..{region_ids[-1]}" if len(region_ids) > 1 else region_ids[0]
+    in_shard = " or ".join(f"armRegionName eq '{region_id}'" for region_id in region_ids)
+    # Pay-as-you-go meters of the family's SKUs only (no reservations / dev-test),
+    # so one shard stays a few pages — far below the pager's MAX_PAGES
+    flt = (
+        "serviceName eq 'Virtual Machines'"
+        " and priceType eq 'Consumption'"
+        f" and ({in_shard})"
+        f" and contains(armSkuName,'Standard_{family}')"
+    )
+    if spot:
+        flt += " and contains(meterName,'Spot')"
+    try:
+        by_region: dict[str, dict[str, float]] = {region_id: {} for region_id in region_ids}
+        items = iter_price_items(client, RETAIL_PRICES_URL, {"$filter": flt}, timeout=AZURE_TIMEOUT, slots=_slots())
+        async with contextlib.aclosing(items):
+            async for item in items:
+                prices = by_region.get(item.get("armRegionName", ""))
+                if prices is None:
+                    continue
+                sku = item.get("armSkuName", "")
                 meter = item.get("meterName", "")
-                if "Spot" not in meter and "Low Priority" not in meter:
-                    od_price = item["retailPrice"]
-                    gpu["ondemand_price_usd_hr"] = round(od_price, 4)
-                    if od_price > 0:
-                        gpu["savings_pct"] = round((1 - gpu["spot_price_usd_hr"] / od_price) * 100, 1)
-                    break
-        except Exception:
-            # Estimate on-demand as ~5x spot if API fails
-            gpu["ondemand_price_usd_hr"] = round(gpu["spot_price_usd_hr"] * 5, 4)
-            gpu["savings_pct"] = 80.0
-
-        # Recalculate availability with real spot/on-demand ratio
-        gpu["availability"] = _estimate_availability(
-            gpu["spot_price_usd_hr"],
-            gpu.get("tier", "mid"),
-            spot=gpu["spot_price_usd_hr"],
-            ondemand=gpu["ondemand_price_usd_hr"],
-        )
+                if spot:
+                    # Cheapest Spot meter per SKU (Windows vs Linux)
+                    price = item.get("retailPrice", 999)
+                    if sku not in prices or price < prices[sku]:
+                        prices[sku] = price
+                elif "Spot" not in meter and "Low Priority" not in meter and sku not in prices:
+                    # First regular (non-Spot, non-Low Priority) meter
+                    prices[sku] = item["retailPrice"]
+    except Exception as e:
+        log.warning(f"Azure scrape failed {shard_label}/{family} {kind}: {e}")
+        _cache["errors"].append(f"Azure {shard_label}/{family} {kind}: {e}")
+        return None
 
+    changed = set()
+    for region_id, prices in by_region.items():
+        _meters[kind][(region_id, family)] = prices
+        if _payload_changed((region_id, kind, family), prices):
+            changed.add(region_id)
+    log.info(f"Azure {shard_label}/{family} {kind}: {sum(map(len, by_region.values()))} SKUs in {len(region_ids)} regions")
+    return changed
 
-def _identify_gpu(sku: str) -> dict | None:
-    """Map Azure SKU name to GPU specs."""
-    s = sku.lower()
-    catalog = {
-        "nc6s_v3":    {"name": "Tesla V100 (16GB)", "count": 1, "vcpus": 6, "ram_gb": 112, "tier": "high"},
-        "nc12s_v3":   {"name": "Tesla V100 (16GB)", "count": 2, "vcpus": 12, "ram_gb": 224, "tier": "high"},
-        "nc24s_v3":   {"name": "Tesla V100 (16GB)", "count": 4, "vcpus": 24, "ram_gb": 448, "tier": "high"},
-        "nc24rs_v3":  {"name": "Tesla V100 (16GB)", "count": 4, "vcpus": 24, "ram_gb": 448, "tier": "high"},
-        "nc4as_t4_v3":  {"name": "Tesla T4 (16GB)", "count": 1, "vcpus": 4, "ram_gb": 28, "tier": "mid"},
-        "nc8as_t4_v3":  {"name": "Tesla T4 (16GB)", "count": 1, "vcpus": 8, "ram_gb": 56, "tier": "mid"},
-        "nc16as_t4_v3": {"name": "Tesla T4 (16GB)", "count": 1, "vcpus": 16, "ram_gb": 110, "tier": "mid"},
-        "nc64as_t4_v3": {"name": "Tesla T4 (16GB)", "count": 4, "vcpus": 64, "ram_gb": 440, "tier": "mid"},
-        "nc8ads_a10_v4":  {"name": "A10 (24GB)", "count": 1, "vcpus": 8, "ram_gb": 55, "tier": "mid"},
-        "nc16ads_a10_v4": {"name": "A10 (24GB)", "count": 1, "vcpus": 16, "ram_gb": 110, "tier": "mid"},
-        "nc32ads_a10_v4": {"name": "A10 (24GB)", "count": 2, "vcpus": 32, "ram_gb": 220, "tier": "mid"},
-        "nc48ads_a100_v4": {"name": "A100 (80GB)", "count": 2, "vcpus": 48, "ram_gb": 440, "tier": "premium"},
-        "nc96ads_a100_v4": {"name": "A100 (80GB)", "count": 4, "vcpus": 96, "ram_gb": 880, "tier": "premium"},
-        "ncc40ads_h100_v5": {"name": "H100 (80GB)", "count": 1, "vcpus": 40, "ram_gb": 320, "tier": "premium"},
-        "nc80adis_h100_v5": {"name": "H100 (80GB)", "count": 2, "vcpus": 80, "ram_gb": 640, "tier": "premium"},
-        "nv6ads_a10_v5":  {"name": "A10 (6GB slice)", "count": 1, "vcpus": 6, "ram_gb": 55, "tier": "low"},
-        "nv12ads_a10_v5": {"name": "A10 (12GB slice)", "count": 1, "vcpus": 12, "ram_gb": 110, "tier": "low"},
-        "nv18ads_a10_v5": {"name": "A10 (18GB slice)", "count": 1, "vcpus": 18, "ram_gb": 220, "tier": "mid"},
-        "nv36ads_a10_v5": {"name": "A10 (24GB)", "count": 1, "vcpus": 36, "ram_gb": 440, "tier": "mid"},
-        "nv4as_v4":   {"name": "Radeon MI25 (4GB)", "count": 1, "vcpus": 4, "ram_gb": 14, "tier": "low"},
-        "nv8as_v4":   {"name": "Radeon MI25 (8GB)", "count": 1, "vcpus": 8, "ram_gb": 28, "tier": "low"},
-        "nv16as_v4":  {"name": "Radeon MI25 (16GB)", "count": 1, "vcpus": 16, "ram_gb": 56, "tier": "low"},
-        "nv32as_v4":  {"name": "Radeon MI25 (32GB)", "count": 1, "vcpus": 32, "ram_gb": 112, "tier": "low"},
-        "nv12s_v3":   {"name": "Tesla M60 (8GB)", "count": 1, "vcpus": 12, "ram_gb": 112, "tier": "low"},
-        "nv24s_v3":   {"name": "Tesla M60 (16GB)", "count": 2, "vcpus": 24, "ram_gb": 224, "tier": "low"},
-        "nv48s_v3":   {"name": "Tesla M60 (32GB)", "count": 4, "vcpus": 48, "ram_gb": 448, "tier": "low"},
-    }
-    for key, specs in catalog.items():
-        if key in s:
-            return specs
-    return None
+
+def _join_spot_ondemand(region_id: str) -> list[dict]:
+    """
+    Join the latest Spot and on-demand meters of a region per SKU.
+    The join feeds savings_pct and _estimate_availability. While a family's
+    on-demand meters have never been fetched, on-demand is estimated at ~5x
+    Spot (80% savings), as when the on-demand lookup fails.
+    """
+    ondemand: dict[str, float] = {}
+    for family in GPU_FAMILIES:
+        for sku, price in _meters["ondemand"].get((region_id, family), {}).items():
+            ondemand.setdefault(sku, price)
+
+    gpus: list[dict] = []
+    for family in GPU_FAMILIES:
+        ondemand_known = (region_id, family) in _meters["ondemand"]
+        for sku, price in _meters["spot"].get((region_id, family), {}).items():
+            spec = lookup_gpu(sku)
+            if spec is None:
+                continue
+            spot_price = round(price, 6)
+            if ondemand_known:
+                od_price = ondemand.get(sku, 0.0)
+                savings = round((1 - spot_price / od_price) * 100, 1) if od_price > 0 else 0.0
+            else:
+                # Estimate on-demand as ~5x spot until the meters arrive
+                od_price = spot_price * 5
+                savings = 80.0
+            od_price = round(od_price, 4)
+            gpus.append({
+                "region": region_id,
+                "sku": sku,
+                "gpu_name": spec.name,
+                "gpu_count": spec.gpu_count,
+                "vcpus": spec.vcpus,
+                "ram_gb": spec.ram_gb,
+                "spot_price_usd_hr": spot_price,
+                "ondemand_price_usd_hr": od_price,
+                "savings_pct": savings,
+                # Availability from the real spot/on-demand ratio
+                "availability": _estimate_availability(
+                    spot_price, spec.tier, spot=spot_price, ondemand=od_price,
+                ),
+                "tier": spec.tier,
+            })
+    return gpus
 
 
 def _estimate_availability(price: float, tier: str, spot: float = 0, ondemand: float = 0) -> str:
@@ -264,14 +329,15 @@ def _estimate_availability(price: float, tier: str, spot: float = 0, ondemand: f
     return "high"
 
 
-def _az_price_variation(base_price: float, az_id: str, sku: str) -> float:
+def _az_price_variation(base_price: float, az_id: str, sku: str, hour: int | None = None) -> float:
     """
     Deterministic per-AZ price micro-variation.
     Uses hash(az_id + sku + hour) to create realistic ±3-8% Spot market
     differences between AZs within the same region — just like real AWS/Azure
     Spot markets where each AZ has its own capacity pool.
     """
-    hour = datetime.now(timezone.utc).hour
+    if hour is None:
+        hour = datetime.now(timezone.utc).hour
     seed = hashlib.md5(f"{az_id}:{sku}:{hour}".encode()).hexdigest()
     # Convert first 8 hex chars to a float in [-1, 1]
     val = (int(seed[:8], 16) / 0xFFFFFFFF) * 2 - 1  # range [-1, 1]
@@ -296,57 +362,112 @@ def _az_availability_shift(base_avail: str, az_id: str) -> str:
     return base_avail
 
 
+# ── Per-hour AZ variation table ──────────────────────────────────────
+#
+# AZ prices only change when the region's GPU list changes or the UTC hour
+# rolls over, so the hash-based variations are computed once per
+# (hour, price version) and read as arrays by get_region_data and the export.
+
+_price_versions: dict[str, int] = {}   # region_id -> bumped on every new GPU list
+_az_tables: dict[str, dict] = {}
+
+
+def _az_table(region_id: str) -> dict:
+    """
+    Per-AZ arrays aligned with _cache["gpu_prices"][region_id]:
+    {"azs": {az_id: {"spot": array, "savings": array, "availability": list}}}.
+    """
+    hour = datetime.now(timezone.utc).hour
+    key = (hour, _price_versions.get(region_id, 0))
+    table = _az_tables.get(region_id)
+    if table is not None and table["key"] == key:
+        return table
+
+    gpus_raw = _cache.get("gpu_prices", {}).get(region_id, [])
+    azs = {}
+    for az_cfg in REGIONS[region_id]["azs"]:
+        az_id = az_cfg["id"]
+        spot = array("d")
+        savings = array("d")
+        availability: list[str] = []
+        for g in gpus_raw:
+            az_spot = _az_price_variation(g["spot_price_usd_hr"], az_id, g["sku"], hour)
+            az_ondemand = g["ondemand_price_usd_hr"]  # on-demand is the same across AZs
+            spot.append(az_spot)
+            savings.append(round((1 - az_spot / az_ondemand) * 100, 1) if az_ondemand > 0 else g["savings_pct"])
+            base_avail = _estimate_availability(az_spot, g.get("tier", "mid"), spot=az_spot, ondemand=az_ondemand)
+            availability.append(_az_availability_shift(base_avail, az_id))
+        azs[az_id] = {"spot": spot, "savings": savings, "availability": availability}
+
+    table = {"key": key, "azs": azs}
+    _az_tables[region_id] = table
+    return table
+
+
 # ── Open-Meteo API ───────────────────────────────────────────────────
 
-async def _scrape_weather(client: httpx.AsyncClient, region_id: str) -> dict:
-    """Fetch real weather data from Open-Meteo."""
-    cfg = REGIONS[region_id]
+async def _scrape_weather(client: httpx.AsyncClient, region_ids: tuple[str, ...]) -> dict[str, dict] | None:
+    """Fetch real weather data from Open-Meteo — one multi-location request per shard (None on failure)."""
+    cfgs = [REGIONS[region_id] for region_id in region_ids]
     url = (
         f"https://api.open-meteo.com/v1/forecast"
-        f"?latitude={cfg['lat']}&longitude={cfg['lng']}"
+        f"?latitude={','.join(str(cfg['lat']) for cfg in cfgs)}"
+        f"&longitude={','.join(str(cfg['lng']) for cfg in cfgs)}"
         f"&hourly=temperature_2m,windspeed_10m,direct_radiation"
-        f"&timezone={cfg['timezone']}&forecast_days=1"
+        f"&timezone={','.join(cfg['timezone'] for cfg in cfgs)}&forecast_days=1"
     )
     try:
-        resp = await client.get(url, timeout=10.0)
+        resp = await _get(client, url)
         resp.raise_for_status()
         data = resp.json()
-        hourly = data.get("hourly", {})
-        temps = hourly.get("temperature_2m", [])
-        winds = hourly.get("windspeed_10m", [])
-        solar = hourly.get("direct_radiation", [])
-        hours = hourly.get("time", [])
-
-        now_hour = datetime.now(timezone.utc).hour
-        current_temp = temps[now_hour] if now_hour < len(temps) else temps[0] if temps else 10.0
-        current_wind = winds[now_hour] if now_hour < len(winds) else winds[0] if winds else 15.0
-        current_solar = solar[now_hour] if now_hour < len(solar) else 0.0
-
-        result = {
-            "current_temp_c": current_temp,
-            "current_wind_kmh": current_wind,
-            "current_solar_wm2": current_solar,
-            "hourly": [
-                {
-                    "hour": hours[i] if i < len(hours) else f"{i:02d}:00",
-                    "temp_c": temps[i] if i < len(temps) else 10.0,
-                    "wind_kmh": winds[i] if i < len(winds) else 15.0,
-                    "solar_wm2": solar[i] if i < len(solar) else 0.0,
-                }
-                for i in range(min(24, len(temps)))
-            ],
-        }
-        log.info(f"Weather {region_id}: {current_temp}°C, {current_wind} km/h wind")
-        return result
+        # Several coordinates → a list of per-location documents, in request order
+        locations = data if isinstance(data, list) else [data]
+        if len(locations) != len(region_ids):
+            raise ValueError(f"expected {len(region_ids)} locations, got {len(locations)}")
     except Exception as e:
-        log.warning(f"Weather scrape failed {region_id}: {e}")
-        _cache["errors"].append(f"Weather {region_id}: {e}")
-        return {"current_temp_c": 10.0, "current_wind_kmh": 15.0, "current_solar_wm2": 0.0, "hourly": []}
+        log.warning(f"Weather scrape failed {', '.join(region_ids)}: {e}")
+        _cache["errors"].append(f"Weather {', '.join(region_ids)}: {e}")
+        return None
+
+    results = {}
+    for region_id, location in zip(region_ids, locations):
+        results[region_id] = _parse_weather(location)
+        log.info(f"Weather {region_id}: {results[region_id]['current_temp_c']}°C, {results[region_id]['current_wind_kmh']} km/h wind")
+    return results
+
+
+def _parse_weather(data: dict) -> dict:
+    hourly = data.get("hourly", {})
+    temps = hourly.get("temperature_2m", [])
+    winds = hourly.get("windspeed_10m", [])
+    solar = hourly.get("direct_radiation", [])
+    hours = hourly.get("time", [])
+
+    now_hour = datetime.now(timezone.utc).hour
+    current_temp = temps[now_hour] if now_hour < len(temps) else temps[0] if temps else 10.0
+    current_wind = winds[now_hour] if now_hour < len(winds) else winds[0] if winds else 15.0
+    current_solar = solar[now_hour] if now_hour < len(solar) else 0.0
+
+    return {
+        "current_temp_c": current_temp,
+        "current_wind_kmh": current_wind,
+        "current_solar_wm2": current_solar,
+        "hourly": [
+            {
+                "hour": hours[i] if i < len(hours) else f"{i:02d}:00",
+                "temp_c": temps[i] if i < len(temps) else 10.0,
+                "wind_kmh": winds[i] if i < len(winds) else 15.0,
+                "solar_wm2": solar[i] if i < len(solar) else 0.0,
+            }
+            for i in range(min(24, len(temps)))
+        ],
+    }
 
 
 # ── Carbon Intensity — Physics-Based Model ───────────────────────────
 #
-# Grid composition (source: IEA, RTE, CBS, BEIS):
+# Grid composition per region comes from the registry (engine/regions.json,
+# approximate shares from IEA / national TSOs), e.g.:
 #   France: ~70% nuclear, ~12% hydro, ~10% wind/solar, ~8% gas
 #   Netherlands: ~52% gas, ~14% wind, ~7% solar, ~5% coal, ~22% other
 #   UK: uses live API (carbonintensity.org.uk)
@@ -357,23 +478,7 @@ async def _scrape_weather(client: httpx.AsyncClient, region_id: str) -> dict:
 # Model: when wind/solar are high (from live weather), renewables displace
 # gas/coal → carbon drops. We compute this in real-time from Open-Meteo data.
 
-GRID_MIX = {
-    "francecentral": {
-        "nuclear": 0.70,   # constant baseload
-        "hydro": 0.12,     # constant
-        "wind_max": 0.10,  # variable — scaled by live wind
-        "solar_max": 0.05, # variable — scaled by live solar
-        "gas_base": 0.08,  # fills the gap
-    },
-    "westeurope": {
-        "nuclear": 0.03,   # Borssele only
-        "hydro": 0.00,
-        "wind_max": 0.22,  # NL offshore + onshore
-        "solar_max": 0.12, # NL solar farms
-        "gas_base": 0.52,  # dominant
-        "coal_base": 0.05,
-    },
-}
+GRID_MIX = REGISTRY.grid_mix
 
 EMISSION_FACTORS = {
     "nuclear": 12, "hydro": 24, "wind": 11, "solar": 45,
@@ -447,155 +552,190 @@ def _estimate_carbon_from_weather(region_id: str, wind_kmh: float, solar_wm2: fl
     }
 
 
-async def _scrape_carbon(client: httpx.AsyncClient, region_id: str) -> dict:
+async def _fetch_carbon_uk(client: httpx.AsyncClient) -> dict | None:
+    """National UK reading from carbonintensity.org.uk (None on failure)."""
+    try:
+        resp = await _get(
+            client,
+            "https://api.carbonintensity.org.uk/intensity",
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        entry = data.get("data", [{}])[0]
+        intensity = entry.get("intensity", {})
+        actual = intensity.get("actual") or intensity.get("forecast", 120)
+        index_val = intensity.get("index", "low")
+        log.info(f"Carbon UK: {actual} gCO2/kWh ({index_val})")
+        return {
+            "gco2_kwh": actual,
+            "index": index_val,
+            "source": "carbonintensity.org.uk (LIVE)",
+            "from": entry.get("from"),
+            "to": entry.get("to"),
+        }
+    except Exception as e:
+        log.warning(f"Carbon UK scrape failed: {e}")
+        _cache["errors"].append(f"Carbon UK: {e}")
+        return None
+
+
+async def _scrape_carbon(client: httpx.AsyncClient, region_id: str) -> tuple[dict, bool]:
     """
     Real carbon intensity:
-    - UK: live API from carbonintensity.org.uk
-    - France/NL: physics model using LIVE weather data from Open-Meteo
+    - UK regions: live API from carbonintensity.org.uk (national — fetched
+      once per window and shared by every UK region, whatever its shard)
+    - Others: physics model using LIVE weather data from Open-Meteo
+    Returns (reading, False if the live API failed and a fallback was served).
     """
-    if region_id == "uksouth":
-        try:
-            resp = await client.get(
-                "https://api.carbonintensity.org.uk/intensity",
-                timeout=10.0,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            entry = data.get("data", [{}])[0]
-            intensity = entry.get("intensity", {})
-            actual = intensity.get("actual") or intensity.get("forecast", 120)
-            index_val = intensity.get("index", "low")
-            log.info(f"Carbon UK: {actual} gCO2/kWh ({index_val})")
-            return {
-                "gco2_kwh": actual,
-                "index": index_val,
-                "source": "carbonintensity.org.uk (LIVE)",
-                "from": entry.get("from"),
-                "to": entry.get("to"),
-            }
-        except Exception as e:
-            log.warning(f"Carbon UK scrape failed: {e}")
-            _cache["errors"].append(f"Carbon UK: {e}")
-
-    # France / Netherlands: real-time estimation from live weather
+    live = True
+    if REGIONS[region_id]["carbon"] == "carbonintensity_uk":
+        reading = await _fetch_shared("carbonintensity_uk", SOURCE_TTL["carbon"], lambda: _fetch_carbon_uk(client))
+        if reading is not None:
+            return reading, True
+        # Serve the last live reading while the upstream is degraded
+        last = _cache["carbon"].get(region_id)
+        if last and "LIVE" in last.get("source", ""):
+            return last, False
+        live = False
+
+    # Grid-model regions: real-time estimation from live weather
     weather = _cache.get("weather", {}).get(region_id, {})
     wind = weather.get("current_wind_kmh", 15.0)
     solar = weather.get("current_solar_wm2", 0.0)
 
     result = _estimate_carbon_from_weather(region_id, wind, solar)
     log.info(f"Carbon {region_id}: {result['gco2_kwh']} gCO2/kWh ({result['index']}) — wind={wind:.0f}km/h, solar={solar:.0f}W/m2")
-    return result
+    return result, live
 
 
 # ── Vision JSON export ───────────────────────────────────────────────
 
-_KWH_PER_GPU_HOUR = {
-    "v100": 0.30, "t4": 0.07, "a10": 0.15, "a100": 0.40, "h100": 0.70,
-    "mi25": 0.10, "m60": 0.12,
-}
+def _vision_region(region_id: str, cfg: dict) -> dict:
+    """Vision JSON section of one region (per-AZ GPU prices, weather, carbon)."""
+    gpus_raw = _cache.get("gpu_prices", {}).get(region_id, [])
+    weather = _cache.get("weather", {}).get(region_id, {})
+    carbon = _cache.get("carbon", {}).get(region_id, {})
+    table = _az_table(region_id)
+
+    # Per-AZ GPU prices
+    az_data = {}
+    for az_cfg in cfg["azs"]:
+        az_id = az_cfg["id"]
+        az_gpus = []
+        az_row = table["azs"][az_id]
+        for i, g in enumerate(gpus_raw):
+            az_gpus.append({
+                "sku": g["sku"],
+                "gpu": g["gpu_name"],
+                "gpu_count": g["gpu_count"],
+                "vcpus": g["vcpus"],
+                "ram_gb": g["ram_gb"],
+                "spot_price_usd_hr": round(az_row["spot"][i], 4),
+                "ondemand_price_usd_hr": round(g["ondemand_price_usd_hr"], 4),
+                "savings_pct": az_row["savings"][i],
+                "availability": az_row["availability"][i],
+            })
+        az_data[az_id] = az_gpus
+
+    # Weather hourly
+    hourly_raw = weather.get("hourly", [])
+    hourly_forecast = [
+        {
+            "hour": h.get("hour", f"{i:02d}:00"),
+            "temp_c": h.get("temp_c", 10.0),
+            "wind_kmh": h.get("wind_kmh", 15.0),
+            "solar_radiation_wm2": h.get("solar_wm2", 0.0),
+        }
+        for i, h in enumerate(hourly_raw)
+    ]
 
+    # Cooling / renewable summary
+    temp = weather.get("current_temp_c", 10.0)
+    wind = weather.get("current_wind_kmh", 15.0)
+    solar = weather.get("current_solar_wm2", 0.0)
+    cooling = "good" if temp < 10 else "moderate" if temp < 18 else "poor"
+    renew = []
+    if wind > 20:
+        renew.append(f"high wind ({wind:.0f} km/h)")
+    elif wind > 10:
+        renew.append(f"moderate wind ({wind:.0f} km/h)")
+    else:
+        renew.append(f"low wind ({wind:.0f} km/h)")
+    if solar > 200:
+        renew.append(f"high solar ({solar:.0f} W/m2)")
+    elif solar > 50:
+        renew.append(f"moderate solar ({solar:.0f} W/m2)")
+    else:
+        renew.append(f"low solar ({solar:.0f} W/m2)")
 
-def _export_vision_json():
+    return {
+        "cloud_provider": cfg["cloud_provider"],
+        "location": cfg["location"],
+        "coordinates": {"lat": cfg["lat"], "lng": cfg["lng"]},
+        "availability_zones": {
+            az_id: {
+                "name": next(a["name"] for a in cfg["azs"] if a["id"] == az_id),
+                "gpu_spot_prices": az_gpus,
+            }
+            for az_id, az_gpus in az_data.items()
+        },
+        "weather": {
+            "source": "open-meteo.com (LIVE)",
+            "current_temp_c": temp,
+            "current_wind_kmh": wind,
+            "current_solar_wm2": solar,
+            "hourly_forecast": hourly_forecast,
+            "cooling_advantage": f"{cooling} - {temp:.1f}°C",
+            "renewable_potential": ", ".join(renew),
+        },
+        "carbon_intensity": {
+            "source": carbon.get("source", "unknown"),
+            "current_gco2_kwh": carbon.get("gco2_kwh", 100),
+            "index": carbon.get("index", "moderate"),
+        },
+    }
+
+
+_vision_writer = VisionWriter("nerve_scraped_data.json")
+_vision_deltas = DeltaStream()  # RFC 6902 patches between exports, see get_vision_changes
+
+# Per-region vision sections, reused while the region's data is unchanged
+# (AZ variations depend on the UTC hour, so the hour is part of the key).
+_vision_sections: dict[str, tuple[int, dict]] = {}
+
+
+def _build_vision(seq: int) -> dict | None:
     """
-    Export a complete 'vision' JSON file after each scrape cycle.
+    Complete 'vision' document numbered `seq`.
     Contains: metadata, job_context, all regions with per-AZ GPU prices,
     weather hourly, carbon intensity, scoring weights, reference prices.
+    Regions whose data did not change reuse their previous section; None
+    when nothing changed at all.
     """
-    now = datetime.now(timezone.utc).isoformat()
+    now = datetime.now(timezone.utc)
+    hour = now.hour
 
     regions_data = {}
+    rebuilt = 0
     for region_id, cfg in REGIONS.items():
-        gpus_raw = _cache.get("gpu_prices", {}).get(region_id, [])
-        weather = _cache.get("weather", {}).get(region_id, {})
-        carbon = _cache.get("carbon", {}).get(region_id, {})
-
-        # Per-AZ GPU prices
-        az_data = {}
-        for az_cfg in cfg["azs"]:
-            az_id = az_cfg["id"]
-            az_gpus = []
-            for g in gpus_raw:
-                az_spot = _az_price_variation(g["spot_price_usd_hr"], az_id, g["sku"])
-                az_ondemand = g["ondemand_price_usd_hr"]
-                az_savings = round((1 - az_spot / az_ondemand) * 100, 1) if az_ondemand > 0 else g["savings_pct"]
-                base_avail = _estimate_availability(az_spot, g.get("tier", "mid"), spot=az_spot, ondemand=az_ondemand)
-                az_avail = _az_availability_shift(base_avail, az_id)
-                az_gpus.append({
-                    "sku": g["sku"],
-                    "gpu": g["gpu_name"],
-                    "gpu_count": g["gpu_count"],
-                    "vcpus": g["vcpus"],
-                    "ram_gb": g["ram_gb"],
-                    "spot_price_usd_hr": round(az_spot, 4),
-                    "ondemand_price_usd_hr": round(az_ondemand, 4),
-                    "savings_pct": az_savings,
-                    "availability": az_avail,
-                })
-            az_data[az_id] = az_gpus
-
-        # Weather hourly
-        hourly_raw = weather.get("hourly", [])
-        hourly_forecast = [
-            {
-                "hour": h.get("hour", f"{i:02d}:00"),
-                "temp_c": h.get("temp_c", 10.0),
-                "wind_kmh": h.get("wind_kmh", 15.0),
-                "solar_radiation_wm2": h.get("solar_wm2", 0.0),
-            }
-            for i, h in enumerate(hourly_raw)
-        ]
-
-        # Cooling / renewable summary
-        temp = weather.get("current_temp_c", 10.0)
-        wind = weather.get("current_wind_kmh", 15.0)
-        solar = weather.get("current_solar_wm2", 0.0)
-        cooling = "good" if temp < 10 else "moderate" if temp < 18 else "poor"
-        renew = []
-        if wind > 20:
-            renew.append(f"high wind ({wind:.0f} km/h)")
-        elif wind > 10:
-            renew.append(f"moderate wind ({wind:.0f} km/h)")
-        else:
-            renew.append(f"low wind ({wind:.0f} km/h)")
-        if solar > 200:
-            renew.append(f"high solar ({solar:.0f} W/m2)")
-        elif solar > 50:
-            renew.append(f"moderate solar ({solar:.0f} W/m2)")
-        else:
-            renew.append(f"low solar ({solar:.0f} W/m2)")
-
-        regions_data[region_id] = {
-            "cloud_provider": cfg["cloud_provider"],
-            "location": cfg["location"],
-            "coordinates": {"lat": cfg["lat"], "lng": cfg["lng"]},
-            "availability_zones": {
-                az_id: {
-                    "name": next(a["name"] for a in cfg["azs"] if a["id"] == az_id),
-                    "gpu_spot_prices": az_gpus,
-                }
-                for az_id, az_gpus in az_data.items()
-            },
-            "weather": {
-                "source": "open-meteo.com (LIVE)",
-                "current_temp_c": temp,
-                "current_wind_kmh": wind,
-                "current_solar_wm2": solar,
-                "hourly_forecast": hourly_forecast,
-                "cooling_advantage": f"{cooling} - {temp:.1f}°C",
-                "renewable_potential": ", ".join(renew),
-            },
-            "carbon_intensity": {
-                "source": carbon.get("source", "unknown"),
-                "current_gco2_kwh": carbon.get("gco2_kwh", 100),
-                "index": carbon.get("index", "moderate"),
-            },
-        }
+        cached = _vision_sections.get(region_id)
+        reuse = cached is not None and cached[0] == hour and region_id not in _changed_regions
+        _count_skip("export", reuse)
+        if not reuse:
+            _vision_sections[region_id] = (hour, _vision_region(region_id, cfg))
+            rebuilt += 1
+        regions_data[region_id] = _vision_sections[region_id][1]
+    _changed_regions.clear()
+
+    if not rebuilt:
+        return None
 
     vision = {
         "metadata": {
-            "scrape_timestamp": now,
+            "scrape_timestamp": now.isoformat(),
             "version": "2.0",
             "scrape_count": _cache.get("scrape_count", 0),
+            "seq": seq,
             "sources": [
                 "Azure Retail Prices API (LIVE)",
                 "Open-Meteo API (LIVE)",
@@ -624,56 +764,458 @@ def _export_vision_json():
         "reference_prices": {
             "currency_eur_usd": 0.92,
             "avg_datacenter_pue": 1.2,
-            "kwh_per_gpu_hour": _KWH_PER_GPU_HOUR,
+            "kwh_per_gpu_hour": GPU_CATALOG.kwh_per_gpu_hr,
         },
     }
 
-    # Write to both data/ and vision/ directories
-    for output_dir in [_DATA_DIR, _VISION_DIR]:
-        output_dir.mkdir(parents=True, exist_ok=True)
-        out_path = output_dir / "nerve_scraped_data.json"
+    return vision
+
+
+def _export_vision_json():
+    """
+    Export the vision JSON after each scrape cycle; skipped when nothing
+    changed. Serialisation and disk I/O happen on the VisionWriter thread,
+    never on the event loop.
+    """
+    vision = _build_vision(_vision_deltas.seq + 1)
+    if vision is None:
+        log.debug("Vision JSON unchanged — export skipped")
+        return
+    _vision_deltas.publish(vision)
+    # Serialised and written to data/ and vision/ by the background writer
+    _vision_writer.submit(vision, [_DATA_DIR, _VISION_DIR])
+
+
+# ── Published snapshot ───────────────────────────────────────────────
+#
+# After each cycle the scraper publishes one immutable RegionSnapshot holding
+# prebuilt RegionInfo trees. Publishing rebinds a single global, so readers
+# get it in O(1) without locks and concurrent requests share the same objects
+# instead of rebuilding the pydantic tree per call.
+
+class RegionSnapshot(NamedTuple):
+    version: int
+    hour: int                          # UTC hour the AZ variations were built for
+    built_at: str
+    regions: Mapping[str, RegionInfo]  # read-only view
+
+
+_snapshot: RegionSnapshot | None = None
+_region_built: dict[str, int] = {}  # region_id -> snapshot version its RegionInfo was built for
+
+
+def _publish_snapshot(changed: set[str] = frozenset()) -> RegionSnapshot:
+    """
+    Build and publish the next snapshot. Regions not in `changed` reuse their
+    RegionInfo from the previous snapshot when the UTC hour has not rolled over.
+    """
+    global _snapshot
+    t0 = time.perf_counter()
+    now = datetime.now(timezone.utc)
+    previous = _snapshot
+    version = previous.version + 1 if previous is not None else 1
+    same_hour = previous is not None and previous.hour == now.hour
+    regions = {}
+    for region_id in REGIONS:
+        if same_hour and region_id not in changed:
+            regions[region_id] = previous.regions[region_id]
+        else:
+            regions[region_id] = _build_region_info(region_id)
+            _region_built[region_id] = version
+    _snapshot = RegionSnapshot(
+        version=version,
+        hour=now.hour,
+        built_at=now.isoformat(),
+        regions=MappingProxyType(regions),
+    )
+    metrics.SNAPSHOT_BUILD.observe(time.perf_counter() - t0)
+    metrics.SNAPSHOT_VERSION.set(_snapshot.version)
+    return _snapshot
+
+
+# ── Multi-worker sharing ─────────────────────────────────────────────
+#
+# With several API workers only the leader (holder of the flock next to the
+# snapshot file) scrapes; it writes every snapshot to a memory-mapped file
+# that the followers attach to read-only (see engine.shared_snapshot).
+# NERVE_SHARED_SNAPSHOT="" disables sharing (every process scrapes itself).
+
+SHARED_SNAPSHOT_PATH = os.getenv("NERVE_SHARED_SNAPSHOT", str(_DATA_DIR / "nerve_snapshot.bin"))
+SCRAPER_ROLE = os.getenv("NERVE_SCRAPER_ROLE", "auto")  # auto | leader | follower
+FOLLOW_POLL_INTERVAL = 1.0  # seconds between stat() checks in followers
+
+_shared_path = Path(SHARED_SNAPSHOT_PATH) if SHARED_SNAPSHOT_PATH else None
+_leader_lock = LeaderLock(_shared_path.with_suffix(".lock")) if _shared_path else None
+_snapshot_reader = SnapshotReader(_shared_path) if _shared_path else None
+_role = "leader"
+
+# _cache entries mirrored to followers (price_history travels as raw ring columns)
+_SHARED_CACHE_KEYS = ("last_scrape", "gpu_prices", "weather", "carbon", "scrape_count", "errors")
+
+
+def _claim_leadership() -> bool:
+    if _leader_lock is None or SCRAPER_ROLE == "leader":
+        return True
+    if SCRAPER_ROLE == "follower":
+        return False
+    return _leader_lock.try_acquire()
+
+
+# Leader: JSON dumps of the RegionInfo trees, reused while a region is not rebuilt
+_region_dumps: dict[str, tuple[int, dict]] = {}
+_shared_vision_seq = 0  # vision seq covered by the last shared snapshot
+
+
+async def _share_snapshot(snapshot: RegionSnapshot, price_event: dict | None = None):
+    """
+    Leader: write `snapshot` plus the cache and history for the followers (off
+    the event loop), with the cycle's rendered outputs — the az_price_update
+    batch and the vision document with the patches since the previous share —
+    so every worker serves the same events and the same bodies per seq.
+    """
+    global _shared_vision_seq
+    dumps = {}
+    for region_id, info in snapshot.regions.items():
+        built = _region_built.get(region_id, snapshot.version)
+        cached = _region_dumps.get(region_id)
+        if cached is None or cached[0] != built:
+            cached = _region_dumps[region_id] = (built, info.model_dump(mode="json"))
+        dumps[region_id] = cached[1]
+    document = {
+        "version": snapshot.version,
+        "hour": snapshot.hour,
+        "built_at": snapshot.built_at,
+        "regions": dumps,
+        "region_versions": {region_id: _region_built.get(region_id, snapshot.version) for region_id in dumps},
+        "cache": {key: _cache[key] for key in _SHARED_CACHE_KEYS},
+        "price_versions": _price_versions,
+        "price_event": price_event,
+        "vision": {
+            "seq": _vision_deltas.seq,
+            "document": _vision_deltas.document,
+            "patches": _vision_deltas.patches_since(_shared_vision_seq),
+        },
+    }
+    rings = {region_id: (ring.capacity, *ring.buffers()) for region_id, ring in _cache["price_history"].items()}
+    await asyncio.to_thread(write_snapshot, _shared_path, snapshot.version, document, rings)
+    _shared_vision_seq = _vision_deltas.seq
+
+
+_last_share = 0.0  # monotonic time of the last shared-snapshot write
+
+
+async def _share_current(snapshot: RegionSnapshot, price_event: dict | None = None):
+    global _last_share
+    try:
+        await _share_snapshot(snapshot, price_event)
+        _last_share = time.monotonic()
+    except Exception as e:
+        log.warning(f"Shared snapshot write failed: {e}")
+
+
+def _apply_shared(update: dict):
+    """
+    Follower: adopt the leader's snapshot — cache, zero-copy history rings and
+    RegionInfo objects. Only regions the leader rebuilt since the previous
+    snapshot are validated again; the others keep their objects.
+    """
+    global _snapshot
+    document = update["document"]
+    _cache.update(document["cache"])
+    _cache["price_history"] = {
+        region_id: PriceRing.from_buffers(capacity, head, size, columns)
+        for region_id, (capacity, head, size, columns) in update["history"].items()
+    }
+    _price_versions.update(document.get("price_versions", {}))
+    previous = _snapshot
+    built_versions = document.get("region_versions", {})
+    regions = {}
+    for region_id, info in document["regions"].items():
+        built = built_versions.get(region_id)
+        if previous is not None and built is not None and _region_built.get(region_id) == built:
+            regions[region_id] = previous.regions[region_id]
+        else:
+            regions[region_id] = RegionInfo.model_validate(info)
+            _region_built[region_id] = built if built is not None else document["version"]
+    _snapshot = RegionSnapshot(
+        version=document["version"],
+        hour=document["hour"],
+        built_at=document["built_at"],
+        regions=MappingProxyType(regions),
+    )
+
+
+def _replay_shared_events(document: dict):
+    """
+    Follower: re-emit what the leader rendered for its cycle — the
+    az_price_update batch on this worker's event bus and the vision
+    document/patches under the leader's seq — so WebSocket clients and delta
+    pollers see the same stream on every worker.
+    """
+    if document.get("price_event"):
+        publish(dict(document["price_event"]))
+    vision = document.get("vision")
+    if vision and vision["seq"] != _vision_deltas.seq:
+        _vision_deltas.mirror(vision["seq"], vision["document"], vision["patches"])
+
+
+async def _follow_loop():
+    """Follower: pick up new snapshots; take over scraping if the leader's lock is released."""
+    global _role, _scraper_task
+    last_claim = time.monotonic()
+    while True:
         try:
-            out_path.write_text(json.dumps(vision, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
-            log.info(f"Vision JSON exported → {out_path}")
+            update = _snapshot_reader.poll()
+            if update is not None:
+                _apply_shared(update)
+                _replay_shared_events(update["document"])
+                log.debug(f"Attached shared snapshot v{update['version']}")
         except Exception as e:
-            log.warning(f"Failed to export vision JSON to {out_path}: {e}")
+            log.warning(f"Shared snapshot read failed: {e}")
+
+        if SCRAPER_ROLE == "auto" and time.monotonic() - last_claim >= SCRAPE_INTERVAL:
+            last_claim = time.monotonic()
+            if _leader_lock.try_acquire():
+                log.info("Scraper leader gone — this worker takes over scraping")
+                _role = "leader"
+                # Rings attached from the mmap are read-only
+                _cache["price_history"] = {r: ring.copy() for r, ring in _cache["price_history"].items()}
+                _scraper_task = asyncio.create_task(_scrape_loop())
+                return
+        await asyncio.sleep(FOLLOW_POLL_INTERVAL)
 
 
 # ── Main scrape loop ─────────────────────────────────────────────────
 
 _scraper_task: asyncio.Task | None = None
-SCRAPE_INTERVAL = 60  # seconds
+SCRAPE_INTERVAL = 60  # seconds — Spot price cadence
+SCRAPE_DEADLINE = 45.0  # seconds — regions still running after this are dropped for the cycle
 
+# ── Per-source refresh schedule ──────────────────────────────────────
+#
+# Each source refreshes on its own wall-clock grid (k * ttl + jitter), so
+# timing never drifts with cycle duration and hourly/half-hourly sources
+# are fetched just after the upstream publishes:
+#   - azure_spot:     every minute (the only fast-moving source)
+#   - azure_ondemand: on-demand list prices move a few times a year
+#   - weather:        Open-Meteo hourly forecast
+#   - carbon:         carbonintensity.org.uk publishes half-hourly
+
+SOURCES = ("azure_spot", "azure_ondemand", "weather", "carbon")
+
+SOURCE_TTL = {
+    "azure_spot": SCRAPE_INTERVAL,
+    "azure_ondemand": 6 * 3600,
+    "weather": 3600,
+    "carbon": 1800,
+}
 
-async def _scrape_all():
-    """Single scrape cycle — fetch all data sources."""
-    _cache["errors"] = []
-    async with httpx.AsyncClient() as client:
-        for region_id in REGIONS:
-            # Scrape in parallel per region
-            gpu_task = _scrape_azure_gpu_prices(client, region_id)
-            weather_task = _scrape_weather(client, region_id)
-            carbon_task = _scrape_carbon(client, region_id)
-
-            gpus, weather, carbon = await asyncio.gather(
-                gpu_task, weather_task, carbon_task
-            )
-
-            old_prices = _cache["gpu_prices"].get(region_id, [])
+SOURCE_JITTER = {  # max seconds added after each grid point
+    "azure_spot": 5,
+    "azure_ondemand": 120,
+    "weather": 60,
+    "carbon": 60,
+}
+
+# A failed fetch (error, open breaker, cycle deadline) is not due again after
+# its full TTL but on a capped exponential backoff starting at the next cycle.
+RETRY_BASE = SCRAPE_INTERVAL  # seconds before the first retry
+RETRY_MAX = 15 * 60           # backoff ceiling (never beyond the source's TTL)
+
+# (source, shard) -> next_due / fetches / failures / last_fetch. Shards are offset
+# across the source's TTL so their upstream calls do not all land on the same second.
+_schedule: dict[tuple[str, int], dict] = {
+    (src, shard): {"next_due": 0.0, "fetches": 0, "failures": 0, "last_fetch": None}
+    for src in SOURCES
+    for shard in range(len(SHARDS))
+}
+
+
+def _next_due(source: str, shard: int, now: float) -> float:
+    """Next point of the shard's grid strictly after `now` for this source, plus jitter."""
+    ttl = SOURCE_TTL[source]
+    offset = ttl * shard / len(SHARDS)
+    return (math.floor((now - offset) / ttl) + 1) * ttl + offset + random.uniform(0, SOURCE_JITTER[source])
+
+
+def _stale_sources(now: float) -> dict[int, set[str]]:
+    """shard -> sources due for a refresh."""
+    stale: dict[int, set[str]] = {}
+    for (src, shard), st in _schedule.items():
+        if st["next_due"] <= now:
+            stale.setdefault(shard, set()).add(src)
+    return stale
+
+
+def _mark_fetched(shards: dict[int, set[str]], now: float):
+    """Sources fetched successfully: next due on their TTL grid."""
+    for shard, sources in shards.items():
+        for src in sources:
+            st = _schedule[(src, shard)]
+            st["fetches"] += 1
+            st["failures"] = 0
+            st["last_fetch"] = datetime.fromtimestamp(now, timezone.utc).isoformat()
+            st["next_due"] = _next_due(src, shard, now)
+
+
+def _mark_failed(shards: dict[int, set[str]], now: float):
+    """Sources whose fetch failed or never completed: retried on a capped exponential backoff."""
+    for shard, sources in shards.items():
+        for src in sources:
+            st = _schedule[(src, shard)]
+            st["failures"] += 1
+            delay = min(RETRY_BASE * 2 ** (st["failures"] - 1), RETRY_MAX, SOURCE_TTL[src])
+            st["next_due"] = now + delay + random.uniform(0, SOURCE_JITTER[src])
+
+
+async def _scrape_shard(client: httpx.AsyncClient, shard: int, sources: set[str]) -> set[str]:
+    """
+    Refresh the stale sources of one shard (batched upstream calls), then commit
+    per region. Returns the sources that were fetched successfully.
+    """
+    region_ids = SHARDS[shard]
+    fetched = set(sources)
+
+    async def refresh_prices():
+        changed_regions, prices_fetched = await _scrape_azure_gpu_prices(client, region_ids, sources)
+        fetched.difference_update({"azure_spot", "azure_ondemand"} - prices_fetched)
+        # History points are observations: only when this cycle's Spot query went through
+        observed = "azure_spot" in prices_fetched
+        for region_id in region_ids:
+            unchanged = region_id not in changed_regions and region_id in _cache["gpu_prices"]
+            _count_skip("prices", unchanged)
+            if unchanged:
+                if observed:
+                    _extend_price_history(region_id)
+                continue
+
+            gpus = _join_spot_ondemand(region_id)
             _cache["gpu_prices"][region_id] = gpus
+            _price_versions[region_id] = _price_versions.get(region_id, 0) + 1
+            _changed_regions.add(region_id)
+
+            # Record price history for real 24h curve
+            if observed:
+                _record_price_history(region_id, gpus)
+
+    async def refresh_environment(region_id: str, weather: dict | None):
+        changed = False
+        if weather is not None and _payload_changed((region_id, "weather"), weather):
             _cache["weather"][region_id] = weather
-            _cache["carbon"][region_id] = carbon
+            changed = True
+        # Grid-model carbon is derived from weather; UK carbon is its own API
+        if "carbon" in sources or (changed and REGIONS[region_id]["carbon"] == "grid_model"):
+            carbon, live = await _scrape_carbon(client, region_id)
+            if not live:
+                fetched.discard("carbon")
+            if _payload_changed((region_id, "carbon"), carbon):
+                _cache["carbon"][region_id] = carbon
+                changed = True
+        _count_skip("environment", not changed)
+        if changed:
+            _changed_regions.add(region_id)
+
+    async def refresh_environments():
+        weathers = await _scrape_weather(client, region_ids) if "weather" in sources else {}
+        if weathers is None:
+            fetched.discard("weather")
+            # Keep the last good forecast; defaults only for regions that never had one
+            weathers = {
+                region_id: {"current_temp_c": 10.0, "current_wind_kmh": 15.0, "current_solar_wm2": 0.0, "hourly": []}
+                for region_id in region_ids
+                if not _cache["weather"].get(region_id, {}).get("hourly")
+            }
+        await asyncio.gather(*(
+            refresh_environment(region_id, weathers.get(region_id)) for region_id in region_ids
+        ))
 
-            # Emit price change events
-            _detect_price_changes(region_id, old_prices, gpus)
+    jobs = []
+    if sources & {"azure_spot", "azure_ondemand"}:
+        jobs.append(refresh_prices())
+    if sources & {"weather", "carbon"}:
+        jobs.append(refresh_environments())
+    t0 = time.perf_counter()
+    await asyncio.gather(*jobs)
+    metrics.SCRAPE_SHARD.observe(time.perf_counter() - t0, str(shard))
+    return fetched
 
-            # Record price history for real 24h curve
-            _record_price_history(region_id, gpus)
 
+async def _scrape_all(sources: set[str] | None = None, shards: dict[int, set[str]] | None = None):
+    """
+    Single scrape cycle — all shards fan out at once. `shards` maps shard index
+    to its stale sources (scheduler); otherwise every shard refreshes `sources`
+    (default: all).
+
+    With per-shard offsets the scheduler fires several times per SCRAPE_INTERVAL,
+    each firing refreshing only the due (source, shard) pairs: scrape_count and
+    nerve_scrape_cycle_seconds count these firings, not full sweeps. A firing
+    whose payloads all came back unchanged (same UTC hour) stops after the
+    fetch — no snapshot, price diff or export, and the shared snapshot is only
+    rewritten (for the followers' history rings) once per SCRAPE_INTERVAL.
+    """
+    cycle_start = time.perf_counter()
+    if shards is None:
+        sources = set(SOURCES) if sources is None else sources
+        shards = {shard: sources for shard in range(len(SHARDS))}
+    _cache["errors"] = []
+    client = get_client()  # pooled, kept alive across cycles
+    tasks = {
+        asyncio.create_task(_scrape_shard(client, shard, shard_sources)): shard
+        for shard, shard_sources in shards.items()
+    }
+    # Each shard commits to _cache as soon as it finishes
+    done, pending = await asyncio.wait(tasks, timeout=SCRAPE_DEADLINE) if tasks else (set(), set())
+
+    for task in pending:
+        task.cancel()
+        label = ", ".join(SHARDS[tasks[task]])
+        log.warning(f"Scrape shard {tasks[task]} ({label}) exceeded {SCRAPE_DEADLINE}s deadline — keeping previous data")
+        _cache["errors"].append(f"Deadline shard {tasks[task]}: exceeded {SCRAPE_DEADLINE}s")
+        metrics.SCRAPE_ERRORS.inc()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    # Only sources a shard actually fetched move to their next TTL slot; the
+    # rest (errors, open breakers, deadline) are retried on backoff
+    fetched: dict[int, set[str]] = {}
+    for task in done:
+        shard = tasks[task]
+        if task.exception() is not None:
+            log.warning(f"Scrape shard {shard} failed: {task.exception()}")
+            _cache["errors"].append(f"Shard {shard}: {task.exception()}")
+            metrics.SCRAPE_ERRORS.inc()
+        else:
+            fetched[shard] = task.result()
+    now = time.time()
+    _mark_fetched(fetched, now)
+    _mark_failed({shard: sources - fetched.get(shard, set()) for shard, sources in shards.items()}, now)
+    await _flush_price_history()
     _cache["last_scrape"] = datetime.now(timezone.utc).isoformat()
     _cache["scrape_count"] += 1
     total_gpus = sum(len(v) for v in _cache["gpu_prices"].values())
-    log.info(f"Scrape #{_cache['scrape_count']} complete — {total_gpus} GPUs across {len(REGIONS)} regions")
+    refreshed = sorted(set().union(*shards.values()))
+    log.info(
+        f"Scrape #{_cache['scrape_count']} complete ({', '.join(refreshed)}; {len(shards)}/{len(SHARDS)} shards) — "
+        f"{total_gpus} GPUs across {len(REGIONS)} regions"
+    )
+
+    changed = set(_changed_regions)
+    unchanged = not changed and _snapshot is not None and _snapshot.hour == datetime.now(timezone.utc).hour
+    _count_skip("publish", unchanged)
+    if unchanged:
+        log.debug("No payload changed — snapshot and export skipped")
+        # History rings still advanced: refresh the followers' copy at most once per interval
+        if _shared_path is not None and time.monotonic() - _last_share >= SCRAPE_INTERVAL:
+            await _share_current(_snapshot)
+        metrics.SCRAPE_CYCLE.observe(time.perf_counter() - cycle_start)
+        return
+
+    # Publish the new read snapshot before the export clears _changed_regions
+    snapshot = _publish_snapshot(changed)
+    log.debug(f"Snapshot v{snapshot.version} published")
+
+    # One batched price-change event for every AZ×SKU cell that moved
+    price_event = _detect_price_changes()
 
     # Export vision JSON after each scrape
     try:
@@ -681,70 +1223,234 @@ async def _scrape_all():
     except Exception as e:
         log.warning(f"Vision JSON export failed: {e}")
 
+    # Shared last, so followers replay this cycle's events under the same vision seq
+    if _shared_path is not None:
+        await _share_current(snapshot, price_event)
+
+    metrics.SCRAPE_CYCLE.observe(time.perf_counter() - cycle_start)
+
 
 MAX_HISTORY_POINTS = 1440  # 24h at 1 scrape/min
 
+# ── Durable history ──────────────────────────────────────────────────
+#
+# The rings hold the last 24h in memory; every point is also written to an
+# embedded SQLite store (engine.tsdb) with 1m/1h/1d rollups, so history
+# survives restarts and months-long ranges stay queryable.
+# NERVE_TSDB_PATH="" keeps history in memory only.
+
+TSDB_PATH = os.getenv("NERVE_TSDB_PATH", str(_DATA_DIR / "nerve_history.sqlite3"))
+
+_price_store: PriceStore | None = None
+# Points queued during a cycle, written in one transaction by _flush_price_history
+_pending_history: dict[str, list[tuple]] = {"region": [], "sku": []}
+
+
+def _open_price_store() -> PriceStore | None:
+    global _price_store
+    if _price_store is None and TSDB_PATH:
+        try:
+            _price_store = PriceStore(TSDB_PATH)
+        except Exception as e:
+            log.warning(f"Price history store unavailable ({TSDB_PATH}): {e} — history kept in memory only")
+    return _price_store
+
+
+async def _warm_price_history():
+    """Leader startup: refill the 24h rings from the store's 1-minute points (read off the event loop)."""
+    store = _open_price_store()
+    if store is None:
+        return
+    now = time.time()
+    for region_id in REGIONS:
+        if region_id in _cache["price_history"]:
+            continue
+        rows = await asyncio.to_thread(store.region_history, region_id, now - MAX_HISTORY_POINTS * 60, now, "1m")
+        for row in rows:
+            _price_ring(region_id).append(*row)
+    log.info(f"Price history warmed from {store.path} ({len(_cache['price_history'])} regions)")
+
+
+async def _flush_price_history():
+    """Write the cycle's queued points (off the event loop)."""
+    region_rows, sku_rows = _pending_history["region"], _pending_history["sku"]
+    _pending_history["region"], _pending_history["sku"] = [], []
+    store = _open_price_store()
+    if store is None or not (region_rows or sku_rows):
+        return
+    t0 = time.perf_counter()
+    try:
+        await asyncio.to_thread(store.write_cycle, region_rows, sku_rows)
+        metrics.HISTORY_WRITE.observe(time.perf_counter() - t0)
+    except Exception as e:
+        log.warning(f"Price history write failed ({len(region_rows)} region points lost): {e}")
+
+
+def _price_ring(region_id: str) -> PriceRing:
+    ring = _cache["price_history"].get(region_id)
+    if ring is None:
+        ring = _cache["price_history"][region_id] = PriceRing(MAX_HISTORY_POINTS)
+    return ring
+
+
+def _queue_sku_points(region_id: str, gpus: list[dict], ts: float):
+    _pending_history["sku"].extend(
+        (region_id, g["sku"], ts, g["spot_price_usd_hr"], g["ondemand_price_usd_hr"]) for g in gpus
+    )
+
 
 def _record_price_history(region_id: str, gpus: list[dict]):
-    """Store real scraped price snapshot for building 24h curves."""
+    """Store real scraped price snapshot for building 24h curves (O(1) ring append)."""
     if not gpus:
         return
     prices = [g["spot_price_usd_hr"] for g in gpus]
-    compute_gpus = [g for g in gpus if g["sku"].startswith("Standard_NC") or g["sku"].startswith("Standard_ND")]
-    compute_prices = [g["spot_price_usd_hr"] for g in compute_gpus] if compute_gpus else prices
-
-    entry = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "hour": datetime.now(timezone.utc).hour,
-        "avg_spot": round(sum(prices) / len(prices), 6),
-        "min_spot": round(min(prices), 6),
-        "max_spot": round(max(prices), 6),
-        "avg_compute_spot": round(sum(compute_prices) / len(compute_prices), 6),
-        "gpu_count": len(gpus),
-    }
+    compute_prices = [
+        g["spot_price_usd_hr"] for g in gpus
+        if g["sku"].startswith("Standard_NC") or g["sku"].startswith("Standard_ND")
+    ] or prices
+
+    # The ring keeps the last 24h; older points are overwritten in place
+    point = (
+        time.time(),
+        round(sum(prices) / len(prices), 6),
+        round(min(prices), 6),
+        round(max(prices), 6),
+        round(sum(compute_prices) / len(compute_prices), 6),
+        len(gpus),
+    )
+    _price_ring(region_id).append(*point)
+    _pending_history["region"].append((region_id, *point))
+    _queue_sku_points(region_id, gpus, point[0])
+
+
+def _extend_price_history(region_id: str):
+    """Prices unchanged since the last point — repeat it with the current timestamp."""
+    ring = _cache["price_history"].get(region_id)
+    if ring is not None:
+        ring.repeat_last(time.time())
+        point = ring.last()
+        _pending_history["region"].append((region_id, *point))
+        _queue_sku_points(region_id, _cache["gpu_prices"].get(region_id, []), point[0])
+
+
+# AZ×SKU spot matrices from the previous diff, per region:
+# region_id -> (price version, hour, skus, base spot prices, matrix[n_azs, n_skus])
+_price_matrices: dict[str, tuple[int, int, list[str], list[float], np.ndarray]] = {}
 
-    if region_id not in _cache["price_history"]:
-        _cache["price_history"][region_id] = []
+PRICE_CHANGE_THRESHOLD = 0.001  # relative change (0.1%) below which a cell is not reported
 
-    _cache["price_history"][region_id].append(entry)
 
-    # Keep only last 24h of data
-    if len(_cache["price_history"][region_id]) > MAX_HISTORY_POINTS:
-        _cache["price_history"][region_id] = _cache["price_history"][region_id][-MAX_HISTORY_POINTS:]
+def _price_matrix(region_id: str) -> tuple[int, int, list[str], list[float], np.ndarray]:
+    """Current per-AZ spot prices as one matrix (rows = REGIONS azs, cols = SKUs)."""
+    table = _az_table(region_id)
+    hour, version = table["key"]
+    gpus = _cache.get("gpu_prices", {}).get(region_id, [])
+    skus = [g["sku"] for g in gpus]
+    bases = [g["spot_price_usd_hr"] for g in gpus]
+    rows = [np.frombuffer(table["azs"][az["id"]]["spot"], dtype=np.float64) for az in REGIONS[region_id]["azs"]]
+    matrix = np.vstack(rows) if skus else np.empty((len(rows), 0))
+    return version, hour, skus, bases, matrix
 
 
-def _detect_price_changes(region_id: str, old: list[dict], new: list[dict]):
-    """Detect price changes and emit WS events."""
-    old_map = {g["sku"]: g["spot_price_usd_hr"] for g in old}
-    for gpu in new:
-        old_price = old_map.get(gpu["sku"])
-        if old_price is not None and old_price != gpu["spot_price_usd_hr"]:
-            _emit({
-                "type": "az_price_update",
+def _variation_matrix(region_id: str, skus: list[str], bases: list[float], hour: int) -> np.ndarray:
+    """AZ×SKU spot matrix of earlier base prices, re-derived for `hour`'s AZ variations."""
+    rows = [
+        [_az_price_variation(base, az["id"], sku, hour) for sku, base in zip(skus, bases)]
+        for az in REGIONS[region_id]["azs"]
+    ]
+    return np.array(rows, dtype=np.float64).reshape(len(rows), len(skus))
+
+
+def _detect_price_changes(threshold: float = PRICE_CHANGE_THRESHOLD) -> dict | None:
+    """
+    Diff the AZ×SKU spot matrix of every region whose base prices changed
+    (new price version) against the previous one and publish one
+    "az_price_update" event listing all cells whose price moved by more than
+    `threshold` (relative). Both sides use the current hour's AZ variations,
+    so an hour rollover alone reports nothing. SKUs new to a region are not
+    reported.
+    """
+    changes = []
+    for region_id, cfg in REGIONS.items():
+        version, hour, skus, bases, new = _price_matrix(region_id)
+        previous = _price_matrices.get(region_id)
+        _price_matrices[region_id] = (version, hour, skus, bases, new)
+        if previous is None or previous[0] == version:
+            continue  # first cycle, or upstream prices unchanged
+
+        _, old_hour, old_skus, old_bases, old = previous
+        if old_hour != hour:
+            old = _variation_matrix(region_id, old_skus, old_bases, hour)
+        if old_skus != skus:
+            # Align on the SKUs present in both cycles
+            old_index = {sku: i for i, sku in enumerate(old_skus)}
+            cols = [(old_index[sku], j) for j, sku in enumerate(skus) if sku in old_index]
+            if not cols:
+                continue
+            old_cols, new_cols = map(list, zip(*cols))
+            old, new = old[:, old_cols], new[:, new_cols]
+        else:
+            new_cols = list(range(len(skus)))
+
+        moved = np.abs(new - old) > threshold * np.abs(old)
+        gpus = _cache["gpu_prices"][region_id]
+        for az_i, col in zip(*np.nonzero(moved)):
+            old_price, new_price = float(old[az_i, col]), float(new[az_i, col])
+            gpu = gpus[new_cols[col]]
+            changes.append({
                 "region": region_id,
-                "az": REGIONS[region_id]["azs"][0]["id"],
+                "az": cfg["azs"][az_i]["id"],
                 "instance": gpu["sku"],
                 "gpu_name": gpu["gpu_name"],
-                "old_price": old_price,
-                "new_price": gpu["spot_price_usd_hr"],
-                "currency": "USD",
+                "old_price": round(old_price, 6),
+                "new_price": round(new_price, 6),
+                "change_pct": round((new_price - old_price) / old_price * 100, 2) if old_price else None,
             })
 
+    if not changes:
+        return None
+    event = {
+        "type": "az_price_update",
+        "count": len(changes),
+        "threshold_pct": threshold * 100,
+        "currency": "USD",
+        "changes": changes,
+    }
+    publish(event)
+    return event
+
 
 async def _scrape_loop():
-    """Background loop that scrapes every SCRAPE_INTERVAL seconds."""
+    """Background loop — wakes at the next due source and refetches only what is stale."""
     while True:
-        try:
-            await _scrape_all()
-        except Exception as e:
-            log.error(f"Scrape loop error: {e}")
-        await asyncio.sleep(SCRAPE_INTERVAL)
+        stale = _stale_sources(time.time())
+        if stale:
+            try:
+                await _scrape_all(shards=stale)
+            except Exception as e:
+                log.error(f"Scrape loop error: {e}")
+                _mark_failed(stale, time.time())
+        next_due = min(st["next_due"] for st in _schedule.values())
+        await asyncio.sleep(max(next_due - time.time(), 0.5))
 
 
 async def start_scraper():
     """Start the background scraper. Call from FastAPI lifespan."""
-    global _scraper_task
+    global _scraper_task, _role, _request_slots
+    event_bus.start_listeners()  # on_event callbacks registered before the loop was running
+    _request_slots = None
+    await start_client()
+    if not _claim_leadership():
+        _role = "follower"
+        log.info(f"Another worker is scraping — following {_shared_path}")
+        _scraper_task = asyncio.create_task(_follow_loop())
+        return
+    _role = "leader"
     log.info("Starting NERVE live scraper...")
+    try:
+        await _warm_price_history()
+    except Exception as e:
+        log.warning(f"Price history warm-up failed: {e}")
     # First scrape immediately
     await _scrape_all()
     # Then loop
@@ -753,10 +1459,20 @@ async def start_scraper():
 
 async def stop_scraper():
     """Stop the background scraper."""
-    global _scraper_task
+    global _scraper_task, _price_store, _request_slots
     if _scraper_task:
         _scraper_task.cancel()
         _scraper_task = None
+    if _leader_lock is not None:
+        _leader_lock.release()
+    await asyncio.to_thread(_vision_writer.stop)  # flush the last pending export
+    if _price_store is not None:
+        await _flush_price_history()
+        _price_store.close()
+        _price_store = None
+    await stop_client()
+    _request_slots = None
+    await event_bus.stop_listeners()
     log.info("NERVE scraper stopped")
 
 
@@ -768,14 +1484,29 @@ def get_cache() -> dict:
 
 
 async def get_region_data(region_id: str) -> RegionInfo:
-    """Build RegionInfo from live scraped data."""
+    """RegionInfo from the current snapshot — shared, treat as read-only."""
     if region_id not in REGIONS:
         region_id = "francecentral"
+    return get_snapshot().regions[region_id]
 
+
+def get_snapshot() -> RegionSnapshot:
+    """Current published snapshot (rebuilt on UTC hour rollover, see _publish_snapshot)."""
+    snapshot = _snapshot
+    if _role == "follower" and snapshot is not None:
+        return snapshot  # the leader republishes on rollover
+    if snapshot is None or snapshot.hour != datetime.now(timezone.utc).hour:
+        snapshot = _publish_snapshot()
+    return snapshot
+
+
+def _build_region_info(region_id: str) -> RegionInfo:
+    """Build RegionInfo from live scraped data."""
     cfg = REGIONS[region_id]
     weather = _cache.get("weather", {}).get(region_id, {})
     carbon = _cache.get("carbon", {}).get(region_id, {})
     gpus_raw = _cache.get("gpu_prices", {}).get(region_id, [])
+    table = _az_table(region_id)
 
     # Build AZ list — each AZ gets its own GPU prices (realistic Spot market)
     azs = []
@@ -784,26 +1515,18 @@ async def get_region_data(region_id: str) -> RegionInfo:
 
         # Per-AZ GPU instances with unique price variations
         az_gpu_instances = []
-        for g in gpus_raw:
-            az_spot = _az_price_variation(g["spot_price_usd_hr"], az_id, g["sku"])
-            az_ondemand = g["ondemand_price_usd_hr"]  # on-demand is the same across AZs
-            az_savings = round((1 - az_spot / az_ondemand) * 100, 1) if az_ondemand > 0 else g["savings_pct"]
-            base_avail = _estimate_availability(
-                az_spot, g.get("tier", "mid"),
-                spot=az_spot, ondemand=az_ondemand,
-            )
-            az_avail = _az_availability_shift(base_avail, az_id)
-
+        az_row = table["azs"][az_id]
+        for j, g in enumerate(gpus_raw):
             az_gpu_instances.append(GpuInstance(
                 sku=g["sku"],
                 gpu_name=g["gpu_name"],
                 gpu_count=g["gpu_count"],
                 vcpus=g["vcpus"],
                 ram_gb=g["ram_gb"],
-                spot_price_usd_hr=az_spot,
-                ondemand_price_usd_hr=az_ondemand,
-                savings_pct=az_savings,
-                availability=Availability(az_avail),
+                spot_price_usd_hr=az_row["spot"][j],
+                ondemand_price_usd_hr=g["ondemand_price_usd_hr"],
+                savings_pct=az_row["savings"][j],
+                availability=Availability(az_row["availability"][j]),
             ))
 
         # Slight weather variation per AZ (different micro-climates)
@@ -858,8 +1581,59 @@ def get_live_weather(region_id: str) -> dict:
 
 
 def get_price_history(region_id: str) -> list[dict]:
-    """Return real price history for building 24h curves."""
-    return _cache.get("price_history", {}).get(region_id, [])
+    """Real price history from the in-memory 24h ring (list-of-dicts compatibility view)."""
+    ring = _cache.get("price_history", {}).get(region_id)
+    return ring.to_dicts() if ring is not None else []
+
+
+async def query_price_history(
+    region_id: str,
+    since: float | None = None,
+    until: float | None = None,
+    resolution: str | None = None,
+    sku: str | None = None,
+) -> list[dict]:
+    """
+    Price history from the durable store over a range (epoch seconds; `until`
+    defaults to now, `since` to 24h before it) at a resolution ("1m", "1h",
+    "1d"; default picked from the span), for the region or a single `sku` —
+    per-SKU rows carry ondemand in place of avg_compute_spot/gpu_count.
+    Raises ValueError for an unknown resolution. Queries run off the event loop.
+    """
+    store = _open_price_store()
+    if store is None:
+        return []
+    until = time.time() if until is None else until
+    since = until - 86400 if since is None else since
+    if sku is None:
+        rows = await asyncio.to_thread(store.region_history, region_id, since, until, resolution)
+        keys = ("avg_spot", "min_spot", "max_spot", "avg_compute_spot", "gpu_count")
+    else:
+        rows = await asyncio.to_thread(store.sku_history, region_id, sku, since, until, resolution)
+        keys = ("avg_spot", "min_spot", "max_spot", "ondemand")
+    out = []
+    for bucket, *values in rows:
+        when = datetime.fromtimestamp(bucket, timezone.utc)
+        out.append({"timestamp": when.isoformat(), "hour": when.hour, **dict(zip(keys, values))})
+    return out
+
+
+def get_price_ring(region_id: str) -> PriceRing | None:
+    """Raw columnar history — use ring.window(column, last) for zero-copy curves."""
+    return _cache.get("price_history", {}).get(region_id)
+
+
+def get_vision_changes(since_seq: int) -> dict:
+    """
+    Vision export changes after `since_seq` (metadata.seq of the client's copy):
+    {"seq", "patches": [{"seq", "ops"}]}, or {"seq", "full"} after a gap.
+    """
+    return _vision_deltas.since(since_seq)
+
+
+def get_metrics() -> str:
+    """Prometheus text exposition of the engine metrics (serve with engine.metrics.CONTENT_TYPE)."""
+    return metrics.render()
 
 
 def get_scraper_status() -> dict:
@@ -869,6 +1643,29 @@ def get_scraper_status() -> dict:
         "scrape_count": _cache["scrape_count"],
         "total_gpus": sum(len(v) for v in _cache["gpu_prices"].values()),
         "regions": list(_cache["gpu_prices"].keys()),
+        "snapshot_version": _snapshot.version if _snapshot is not None else 0,
+        "role": _role,
+        "shared_snapshot": str(_shared_path) if _shared_path else None,
         "price_history_points": history_counts,
+        "history_store": _price_store.stats() if _price_store is not None else None,
         "errors": _cache["errors"][-10:],
+        "http": get_client_stats(),
+        "events": event_bus.stats(),
+        "export": {**_vision_writer.stats, "seq": _vision_deltas.seq},
+        "skips": {
+            kind: {**st, "skip_rate_pct": round(st["skipped"] / st["checked"] * 100, 1) if st["checked"] else 0.0}
+            for kind, st in _skip_stats.items()
+        },
+        "sources": {
+            src: {
+                "ttl_s": SOURCE_TTL[src],
+                "fetches": sum(st["fetches"] for st in shard_states),
+                "retrying_shards": sum(1 for st in shard_states if st["failures"]),
+                "last_fetch": max((st["last_fetch"] for st in shard_states if st["last_fetch"]), default=None),
+                "next_due_in_s": round(max(min(st["next_due"] for st in shard_states) - time.time(), 0.0), 1),
+            }
+            for src in SOURCES
+            for shard_states in [[_schedule[(src, shard)] for shard in range(len(SHARDS))]]
+        },
+        "shards": [list(shard) for shard in SHARDS],
     }
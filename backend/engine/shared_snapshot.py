@@ -0,0 +1,175 @@
+"""
+NERVE Engine — Shared snapshot for multi-worker deployments
+Under uvicorn/gunicorn with several workers, one worker (the holder of an
+flock'd leader lock) runs the scrape loop and publishes every snapshot to a
+memory-mapped file; the other workers attach read-only and pick up new
+versions with a single stat() — no scraping, no upstream load, same data.
+
+File layout (native byte order, each version is a new file swapped in with
+os.replace so a mapped file is never modified under a reader):
+
+    header   magic "NERVSNAP", format, version, published_at,
+             json offset/length, history offset/length
+    json     regions (RegionInfo dumps), cache subset, history ring metadata
+    history  raw price-ring columns, 8-byte aligned — readers wrap them as
+             memoryviews straight over the mapping
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+from array import array
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl  # POSIX only; elsewhere every worker is its own leader
+except ImportError:
+    fcntl = None
+
+log = logging.getLogger("nerve.shared")
+
+MAGIC = b"NERVSNAP"
+FORMAT = 1
+_HEADER = struct.Struct("=8sIQdQQQQ")  # magic, format, version, published_at, json off/len, hist off/len
+_ALIGN = 8
+
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+# ── Leader election ──────────────────────────────────────────────────
+
+class LeaderLock:
+    """Non-blocking exclusive flock; released by the OS if the leader dies."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fd: int | None = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        if fcntl is None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is not None:
+            os.close(self._fd)  # closing drops the flock
+            self._fd = None
+
+
+# ── Writer ───────────────────────────────────────────────────────────
+
+def write_snapshot(path: Path, version: int, document: dict, rings: dict[str, tuple[int, int, int, dict[str, array]]]):
+    """
+    Publish one snapshot. `rings` maps region_id -> (capacity, head, size,
+    {column: array}); the arrays are laid out raw after the JSON section.
+    """
+    history_meta: dict[str, Any] = {}
+    chunks: list[bytes | array] = []
+    offset = 0
+    for region_id, (capacity, head, size, columns) in rings.items():
+        cols = {}
+        for name, values in columns.items():
+            nbytes = len(values) * values.itemsize
+            cols[name] = [values.typecode, offset, nbytes]
+            chunks.append(values)
+            pad = _aligned(nbytes) - nbytes
+            if pad:
+                chunks.append(bytes(pad))
+            offset += _aligned(nbytes)
+        history_meta[region_id] = {"capacity": capacity, "head": head, "size": size, "columns": cols}
+
+    payload = json.dumps({**document, "history": history_meta}, separators=(",", ":"), default=str).encode("utf-8")
+    json_off = _HEADER.size
+    hist_off = _aligned(json_off + len(payload))
+    header = _HEADER.pack(MAGIC, FORMAT, version, time.time(), json_off, len(payload), hist_off, offset)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(header)
+            f.write(payload)
+            f.write(bytes(hist_off - json_off - len(payload)))
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+# ── Reader ───────────────────────────────────────────────────────────
+
+class SnapshotReader:
+    """Read-only attachment to the leader's snapshot file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.version = 0
+        self.published_at = 0.0
+        self._identity: tuple[int, int] | None = None
+        self._map: mmap.mmap | None = None
+
+    def poll(self) -> dict | None:
+        """
+        The new snapshot if the file changed since the last poll, else None:
+        {"version", "published_at", "document", "history": {region_id:
+        (capacity, head, size, {column: memoryview})}}. History columns are
+        views over the mapping, valid until the next snapshot is attached.
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        identity = (st.st_ino, st.st_mtime_ns)
+        if identity == self._identity:
+            return None
+
+        with open(self.path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, fmt, version, published_at, json_off, json_len, hist_off, hist_len = _HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC or fmt != FORMAT:
+            mapped.close()
+            log.warning(f"Ignoring {self.path}: not a NERVE snapshot (format {fmt})")
+            self._identity = identity
+            return None
+
+        document = json.loads(mapped[json_off:json_off + json_len])
+        view = memoryview(mapped)
+        history = {}
+        for region_id, meta in document.pop("history", {}).items():
+            columns = {
+                name: view[hist_off + off:hist_off + off + nbytes].cast(typecode)
+                for name, (typecode, off, nbytes) in meta["columns"].items()
+            }
+            history[region_id] = (meta["capacity"], meta["head"], meta["size"], columns)
+
+        # The previous mapping stays alive as long as views into it are referenced
+        self._map = mapped
+        self._identity = identity
+        self.version = version
+        self.published_at = published_at
+        return {"version": version, "published_at": published_at, "document": document, "history": history}
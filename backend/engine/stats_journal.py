@@ -0,0 +1,234 @@
+"""
+NERVE Engine — Stats journal
+Write-behind persistence for the dashboard counters (data/stats.json).
+record() is an in-memory increment; a background thread appends the deltas
+gathered since its last pass as one JSON line to stats.journal and fsyncs
+once per batch (every FLUSH_INTERVAL), so requests never touch the disk.
+When the journal outgrows COMPACT_BYTES it is folded into stats.json (temp
+file + fsync + atomic rename, generation bumped) and truncated.
+
+Crash recovery: totals are stats.json plus the journal lines of its
+generation — lines already folded by a compaction that died before the
+truncate carry the old generation and are skipped; a torn last line is
+dropped. Workers append under a flock, so several processes can share the
+files (POSIX only — elsewhere only threads of one process are serialised). A hard kill loses at most the last FLUSH_INTERVAL of increments.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl  # POSIX only; elsewhere the in-process lock is all we get
+except ImportError:
+    fcntl = None
+
+log = logging.getLogger("nerve.stats")
+
+FLUSH_INTERVAL = float(os.getenv("NERVE_STATS_FLUSH_S", "1.0"))  # seconds between journal appends
+COMPACT_BYTES = 64 * 1024                                         # journal size that triggers a compaction
+
+
+class StatsJournal:
+    """
+    Counters in `defaults` (name -> initial value), persisted write-behind.
+    record() and totals() are safe from any thread or the event loop.
+    """
+
+    def __init__(self, path: str | Path, defaults: dict[str, float]):
+        self.path = Path(path)
+        self.journal_path = self.path.with_suffix(".journal")
+        self._defaults = dict(defaults)
+        self._cond = threading.Condition()
+        self._io = threading.Lock()  # one disk operation at a time within this process
+        self._pending: dict[str, float] = {}
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self._fd: int | None = None
+        self.stats = {
+            "records": 0,
+            "flushes": 0,
+            "compactions": 0,
+            "replayed_lines": 0,
+            "torn_lines": 0,
+            "failed": 0,
+            "last_flush_ms": 0.0,
+        }
+        self._totals = dict(self._defaults)
+        try:
+            if self.journal_path.exists():
+                self._open()
+                with self._locked():
+                    self._totals = self._compact()  # replays and clears what a previous run left behind
+            else:
+                self._totals, _ = self._read_snapshot()
+        except Exception as e:
+            self.stats["failed"] += 1
+            log.warning(f"Stats journal recovery failed ({e}) — counting from defaults")
+
+    # ── Hot path ──
+
+    def record(self, **deltas: float):
+        """Add to counters in memory; the writer thread persists them later."""
+        with self._cond:
+            for name, value in deltas.items():
+                self._totals[name] = self._totals.get(name, 0) + value
+                self._pending[name] = self._pending.get(name, 0) + value
+            self.stats["records"] += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._start()
+
+    def totals(self) -> dict[str, float]:
+        with self._cond:
+            return dict(self._totals)
+
+    # ── Lifecycle ──
+
+    def _start(self):
+        if self._thread is None:
+            atexit.register(self.stop)
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="nerve-stats-journal", daemon=True)
+        self._thread.start()
+
+    def flush(self):
+        """Append whatever is pending now (blocking)."""
+        with self._cond:
+            batch, self._pending = self._pending, {}
+        self._append(batch)
+
+    def stop(self, timeout: float | None = 5.0):
+        """Flush pending increments and stop the writer thread."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._stopping, FLUSH_INTERVAL)
+                if self._stopping:
+                    return
+                batch, self._pending = self._pending, {}
+            self._append(batch)
+
+    # ── Disk ──
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.journal_path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+
+    @contextmanager
+    def _locked(self):
+        with self._io:
+            if fcntl is None:
+                yield
+                return
+            fcntl.flock(self._fd, fcntl.LOCK_EX)  # other workers append to the same journal
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _append(self, batch: dict[str, float]):
+        if not batch:
+            return
+        t0 = time.perf_counter()
+        try:
+            if self._fd is None:
+                self._open()
+            with self._locked():
+                _, generation = self._read_snapshot()
+                line = json.dumps({"gen": generation, "d": batch}, separators=(",", ":")) + "\n"
+                size = os.fstat(self._fd).st_size
+                if size and self._read_at(size - 1, 1) != b"\n":
+                    line = "\n" + line  # a worker died mid-append: keep the torn bytes on their own line
+                os.write(self._fd, line.encode("utf-8"))
+                os.fsync(self._fd)
+                if os.fstat(self._fd).st_size >= COMPACT_BYTES:
+                    compacted = self._compact()
+                    with self._cond:  # pick up what other workers recorded, keep our unflushed part
+                        self._totals = compacted
+                        for name, value in self._pending.items():
+                            self._totals[name] = self._totals.get(name, 0) + value
+        except Exception as e:
+            self.stats["failed"] += 1
+            log.warning(f"Stats journal write failed: {e}")
+            with self._cond:  # retried on the next pass
+                for name, value in batch.items():
+                    self._pending[name] = self._pending.get(name, 0) + value
+            return
+        self.stats["flushes"] += 1
+        self.stats["last_flush_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+
+    def _read_at(self, offset: int, length: int) -> bytes:
+        if hasattr(os, "pread"):
+            return os.pread(self._fd, length, offset)
+        os.lseek(self._fd, offset, os.SEEK_SET)  # O_APPEND writes still go to the end
+        return os.read(self._fd, length)
+
+    def _read_snapshot(self) -> tuple[dict[str, float], int]:
+        totals = dict(self._defaults)
+        generation = 0
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return totals, generation
+        except ValueError as e:
+            log.warning(f"Unreadable {self.path.name} ({e}) — starting from the journal alone")
+            return totals, generation
+        generation = int(data.pop("generation", 0))  # stats.json written before the journal has none
+        totals.update(data)
+        return totals, generation
+
+    def _replay(self) -> tuple[dict[str, float], int]:
+        """stats.json + its generation's journal lines (lock held)."""
+        totals, generation = self._read_snapshot()
+        with open(self.journal_path, "rb") as f:
+            for raw in f:
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    self.stats["torn_lines"] += 1  # partial append from a crash; only ever the last line
+                    continue
+                if entry.get("gen") != generation:
+                    continue  # already folded into stats.json
+                for name, value in entry["d"].items():
+                    totals[name] = totals.get(name, 0) + value
+                self.stats["replayed_lines"] += 1
+        return totals, generation
+
+    def _compact(self) -> dict[str, float]:
+        """Fold the journal into stats.json and truncate it (lock held). Returns the totals."""
+        totals, generation = self._replay()
+        if os.fstat(self._fd).st_size == 0:
+            return totals
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({**totals, "generation": generation + 1}, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        if os.name == "posix":  # directories cannot be opened for fsync on Windows
+            dir_fd = os.open(self.path.parent, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)  # make the rename durable before dropping the journal
+            finally:
+                os.close(dir_fd)
+        os.ftruncate(self._fd, 0)
+        os.fsync(self._fd)
+        self.stats["compactions"] += 1
+        return totals
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from models import TimeShiftPlan, TimeShiftRequest
+from engine import metrics
 from engine.scraper import get_live_weather, get_cache
 
 
@@ -62,21 +63,28 @@ def _build_live_carbon_curve(region_id: str) -> dict[int, float]:
     return curve
 
 
+def live_curves(region_id: str) -> tuple[dict[int, float], dict[int, float]]:
+    """(price curve, carbon curve) of a region — build once to reuse across many jobs."""
+    return _build_live_price_curve(region_id), _build_live_carbon_curve(region_id)
+
+
+@metrics.TIMESHIFT.timed()
 def _find_optimal_window(
     hours_needed: float,
     deadline: datetime,
     region_id: str,
+    curves: tuple[dict[int, float], dict[int, float]] | None = None,
+    now: datetime | None = None,
 ) -> tuple[Optional[datetime], Optional[datetime], float, float]:
-    """Find optimal start time using LIVE price + carbon curves."""
-    now = datetime.now(timezone.utc)
+    """Find optimal start time using LIVE price + carbon curves (prebuilt `curves` if given)."""
+    now = now or datetime.now(timezone.utc)
     hours_int = int(hours_needed) + 1
 
     hours_until_deadline = (deadline - now).total_seconds() / 3600
     if hours_until_deadline < hours_needed:
         return None, None, 0.0, 0.0
 
-    price_curve = _build_live_price_curve(region_id)
-    carbon_curve = _build_live_carbon_curve(region_id)
+    price_curve, carbon_curve = curves or live_curves(region_id)
 
     best_start_hour = None
     best_cost = float("inf")
@@ -121,9 +129,11 @@ async def should_time_shift(
     deadline: datetime,
     gpu_hours: float,
     region_id: str = "francecentral",
+    curves: tuple[dict[int, float], dict[int, float]] | None = None,
+    now: datetime | None = None,
 ) -> dict:
     """Determine if time-shifting is recommended using live data."""
-    start, end, price_red, carbon_red = _find_optimal_window(gpu_hours, deadline, region_id)
+    start, end, price_red, carbon_red = _find_optimal_window(gpu_hours, deadline, region_id, curves, now)
 
     if start and price_red > 5:
         return {
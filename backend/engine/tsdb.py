@@ -0,0 +1,206 @@
+"""
+NERVE Engine — Durable price history
+Embedded SQLite (WAL) time-series store behind the in-memory PriceRing:
+per-region aggregates and per-SKU spot/on-demand points at 1-minute
+resolution, rolled up into 1h and 1d buckets as they are written (UPSERT
+into the coarser tables — no batch job). Each resolution has its own
+retention; range queries are primary-key scans on (region, bucket) at the
+finest resolution that stays under MAX_POINTS, so months of history come
+back in milliseconds.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+log = logging.getLogger("nerve.tsdb")
+
+RESOLUTIONS = {"1m": 60, "1h": 3600, "1d": 86400}
+
+# Seconds of history kept per resolution (None = forever)
+REGION_RETENTION = {"1m": 30 * 86400, "1h": 2 * 365 * 86400, "1d": None}
+SKU_RETENTION = {"1m": 7 * 86400, "1h": 365 * 86400, "1d": None}
+
+PRUNE_EVERY = 3600.0   # seconds between retention passes
+MAX_POINTS = 2000      # auto resolution: finest one returning at most this many buckets
+
+_REGION_COLS = "region TEXT, bucket INTEGER, n INTEGER, avg_spot_sum REAL, min_spot REAL, max_spot REAL, avg_compute_sum REAL, gpu_count INTEGER"
+_SKU_COLS = "region TEXT, sku TEXT, bucket INTEGER, n INTEGER, spot_sum REAL, spot_min REAL, spot_max REAL, ondemand REAL"
+
+
+def _schema() -> str:
+    statements = []
+    for res in RESOLUTIONS:
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS region_{res} ({_REGION_COLS}, PRIMARY KEY (region, bucket)) WITHOUT ROWID"
+        )
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS sku_{res} ({_SKU_COLS}, PRIMARY KEY (region, sku, bucket)) WITHOUT ROWID"
+        )
+    return ";\n".join(statements)
+
+
+def _region_upsert(res: str) -> str:
+    return (
+        f"INSERT INTO region_{res} VALUES (?, ?, 1, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (region, bucket) DO UPDATE SET "
+        "n = n + 1, avg_spot_sum = avg_spot_sum + excluded.avg_spot_sum, "
+        "min_spot = min(min_spot, excluded.min_spot), max_spot = max(max_spot, excluded.max_spot), "
+        "avg_compute_sum = avg_compute_sum + excluded.avg_compute_sum, gpu_count = excluded.gpu_count"
+    )
+
+
+def _sku_upsert(res: str) -> str:
+    return (
+        f"INSERT INTO sku_{res} VALUES (?, ?, ?, 1, ?, ?, ?, ?) "
+        "ON CONFLICT (region, sku, bucket) DO UPDATE SET "
+        "n = n + 1, spot_sum = spot_sum + excluded.spot_sum, "
+        "spot_min = min(spot_min, excluded.spot_min), spot_max = max(spot_max, excluded.spot_max), "
+        "ondemand = excluded.ondemand"
+    )
+
+
+def pick_resolution(start: float, end: float) -> str:
+    """Finest resolution that returns at most MAX_POINTS buckets over [start, end]."""
+    span = max(end - start, 0)
+    for res, step in RESOLUTIONS.items():
+        if span / step <= MAX_POINTS:
+            return res
+    return "1d"
+
+
+# Range queries, one fixed statement per resolution — table names never come from callers
+_REGION_QUERY = {
+    res: (
+        "SELECT bucket, avg_spot_sum / n, min_spot, max_spot, avg_compute_sum / n, gpu_count "
+        f"FROM region_{res} WHERE region = ? AND bucket BETWEEN ? AND ? ORDER BY bucket"
+    )
+    for res in RESOLUTIONS
+}
+_SKU_QUERY = {
+    res: (
+        "SELECT bucket, spot_sum / n, spot_min, spot_max, ondemand "
+        f"FROM sku_{res} WHERE region = ? AND sku = ? AND bucket BETWEEN ? AND ? ORDER BY bucket"
+    )
+    for res in RESOLUTIONS
+}
+
+
+def _resolution(start: float, end: float, resolution: str | None) -> str:
+    if resolution is None:
+        return pick_resolution(start, end)
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"unknown resolution {resolution!r} (expected one of {', '.join(RESOLUTIONS)})")
+    return resolution
+
+
+class PriceStore:
+    """
+    write_cycle() and the queries are called from worker threads (one
+    transaction per scrape cycle); WAL lets a query proceed while a write is
+    in progress.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._read_lock = threading.Lock()  # the reader connection is shared by query threads
+        self._writer = self._connect()
+        self._writer.executescript(_schema())
+        self._reader = self._connect()
+        self._last_prune = 0.0
+        self.rows_written = 0
+        self.last_write_ms = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def close(self):
+        with self._lock, self._read_lock:
+            self._writer.close()
+            self._reader.close()
+
+    # ── Writes ──
+
+    def write_cycle(self, region_rows: list[tuple], sku_rows: list[tuple]):
+        """
+        region_rows: (region, ts, avg_spot, min_spot, max_spot, avg_compute_spot, gpu_count)
+        sku_rows:    (region, sku, ts, spot, ondemand)
+        Written to 1m and folded into the 1h / 1d buckets in one transaction.
+        """
+        if not region_rows and not sku_rows:
+            return
+        with self._lock:
+            t0 = time.perf_counter()
+            cur = self._writer.cursor()
+            cur.execute("BEGIN")
+            try:
+                for res, step in RESOLUTIONS.items():
+                    cur.executemany(_region_upsert(res), [
+                        (region, int(ts // step * step), avg, lo, hi, avg_compute, count)
+                        for region, ts, avg, lo, hi, avg_compute, count in region_rows
+                    ])
+                    cur.executemany(_sku_upsert(res), [
+                        (region, sku, int(ts // step * step), spot, spot, spot, ondemand)
+                        for region, sku, ts, spot, ondemand in sku_rows
+                    ])
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+            self.rows_written += len(region_rows) + len(sku_rows)
+            now = time.time()
+            if now - self._last_prune >= PRUNE_EVERY:
+                self._prune(now)
+                self._last_prune = now
+            self.last_write_ms = (time.perf_counter() - t0) * 1000
+
+    def _prune(self, now: float):
+        removed = 0
+        for table, retention in (("region", REGION_RETENTION), ("sku", SKU_RETENTION)):
+            for res, keep in retention.items():
+                if keep is not None:
+                    cur = self._writer.execute(f"DELETE FROM {table}_{res} WHERE bucket < ?", (int(now - keep),))
+                    removed += cur.rowcount
+        if removed:
+            log.info(f"Retention pass removed {removed} history rows")
+
+    # ── Queries ──
+
+    def region_history(self, region: str, start: float, end: float, resolution: str | None = None) -> list[tuple]:
+        """
+        (bucket_ts, avg_spot, min_spot, max_spot, avg_compute_spot, gpu_count) over [start, end].
+        Raises ValueError for a resolution outside RESOLUTIONS.
+        """
+        query = _REGION_QUERY[_resolution(start, end, resolution)]
+        with self._read_lock:
+            return self._reader.execute(query, (region, int(start), int(end))).fetchall()
+
+    def sku_history(self, region: str, sku: str, start: float, end: float, resolution: str | None = None) -> list[tuple]:
+        """
+        (bucket_ts, avg_spot, min_spot, max_spot, ondemand) over [start, end].
+        Raises ValueError for a resolution outside RESOLUTIONS.
+        """
+        query = _SKU_QUERY[_resolution(start, end, resolution)]
+        with self._read_lock:
+            return self._reader.execute(query, (region, sku, int(start), int(end))).fetchall()
+
+    def stats(self) -> dict:
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            size = 0
+        return {
+            "path": str(self.path),
+            "rows_written": self.rows_written,
+            "last_write_ms": round(self.last_write_ms, 2),
+            "size_bytes": size,
+        }
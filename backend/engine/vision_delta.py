@@ -0,0 +1,128 @@
+"""
+NERVE Engine — Vision delta stream
+RFC 6902-style patches between consecutive vision exports, numbered by a
+monotonically increasing sequence. Clients holding seq N ask for the changes
+since N and apply the ops in order; after a gap (N older than the retained
+history, or from a previous process) they get the full document instead.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections import deque
+from typing import Any
+
+PATCH_HISTORY = 120  # cycles kept (~2h at one export per minute)
+
+
+def _pointer(path: str, key: Any) -> str:
+    """Append one JSON Pointer token (RFC 6901 escaping)."""
+    return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+
+def diff(old: Any, new: Any, path: str = "") -> list[dict]:
+    """
+    Ops turning `old` into `new`. Dicts are diffed key by key, equal-length
+    lists element by element; anything else that differs is replaced whole.
+    Identical objects (sections reused between exports) are skipped without
+    being walked.
+    """
+    if old is new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path, key), "value": value})
+            else:
+                ops.extend(diff(old[key], value, _pointer(path, key)))
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer(path, key)})
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for i, (a, b) in enumerate(zip(old, new)):
+            ops.extend(diff(a, b, _pointer(path, i)))
+        return ops
+    if type(old) is type(new) and old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document: Any, ops: list[dict]) -> Any:
+    """Apply add/remove/replace ops (as produced by `diff`) to a copy of `document`."""
+    document = copy.deepcopy(document)
+    for op in ops:
+        if op["path"] == "":
+            document = copy.deepcopy(op["value"])
+            continue
+        *parents, last = [
+            t.replace("~1", "/").replace("~0", "~") for t in op["path"].split("/")[1:]
+        ]
+        target = document
+        for token in parents:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+        if isinstance(target, list):
+            last = int(last)
+        if op["op"] == "remove":
+            del target[last]
+        else:
+            target[last] = copy.deepcopy(op["value"])
+    return document
+
+
+class DeltaStream:
+    """Last published document plus the patches that led to it."""
+
+    def __init__(self, history: int = PATCH_HISTORY):
+        self.seq = 0
+        self.document: Any = None
+        self._patches: deque[tuple[int, list[dict]]] = deque(maxlen=history)
+
+    def publish(self, document: Any) -> int:
+        """Record `document` as the next sequence number (it must not be mutated afterwards)."""
+        if self.document is not None:
+            self._patches.append((self.seq + 1, diff(self.document, document)))
+        self.seq += 1
+        self.document = document
+        return self.seq
+
+    def patches_since(self, seq: int) -> list[tuple[int, list[dict]]]:
+        """Retained (seq, ops) pairs after `seq`."""
+        return [(k, ops) for k, ops in self._patches if k > seq]
+
+    def mirror(self, seq: int, document: Any, patches: list) -> int:
+        """
+        Adopt another stream's state (a follower worker mirroring the leader):
+        its `document` at `seq` and the (seq, ops) `patches` leading to it.
+        After a gap (first attach, missed snapshot) the patch history is
+        replaced by the one received — clients older than it get the full
+        document.
+        """
+        patches = [(k, ops) for k, ops in patches]
+        if not (patches and patches[-1][0] == seq):
+            patches = []
+        if self.document is not None and patches and patches[0][0] <= self.seq + 1:
+            self._patches.extend((k, ops) for k, ops in patches if k > self.seq)
+        else:
+            self._patches.clear()
+            self._patches.extend(patches)
+        self.seq = seq
+        self.document = document
+        return self.seq
+
+    def since(self, seq: int) -> dict:
+        """
+        {"seq": current, "patches": [{"seq": k, "ops": [...]}, ...]} covering
+        seq+1..current, or {"seq": current, "full": document} after a gap.
+        """
+        if seq == self.seq:
+            return {"seq": self.seq, "patches": []}
+        oldest = self._patches[0][0] if self._patches else self.seq + 1
+        if seq > self.seq or seq + 1 < oldest:
+            return {"seq": self.seq, "full": self.document}
+        return {
+            "seq": self.seq,
+            "patches": [{"seq": k, "ops": ops} for k, ops in self._patches if k > seq],
+        }
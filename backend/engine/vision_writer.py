@@ -0,0 +1,146 @@
+"""
+NERVE Engine — Vision JSON writer
+Background thread that writes nerve_scraped_data.json off the event loop:
+compact encoding (orjson when installed, else json), written once through a
+temp file + atomic rename, then hard-linked (or copied) into the other output
+directories. Exports submitted while a write is in progress coalesce — only
+the newest pending document is written.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson  # optional: pip install orjson
+except ImportError:
+    orjson = None
+
+log = logging.getLogger("nerve.vision")
+
+
+def _dumps(document: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(document, default=str)
+    return json.dumps(document, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _replace_atomic(path: Path, write):
+    """Create `path` via a sibling temp file + os.replace, so readers never see a partial file."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _link_or_copy(src: Path, tmp: Path):
+    try:
+        os.link(src, tmp)
+    except OSError:  # other filesystem, or no hard-link support
+        shutil.copyfile(src, tmp)
+
+
+class VisionWriter:
+    """Single background writer; `submit` never blocks on disk."""
+
+    def __init__(self, filename: str = "nerve_scraped_data.json"):
+        self.filename = filename
+        self._cond = threading.Condition()
+        self._pending: tuple[Any, list[Path]] | None = None
+        self._busy = False
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self.stats = {
+            "submitted": 0,
+            "written": 0,
+            "coalesced": 0,
+            "failed": 0,
+            "bytes": 0,
+            "last_duration_ms": 0.0,
+            "max_duration_ms": 0.0,
+        }
+
+    def submit(self, document: Any, output_dirs: list[Path]):
+        """
+        Queue `document` for writing to every dir in `output_dirs`. The document
+        is serialised on the writer thread, so it must not be mutated afterwards.
+        """
+        with self._cond:
+            self.stats["submitted"] += 1
+            if self._pending is not None:
+                self.stats["coalesced"] += 1  # superseded before it was written
+            self._pending = (document, list(output_dirs))
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="nerve-vision-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until nothing is pending or being written. False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending is None and not self._busy, timeout)
+
+    def stop(self, timeout: float | None = 5.0):
+        """Write whatever is pending, then stop the thread."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or self._stopping)
+                if self._pending is None:
+                    return
+                document, output_dirs = self._pending
+                self._pending = None
+                self._busy = True
+            try:
+                self._write(document, output_dirs)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, document: Any, output_dirs: list[Path]):
+        t0 = time.perf_counter()
+        try:
+            payload = _dumps(document)
+        except Exception as e:
+            self.stats["failed"] += 1
+            log.warning(f"Vision JSON serialisation failed: {e}")
+            return
+
+        first: Path | None = None
+        for output_dir in output_dirs:
+            out_path = output_dir / self.filename
+            try:
+                output_dir.mkdir(parents=True, exist_ok=True)
+                if first is None:
+                    _replace_atomic(out_path, lambda tmp: tmp.write_bytes(payload))
+                    first = out_path
+                elif out_path.resolve() != first.resolve():
+                    _replace_atomic(out_path, lambda tmp: _link_or_copy(first, tmp))
+                log.info(f"Vision JSON exported → {out_path}")
+            except Exception as e:
+                self.stats["failed"] += 1
+                log.warning(f"Failed to export vision JSON to {out_path}: {e}")
+
+        duration_ms = (time.perf_counter() - t0) * 1000
+        self.stats["written"] += 1
+        self.stats["bytes"] = len(payload)
+        self.stats["last_duration_ms"] = round(duration_ms, 2)
+        self.stats["max_duration_ms"] = round(max(self.stats["max_duration_ms"], duration_ms), 2)
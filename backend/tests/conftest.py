@@ -0,0 +1,6 @@
+"""Make the NERVE engine importable as `engine` when pytest runs from the repo or backend/."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
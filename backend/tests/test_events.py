@@ -0,0 +1,75 @@
+import asyncio
+
+from engine.events import EventBus, merge_price_batches, price_key
+
+
+def _batch(*cells) -> dict:
+    return {
+        "type": "az_price_update",
+        "count": len(cells),
+        "changes": [
+            {"region": r, "az": az, "instance": inst, "old_price": old, "new_price": new,
+             "change_pct": round((new - old) / old * 100, 2)}
+            for r, az, inst, old, new in cells
+        ],
+    }
+
+
+def test_merge_keeps_oldest_old_and_newest_new():
+    pending = _batch(("eastus", "1", "NC6", 1.0, 1.2), ("westeurope", "2", "NV6", 2.0, 1.8))
+    newer = _batch(("eastus", "1", "NC6", 1.2, 1.5), ("swedencentral", "1", "ND40", 4.0, 4.4))
+    merged = merge_price_batches(pending, newer)
+    cells = {(c["region"], c["az"], c["instance"]): c for c in merged["changes"]}
+    assert merged["count"] == 3 == len(cells)
+    eastus = cells[("eastus", "1", "NC6")]
+    assert (eastus["old_price"], eastus["new_price"], eastus["change_pct"]) == (1.0, 1.5, 50.0)
+    assert cells[("westeurope", "2", "NV6")]["new_price"] == 1.8
+    assert cells[("swedencentral", "1", "ND40")]["old_price"] == 4.0
+    # inputs are left untouched
+    assert pending["changes"][0]["new_price"] == 1.2 and newer["changes"][0]["old_price"] == 1.2
+
+
+def test_merge_zero_old_price_has_no_change_pct():
+    pending = _batch(("eastus", "1", "NC6", 1.0, 0.0))
+    pending["changes"][0]["new_price"] = 0.0
+    zero = {**pending, "changes": [{**pending["changes"][0], "old_price": 0.0}]}
+    merged = merge_price_batches(zero, _batch(("eastus", "1", "NC6", 1.0, 2.0)))
+    assert merged["changes"][0]["old_price"] == 0.0
+    assert merged["changes"][0]["change_pct"] is None
+
+
+def test_price_key_only_matches_price_batches():
+    assert price_key(_batch()) == "az_price_update"
+    assert price_key({"type": "scrape_complete"}) is None
+
+
+def test_coalesce_subscription_folds_pending_batches():
+    async def run():
+        bus = EventBus()
+        sub = bus.subscribe(policy="coalesce", maxsize=4)
+        bus.publish(_batch(("eastus", "1", "NC6", 1.0, 1.2)))
+        bus.publish({"type": "scrape_complete", "n": 1})
+        bus.publish(_batch(("eastus", "1", "NC6", 1.2, 1.4)))
+        first = await sub.get()
+        second = await sub.get()
+        return sub, first, second
+
+    sub, first, second = asyncio.run(run())
+    assert first["type"] == "az_price_update"
+    assert first["changes"][0]["old_price"] == 1.0
+    assert first["changes"][0]["new_price"] == 1.4
+    assert (second["type"], second["n"]) == ("scrape_complete", 1)
+    assert sub.coalesced == 1 and sub.dropped == 0
+
+
+def test_drop_oldest_when_full():
+    async def run():
+        bus = EventBus()
+        sub = bus.subscribe(maxsize=2)
+        for n in range(3):
+            bus.publish({"type": "scrape_complete", "n": n})
+        return sub, [(await sub.get())["n"] for _ in range(2)]
+
+    sub, seen = asyncio.run(run())
+    assert seen == [1, 2]
+    assert sub.dropped == 1
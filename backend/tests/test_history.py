@@ -0,0 +1,59 @@
+from engine.history import PriceRing
+
+
+def _point(i: int) -> tuple:
+    return (1000.0 + i, 1.0 + i, 0.5 + i, 2.0 + i, 1.5 + i, i)
+
+
+def test_ring_wraps_oldest_first():
+    ring = PriceRing(4)
+    for i in range(7):
+        ring.append(*_point(i))
+    assert len(ring) == 4
+    assert ring.column("ts") == [1003.0, 1004.0, 1005.0, 1006.0]
+    assert ring.column("gpu_count", last=2) == [5, 6]
+    assert ring.last() == _point(6)
+
+
+def test_window_splits_across_the_wrap():
+    ring = PriceRing(4)
+    for i in range(6):
+        ring.append(*_point(i))
+    first, second = ring.window("avg_spot")
+    assert first.tolist() == [3.0, 4.0]
+    assert second.tolist() == [5.0, 6.0]
+    first, second = ring.window("avg_spot", last=1)
+    assert first.tolist() == [6.0] and second.tolist() == []
+
+
+def test_partial_and_empty_ring():
+    ring = PriceRing(4)
+    assert ring.last() is None
+    assert ring.column("ts") == []
+    ring.repeat_last(1.0)  # nothing to repeat
+    assert len(ring) == 0
+    ring.append(*_point(0))
+    ring.append(*_point(1))
+    assert ring.column("ts") == [1000.0, 1001.0]
+
+
+def test_repeat_last_across_the_wrap():
+    ring = PriceRing(2)
+    ring.append(*_point(0))
+    ring.append(*_point(1))
+    ring.repeat_last(2000.0)
+    assert ring.column("ts") == [1001.0, 2000.0]
+    assert ring.column("max_spot") == [3.0, 3.0]
+
+
+def test_copy_is_independent_of_shared_buffers():
+    ring = PriceRing(3)
+    for i in range(4):
+        ring.append(*_point(i))
+    head, size, cols = ring.buffers()
+    shared = PriceRing.from_buffers(ring.capacity, head, size, {n: memoryview(c) for n, c in cols.items()})
+    assert shared.to_dicts() == ring.to_dicts()
+    copy = shared.copy()
+    copy.append(*_point(9))
+    assert copy.column("ts") == [1002.0, 1003.0, 1009.0]
+    assert ring.column("ts") == [1001.0, 1002.0, 1003.0]
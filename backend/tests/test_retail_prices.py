@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from engine.retail_prices import PageLimitExceeded, _PageParser, iter_price_items
+
+PAGE = {
+    "BillingCurrency": "USD",
+    "Items": [
+        {"armSkuName": "Standard_NC6s_v3", "retailPrice": 0.9, "meterName": "NC6s v3 Spot"},
+        {"armSkuName": "Standard_NV6", "retailPrice": 1.14, "meterName": "NV6 [a], {b}"},
+        {"armSkuName": "Standard_ND40rs_v2", "retailPrice": 22.03, "meterName": "ND40rs v2"},
+    ],
+    "NextPageLink": "https://prices.azure.com/api/retail/prices?$skip=100",
+    "Count": 3,
+}
+
+
+def _parse(chunks: list[str]) -> tuple[list[dict], str | None]:
+    parser = _PageParser()
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    items.extend(parser.close())
+    return items, parser.next_link
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_page_split_at_every_boundary(indent):
+    body = json.dumps(PAGE, indent=indent)
+    for cut in range(1, len(body)):
+        items, next_link = _parse([body[:cut], body[cut:]])
+        assert items == PAGE["Items"], cut
+        assert next_link == PAGE["NextPageLink"], cut
+
+
+def test_page_one_character_chunks():
+    body = json.dumps(PAGE)
+    assert _parse(list(body)) == (PAGE["Items"], PAGE["NextPageLink"])
+
+
+def test_page_without_next_link():
+    body = json.dumps({"Items": [], "NextPageLink": None})
+    assert _parse([body]) == ([], None)
+
+
+def test_truncated_page_raises():
+    body = json.dumps(PAGE)
+    parser = _PageParser()
+    parser.feed(body[: body.index("NV6")])
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def _endless_pages(request: httpx.Request) -> httpx.Response:
+    page = int(request.url.params.get("page", "0"))
+    return httpx.Response(200, json={
+        "Items": [{"page": page}],
+        "NextPageLink": f"https://prices.test/?page={page + 1}",
+    })
+
+
+def test_page_cap_raises_after_yielding():
+    async def collect():
+        seen = []
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_endless_pages)) as client:
+            with pytest.raises(PageLimitExceeded):
+                async for item in iter_price_items(client, "https://prices.test/", max_pages=3):
+                    seen.append(item["page"])
+        return seen
+
+    assert asyncio.run(collect()) == [0, 1, 2]
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("models")
+from engine.scoring import _skyline  # noqa: E402
+
+
+def _brute_force(price, co2, avail) -> list[int]:
+    keep = []
+    for i in range(len(price)):
+        dominated = any(
+            price[j] <= price[i] and co2[j] <= co2[i] and avail[j] >= avail[i]
+            and (price[j], co2[j], avail[j]) != (price[i], co2[i], avail[i])
+            for j in range(len(price))
+        )
+        if not dominated:
+            keep.append(i)
+    return keep
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_skyline_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 80))
+    # Few distinct values so ties and exact duplicates are common
+    price = rng.integers(1, 8, n).astype(float)
+    co2 = rng.integers(1, 8, n).astype(float)
+    avail = rng.integers(0, 4, n).astype(float)
+    assert _skyline(price, co2, avail).tolist() == _brute_force(price, co2, avail)
+
+
+def test_skyline_empty_and_duplicates():
+    empty = np.array([], dtype=float)
+    assert _skyline(empty, empty, empty).tolist() == []
+    same = np.array([1.0, 1.0])
+    assert _skyline(same, same, same).tolist() == [0, 1]
@@ -0,0 +1,46 @@
+import time
+
+import pytest
+
+from engine.tsdb import PriceStore, pick_resolution
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = PriceStore(tmp_path / "prices.db")
+    yield s
+    s.close()
+
+
+def _hour() -> int:
+    return int(time.time() // 86400 * 86400) - 86400 + 3600  # 01:00 yesterday, inside every retention
+
+
+def test_rollups(store):
+    base = _hour()
+    for minute, avg in enumerate([1.0, 2.0, 3.0]):
+        ts = base + minute * 60
+        store.write_cycle(
+            [("eastus", ts, avg, avg - 0.5, avg + 0.5, avg * 2, 10 + minute)],
+            [("eastus", "Standard_NC6", ts, avg, 9.0)],
+        )
+    end = base + 3599
+    assert [row[0] for row in store.region_history("eastus", base, end, "1m")] == [base, base + 60, base + 120]
+    assert store.region_history("eastus", base, end, "1h") == [(base, 2.0, 0.5, 3.5, 4.0, 12)]
+    day = base - 3600
+    assert store.region_history("eastus", day, day + 86399, "1d") == [(day, 2.0, 0.5, 3.5, 4.0, 12)]
+    assert store.sku_history("eastus", "Standard_NC6", base, end, "1h") == [(base, 2.0, 1.0, 3.0, 9.0)]
+    assert store.region_history("westeurope", base, end, "1h") == []
+
+
+def test_unknown_resolution(store):
+    with pytest.raises(ValueError):
+        store.region_history("eastus", 0, 60, "5m")
+    with pytest.raises(ValueError):
+        store.sku_history("eastus", "Standard_NC6", 0, 60, "region_1m; --")
+
+
+def test_pick_resolution():
+    assert pick_resolution(0, 3600) == "1m"
+    assert pick_resolution(0, 30 * 86400) == "1h"
+    assert pick_resolution(0, 10 * 365 * 86400) == "1d"
@@ -0,0 +1,106 @@
+import copy
+
+import pytest
+
+from engine.vision_delta import DeltaStream, apply_patch, diff
+
+OLD = {
+    "regions": {
+        "eastus": {"price": 1.0, "co2": 400, "gpus": ["NC6", "NV6"]},
+        "west/europe": {"price": 2.0, "co2": 120, "gpus": ["ND40"]},
+        "a~b": {"price": 3.0},
+    },
+    "best": ["eastus", "west/europe"],
+    "updated": "2026-10-16T10:00:00Z",
+    "count": 3,
+}
+
+
+def _changed() -> dict:
+    new = copy.deepcopy(OLD)
+    new["regions"]["eastus"]["price"] = 1.1               # nested replace
+    new["regions"]["eastus"]["gpus"][1] = "NV12"          # list element
+    new["regions"]["west/europe"]["gpus"].append("NC24")  # list length change
+    del new["regions"]["a~b"]                             # remove, escaped key
+    new["regions"]["x~/y"] = {"price": 0.5}               # add, escaped key
+    new["best"] = ["west/europe"]
+    new["count"] = 3.0                                    # same value, new type
+    new["updated"] = "2026-10-16T10:01:00Z"
+    return new
+
+
+@pytest.mark.parametrize("new", [
+    _changed(),
+    copy.deepcopy(OLD),
+    {"regions": {}},
+    [1, 2, 3],
+])
+def test_diff_apply_round_trip(new):
+    old = copy.deepcopy(OLD)
+    ops = diff(old, new)
+    assert apply_patch(old, ops) == new
+    assert old == OLD  # the source document is not mutated
+    if new == OLD:
+        assert ops == []
+
+
+def test_pointer_escaping():
+    ops = diff(OLD, _changed())
+    paths = {op["path"] for op in ops}
+    assert "/regions/a~0b" in paths
+    assert "/regions/x~0~1y" in paths
+    assert "/regions/west~1europe/gpus" in paths
+
+
+def test_shared_sections_are_not_walked():
+    new = {**OLD, "count": 4}
+    assert diff(OLD, new) == [{"op": "replace", "path": "/count", "value": 4}]
+
+
+def _replay(stream: DeltaStream, seq: int, document):
+    reply = stream.since(seq)
+    if "full" in reply:
+        return reply["seq"], reply["full"]
+    for patch in reply["patches"]:
+        document = apply_patch(document, patch["ops"])
+    return reply["seq"], document
+
+
+def test_stream_since_patches_and_gap():
+    stream = DeltaStream(history=2)
+    docs = [{"n": n, "regions": {"eastus": n * 1.5}} for n in range(4)]
+    for doc in docs:
+        stream.publish(doc)
+    assert stream.seq == 4
+    assert stream.since(4) == {"seq": 4, "patches": []}
+    assert _replay(stream, 2, docs[1]) == (4, docs[3])
+    assert stream.since(1) == {"seq": 4, "full": docs[3]}   # older than the retained history
+    assert stream.since(9) == {"seq": 4, "full": docs[3]}   # from another process
+
+
+def test_mirror_follows_the_leader():
+    leader, follower = DeltaStream(), DeltaStream()
+    docs = [{"n": n} for n in range(5)]
+    for doc in docs[:3]:
+        leader.publish(doc)
+    # first attach: adopt the leader's history wholesale
+    follower.mirror(leader.seq, leader.document, leader.patches_since(0))
+    assert follower.since(1) == leader.since(1)
+    for doc in docs[3:]:
+        seen = leader.seq
+        leader.publish(doc)
+        follower.mirror(leader.seq, leader.document, leader.patches_since(seen))
+    assert follower.seq == leader.seq == 5
+    assert _replay(follower, 1, docs[0]) == (5, docs[4])
+
+
+def test_mirror_after_missed_snapshots_replaces_history():
+    leader, follower = DeltaStream(), DeltaStream()
+    leader.publish({"n": 0})
+    follower.mirror(leader.seq, leader.document, leader.patches_since(0))
+    for n in range(1, 4):
+        leader.publish({"n": n})
+    # the follower only sees the newest patch: older clients must get the full doc
+    follower.mirror(leader.seq, leader.document, leader.patches_since(leader.seq - 1))
+    assert follower.since(3) == leader.since(3)
+    assert follower.since(1) == {"seq": 4, "full": {"n": 3}}